@@ -0,0 +1,29 @@
+"""add incident version
+
+Revision ID: 3e6a0d4b7f21
+Revises: 7b3f1c2a9e84
+Create Date: 2026-10-19 16:25:48.903115
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3e6a0d4b7f21'
+down_revision: Union[str, Sequence[str], None] = '7b3f1c2a9e84'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # Constant server default: no table rewrite on Postgres 11+
+    op.add_column('incidents', sa.Column('version', sa.Integer(), server_default='1', nullable=False))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_column('incidents', 'version')
@@ -0,0 +1,51 @@
+"""add sla policies and deadline
+
+Revision ID: 5c8e2f7a1d39
+Revises: 3e6a0d4b7f21
+Create Date: 2026-10-19 18:02:11.514376
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c8e2f7a1d39'
+down_revision: Union[str, Sequence[str], None] = '3e6a0d4b7f21'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('sla_policies',
+        sa.Column('organization_id', sa.UUID(), nullable=False),
+        sa.Column('severity', postgresql.ENUM(name='incident_severity', create_type=False), nullable=False),
+        sa.Column('response_minutes', sa.Integer(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('organization_id', 'severity')
+    )
+    op.add_column('incidents', sa.Column('sla_deadline', sa.DateTime(timezone=True), nullable=True))
+    # Backfill open incidents with the built-in targets the hourly job used to apply
+    op.execute("""
+        UPDATE incidents SET sla_deadline = created_at + CASE severity
+            WHEN 'SEV1' THEN interval '60 minutes'
+            WHEN 'SEV2' THEN interval '120 minutes'
+            WHEN 'SEV3' THEN interval '4 hours'
+            ELSE interval '24 hours'
+        END
+        WHERE status = 'DETECTED'
+    """)
+    op.create_index('ix_incidents_sla_deadline', 'incidents', ['sla_deadline'], unique=False,
+                    postgresql_where=sa.text('sla_deadline IS NOT NULL'))
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_incidents_sla_deadline', table_name='incidents')
+    op.drop_column('incidents', 'sla_deadline')
+    op.drop_table('sla_policies')
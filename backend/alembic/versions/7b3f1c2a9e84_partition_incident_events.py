@@ -0,0 +1,124 @@
+"""partition incident events by month
+
+Revision ID: 7b3f1c2a9e84
+Revises: d09383aa5140
+Create Date: 2026-10-19 14:02:17.551930
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '7b3f1c2a9e84'
+down_revision: Union[str, Sequence[str], None] = 'd09383aa5140'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.add_column('incidents', sa.Column('events_archived_at', sa.DateTime(timezone=True), nullable=True))
+
+    # 1. Move the existing table aside
+    op.execute("DROP TRIGGER IF EXISTS incident_events_search_vector_trg ON incident_events")
+    op.execute("ALTER TABLE incident_events RENAME TO incident_events_legacy")
+    op.execute("ALTER TABLE incident_events_legacy RENAME CONSTRAINT incident_events_pkey TO incident_events_legacy_pkey")
+
+    # 2. Range-partitioned replacement; the partition key must be part of the primary key
+    op.execute("""
+        CREATE TABLE incident_events (
+            id uuid NOT NULL,
+            incident_id uuid NOT NULL REFERENCES incidents(id),
+            actor_id uuid REFERENCES users(id),
+            event_type varchar NOT NULL,
+            old_value varchar,
+            new_value varchar,
+            comment text,
+            created_at timestamptz NOT NULL DEFAULT now(),
+            organization_id uuid NOT NULL REFERENCES organizations(id),
+            PRIMARY KEY (id, created_at)
+        ) PARTITION BY RANGE (created_at)
+    """)
+    op.execute("CREATE TABLE incident_events_default PARTITION OF incident_events DEFAULT")
+
+    # 3. Monthly partitions, created ahead of time by the ensure_event_partitions beat task
+    op.execute("""
+        CREATE OR REPLACE FUNCTION ensure_incident_event_partitions(start_month date, months int) RETURNS void AS $$
+        DECLARE
+          month_start date;
+        BEGIN
+          FOR i IN 0..months - 1 LOOP
+            month_start := date_trunc('month', start_month)::date + make_interval(months => i);
+            EXECUTE format(
+              'CREATE TABLE IF NOT EXISTS %I PARTITION OF incident_events FOR VALUES FROM (%L) TO (%L)',
+              'incident_events_p' || to_char(month_start, 'YYYY_MM'),
+              month_start,
+              (month_start + interval '1 month')::date
+            );
+          END LOOP;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        SELECT ensure_incident_event_partitions(
+          date_trunc('month', coalesce(min(created_at), now()))::date,
+          (
+            (extract(year FROM age(date_trunc('month', now()), date_trunc('month', coalesce(min(created_at), now())))) * 12
+            + extract(month FROM age(date_trunc('month', now()), date_trunc('month', coalesce(min(created_at), now())))))::int + 4
+          )
+        ) FROM incident_events_legacy
+    """)
+
+    # 4. Copy, index, swap
+    op.execute("""
+        INSERT INTO incident_events (id, incident_id, actor_id, event_type, old_value, new_value, comment, created_at, organization_id)
+        SELECT id, incident_id, actor_id, event_type, old_value, new_value, comment, coalesce(created_at, now()), organization_id
+        FROM incident_events_legacy
+    """)
+    op.execute("CREATE INDEX ix_incident_events_incident_created ON incident_events (incident_id, created_at)")
+    op.execute("CREATE INDEX ix_incident_events_org_created ON incident_events (organization_id, created_at)")
+    op.execute("DROP TABLE incident_events_legacy")
+
+    # 5. Comment search trigger (see eac94776262c) now lives on the partitioned parent
+    op.execute("""
+        CREATE TRIGGER incident_events_search_vector_trg
+        AFTER INSERT ON incident_events
+        FOR EACH ROW WHEN (NEW.event_type = 'COMMENT' AND NEW.comment IS NOT NULL)
+        EXECUTE FUNCTION incident_events_search_vector_append()
+    """)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS incident_events_search_vector_trg ON incident_events")
+    op.execute("ALTER TABLE incident_events RENAME TO incident_events_partitioned")
+    op.execute("""
+        CREATE TABLE incident_events (
+            id uuid PRIMARY KEY,
+            incident_id uuid NOT NULL REFERENCES incidents(id),
+            actor_id uuid REFERENCES users(id),
+            event_type varchar NOT NULL,
+            old_value varchar,
+            new_value varchar,
+            comment text,
+            created_at timestamptz DEFAULT now(),
+            organization_id uuid NOT NULL REFERENCES organizations(id)
+        )
+    """)
+    op.execute("""
+        INSERT INTO incident_events (id, incident_id, actor_id, event_type, old_value, new_value, comment, created_at, organization_id)
+        SELECT id, incident_id, actor_id, event_type, old_value, new_value, comment, created_at, organization_id
+        FROM incident_events_partitioned
+    """)
+    op.execute("DROP TABLE incident_events_partitioned CASCADE")
+    op.execute("DROP FUNCTION IF EXISTS ensure_incident_event_partitions(date, int)")
+    op.execute("""
+        CREATE TRIGGER incident_events_search_vector_trg
+        AFTER INSERT ON incident_events
+        FOR EACH ROW WHEN (NEW.event_type = 'COMMENT' AND NEW.comment IS NOT NULL)
+        EXECUTE FUNCTION incident_events_search_vector_append()
+    """)
+    op.drop_column('incidents', 'events_archived_at')
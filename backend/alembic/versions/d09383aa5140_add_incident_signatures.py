@@ -0,0 +1,38 @@
+"""add incident signatures
+
+Revision ID: d09383aa5140
+Revises: eac94776262c
+Create Date: 2026-10-19 11:40:05.402913
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd09383aa5140'
+down_revision: Union[str, Sequence[str], None] = 'eac94776262c'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    op.create_table('incident_signatures',
+        sa.Column('incident_id', sa.UUID(), nullable=False),
+        sa.Column('organization_id', sa.UUID(), nullable=False),
+        sa.Column('signature', sa.LargeBinary(), nullable=False),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=True),
+        sa.ForeignKeyConstraint(['incident_id'], ['incidents.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+        sa.PrimaryKeyConstraint('incident_id')
+    )
+    op.create_index('ix_incident_signatures_org_updated', 'incident_signatures', ['organization_id', 'updated_at'], unique=False)
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.drop_index('ix_incident_signatures_org_updated', table_name='incident_signatures')
+    op.drop_table('incident_signatures')
@@ -0,0 +1,77 @@
+"""add incident search vector
+
+Revision ID: eac94776262c
+Revises: e854b3007360
+Create Date: 2026-10-19 09:12:40.118204
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'eac94776262c'
+down_revision: Union[str, Sequence[str], None] = 'e854b3007360'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema."""
+    # 1. Weighted tsvector column + GIN index
+    op.execute("ALTER TABLE incidents ADD COLUMN IF NOT EXISTS search_vector tsvector")
+
+    # 2. Recompute the whole vector when title/description change
+    op.execute("""
+        CREATE OR REPLACE FUNCTION incidents_search_vector_refresh() RETURNS trigger AS $$
+        BEGIN
+          NEW.search_vector :=
+            setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+            setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+            setweight(to_tsvector('english', coalesce((
+              SELECT string_agg(comment, ' ') FROM incident_events
+              WHERE incident_id = NEW.id AND event_type = 'COMMENT'
+            ), '')), 'C');
+          RETURN NEW;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER incidents_search_vector_trg
+        BEFORE INSERT OR UPDATE OF title, description ON incidents
+        FOR EACH ROW EXECUTE FUNCTION incidents_search_vector_refresh()
+    """)
+
+    # 3. Append new comments to the parent incident's vector
+    op.execute("""
+        CREATE OR REPLACE FUNCTION incident_events_search_vector_append() RETURNS trigger AS $$
+        BEGIN
+          UPDATE incidents
+          SET search_vector = coalesce(search_vector, ''::tsvector) || setweight(to_tsvector('english', NEW.comment), 'C')
+          WHERE id = NEW.incident_id;
+          RETURN NULL;
+        END
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER incident_events_search_vector_trg
+        AFTER INSERT ON incident_events
+        FOR EACH ROW WHEN (NEW.event_type = 'COMMENT' AND NEW.comment IS NOT NULL)
+        EXECUTE FUNCTION incident_events_search_vector_append()
+    """)
+
+    # 4. Backfill existing rows (fires the refresh trigger), then index
+    op.execute("UPDATE incidents SET title = title")
+    op.execute("CREATE INDEX IF NOT EXISTS ix_incidents_search_vector ON incidents USING GIN (search_vector)")
+
+
+def downgrade() -> None:
+    """Downgrade schema."""
+    op.execute("DROP TRIGGER IF EXISTS incident_events_search_vector_trg ON incident_events")
+    op.execute("DROP FUNCTION IF EXISTS incident_events_search_vector_append()")
+    op.execute("DROP TRIGGER IF EXISTS incidents_search_vector_trg ON incidents")
+    op.execute("DROP FUNCTION IF EXISTS incidents_search_vector_refresh()")
+    op.execute("DROP INDEX IF EXISTS ix_incidents_search_vector")
+    op.execute("ALTER TABLE incidents DROP COLUMN IF EXISTS search_vector")
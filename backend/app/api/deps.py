@@ -1,6 +1,7 @@
 # backend/app/api/deps.py
 
 import os
+import math
 from typing import List
 from uuid import UUID
 from fastapi import Depends, HTTPException, status
@@ -11,6 +12,8 @@ from dotenv import load_dotenv
 
 from app.db.session import get_db
 import app.db.models as models
+from app.core.rate_limit import check_rate_limit
+from app.core.profiling import current_profile
 from app.repositories.user_repo import UserRepository
 
 from app.services.incident_service import IncidentService
@@ -19,6 +22,11 @@ from app.services.analytics_service import AnalyticsService
 from app.services.attachment_service import AttachmentService
 from app.services.org_service import OrganizationService
 from app.services.postmortem_service import PostMortemService
+from app.services.similarity_service import SimilarityService
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService
+from app.services.import_service import ImportService
+from app.services.sla_service import SlaService
 
 load_dotenv()
 
@@ -51,6 +59,7 @@ def get_current_user(token: str = Depends(oauth2_scheme), db: Session = Depends(
   if user is None:
     raise credentials_exception
 
+  db.info["user_id"] = user.id # Lets a RoutingSession keep this user's reads on the primary after their writes
   return user
 
 def get_current_user_id_from_token(token: str = Depends(oauth2_scheme)) -> dict:
@@ -90,6 +99,33 @@ class RoleChecker:
 require_admin = RoleChecker(["ADMIN"])
 require_manager = RoleChecker(["ADMIN", "MANAGER"])
 
+class RateLimiter:
+  """Charges the request to the caller's user and org token buckets for one budget (see app/core/rate_limit.py)."""
+  def __init__(self, budget: str):
+    self.budget = budget
+
+  def __call__(self, user: models.User = Depends(get_current_user)):
+    decision = check_rate_limit(self.budget, user.id, user.organization_id)
+    if decision is not None and not decision.allowed:
+      raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail="Rate limit exceeded",
+        headers={"Retry-After": str(max(1, math.ceil(decision.retry_after)))}
+      )
+
+rate_limit = RateLimiter("default")
+rate_limit_expensive = RateLimiter("expensive")
+
+async def authorize_profiling(user: models.User = Depends(get_current_user)):
+  """
+  Starts the profile ProfilingMiddleware opened for this request, if any; only admins may profile.
+  Async so requests without the switch never pay for a threadpool hop here.
+  """
+  profile = current_profile()
+  if profile is not None:
+    require_admin(user)
+    profile.start(user.organization_id)
+
 def get_incident_service(db: Session = Depends(get_db)) -> IncidentService:
   return IncidentService(db)
 
@@ -107,3 +143,18 @@ def get_org_service(db: Session = Depends(get_db)) -> OrganizationService:
 
 def get_postmortem_service(db: Session = Depends(get_db)) -> PostMortemService:
   return PostMortemService(db)
+
+def get_similarity_service(db: Session = Depends(get_db)) -> SimilarityService:
+  return SimilarityService(db)
+
+def get_archive_service(db: Session = Depends(get_db)) -> ArchiveService:
+  return ArchiveService(db)
+
+def get_export_service(db: Session = Depends(get_db)) -> ExportService:
+  return ExportService(db)
+
+def get_import_service(db: Session = Depends(get_db)) -> ImportService:
+  return ImportService(db)
+
+def get_sla_service(db: Session = Depends(get_db)) -> SlaService:
+  return SlaService(db)
@@ -1,14 +1,32 @@
+import uuid
+import tempfile
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, Query
+from datetime import datetime, timezone
+from typing import List, Optional
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 
 from app.schemas import analytics
+from app.schemas import export as export_schemas
+from app.schemas import importer as import_schemas
+from app.schemas import sla as sla_schemas
 from app.db import models
-from app.api.deps import get_current_org_id, get_analytics_service, require_admin
+from app.api.deps import get_current_org_id, get_analytics_service, get_export_service, get_import_service, get_sla_service, require_admin, rate_limit_expensive
 from app.services.analytics_service import AnalyticsService
+from app.services.export_service import ExportService, export_key, read_export_status, write_export_status
+from app.services.import_service import ImportService
+from app.services.sla_service import SlaService
+from app.core.export import FORMATS
+from app.core.storage import create_presigned_get
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter()
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+expensive = [Depends(rate_limit_expensive)]
 
-@router.get("/stats", response_model=analytics.AdminDashboardStats)
+router = APIRouter(route_class=ProfiledRoute)
+
+@router.get("/stats", response_model=analytics.AdminDashboardStats, dependencies=expensive)
 def get_admin_stats(
   service: AnalyticsService = Depends(get_analytics_service),
   current_user: models.User = Depends(require_admin), 
@@ -19,7 +37,7 @@ def get_admin_stats(
   except Exception as e:
     raise HTTPException(status_code=500, detail=str(e))
 
-@router.get("/charts", response_model=analytics.AnalyticsResponse)
+@router.get("/charts", response_model=analytics.AnalyticsResponse, dependencies=expensive)
 def get_analytics(
   days: int = Query(30, description="Number of days to include in the analytics calculations"),
   service: AnalyticsService = Depends(get_analytics_service),
@@ -34,5 +52,122 @@ def get_analytics(
     return service.get_analytics_charts(current_org_id, days=days)
   except Exception as e:
     raise HTTPException(status_code=500, detail=str(e))
-  
-  
\ No newline at end of file
+
+@router.get("/charts/distributions", response_model=analytics.DistributionResponse, dependencies=expensive)
+def get_duration_distributions(
+  days: int = Query(30, description="Number of days of created incidents to include"),
+  service: AnalyticsService = Depends(get_analytics_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Percentiles (p50/p90/p99) and histograms of resolve and acknowledge times, overall, per severity and per owner.
+  Means alone hide the long tail; these are within 1% of the exact percentiles.
+  """
+  try:
+    return service.get_duration_distributions(current_org_id, days=days)
+  except Exception as e:
+    raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/export", dependencies=expensive)
+def export_data(
+  dataset: export_schemas.ExportDataset = Query("incidents"),
+  fmt: export_schemas.ExportFormat = Query("csv", alias="format"),
+  start: Optional[datetime] = Query(None, description="Inclusive lower bound on created_at (default: beginning of time)"),
+  end: Optional[datetime] = Query(None, description="Exclusive upper bound on created_at (default: now)"),
+  gzip: bool = Query(False, description="Compress the stream as a .gz file"),
+  service: ExportService = Depends(get_export_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Streams every incident or audit event in the window as CSV or JSONL, in constant memory.
+  """
+  start, end = start or EPOCH, end or datetime.now(timezone.utc)
+  file_name = f"{dataset}-{start:%Y%m%d}-{end:%Y%m%d}.{FORMATS[fmt][1]}{'.gz' if gzip else ''}"
+  return StreamingResponse(
+    service.stream_export(current_org_id, dataset, fmt, start, end, compress=gzip),
+    media_type="application/gzip" if gzip else FORMATS[fmt][0],
+    headers={"Content-Disposition": f'attachment; filename="{file_name}"'},
+  )
+
+@router.post("/exports", response_model=export_schemas.ExportJob, status_code=202, dependencies=expensive)
+def create_export(
+  request: export_schemas.ExportRequest,
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Queues an export to the attachment bucket. Poll GET /exports/{export_id} for the download link.
+  """
+  from app.core.tasks import export_dataset # Keeps Celery out of API startup
+
+  export_id = uuid.uuid4()
+  key = export_key(current_org_id, export_id, request.format, request.gzip)
+  start, end = request.start or EPOCH, request.end or datetime.now(timezone.utc)
+  # Marker first, so a fast worker's "running"/"ready" is never overwritten by "queued"
+  write_export_status(current_org_id, export_id, "queued", key)
+  export_dataset.delay(
+    str(current_org_id), request.dataset, request.format,
+    start.isoformat(), end.isoformat(), request.gzip, key, str(export_id)
+  )
+  return export_schemas.ExportJob(export_id=export_id, status="queued", key=key)
+
+@router.get("/exports/{export_id}", response_model=export_schemas.ExportJob)
+def get_export(
+  export_id: UUID,
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Job status from its marker; "ready" comes with a fresh download link, "failed" with the error.
+  """
+  marker = read_export_status(current_org_id, export_id)
+  if marker is None:
+    raise HTTPException(status_code=404, detail="Export not found")
+  download_url = create_presigned_get(marker["key"]) if marker["status"] == "ready" else None
+  return export_schemas.ExportJob(
+    export_id=export_id, status=marker["status"], key=marker["key"], download_url=download_url, error=marker.get("error")
+  )
+
+@router.post("/import", response_model=import_schemas.ImportReport, dependencies=expensive)
+async def import_incidents(
+  request: Request,
+  fmt: str = Query("jsonl", alias="format", pattern="^(jsonl|csv)$"),
+  source: str = Query("import", description="Tool name recorded on each creation event"),
+  dry_run: bool = Query(False, description="Validate only, write nothing"),
+  service: ImportService = Depends(get_import_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Imports historical incidents from a JSONL or CSV request body (see app/cli/import_incidents.py for the record shape).
+  The body is spooled to disk as it arrives; for multi-gigabyte migrations prefer the CLI.
+  """
+  with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+    async for chunk in request.stream():
+      spool.write(chunk)
+    spool.seek(0)
+    return await run_in_threadpool(service.import_stream, spool, fmt, current_org_id, source, dry_run)
+
+@router.get("/sla-policies", response_model=List[sla_schemas.SlaPolicyRead])
+def get_sla_policies(
+  service: SlaService = Depends(get_sla_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  return service.list_policies(current_org_id)
+
+@router.put("/sla-policies/{severity}", response_model=List[sla_schemas.SlaPolicyRead])
+def set_sla_policy(
+  severity: models.IncidentSeverity,
+  request: sla_schemas.SlaPolicyUpdate,
+  service: SlaService = Depends(get_sla_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  """
+  Sets how long a DETECTED incident of this severity may go unacknowledged before it is escalated.
+  Pending deadlines of that severity are re-timed from each incident's creation.
+  """
+  return service.set_policy(current_org_id, severity, request.response_minutes)
@@ -5,9 +5,10 @@ from fastapi import APIRouter, Depends
 from app.db import models
 from app.schemas import attachment as attachments_schemas
 from app.api.deps import get_current_user, get_current_org_id, get_attachment_service
+from app.core.profiling import ProfiledRoute
 from app.services.attachment_service import AttachmentService
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
 # Note: We will mount this router with a prefix logic that handles "/incidents/{id}/attachments"
 # or we can keep the full paths here. To make mounting cleaner, we will keep full paths relative to the root or incident.
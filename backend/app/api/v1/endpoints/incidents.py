@@ -1,7 +1,8 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 import logging
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, Request
+from fastapi.responses import ORJSONResponse
 
 from app.db import models
 from app.schemas import incident as incident_schemas
@@ -10,42 +11,77 @@ from app.api.deps import (
   get_current_org_id,
   get_incident_service,
   get_postmortem_service,
+  get_similarity_service,
+  get_archive_service,
   require_manager,
   require_admin,
+  rate_limit_expensive,
 )
 from app.services.incident_service import IncidentService
 from app.services.postmortem_service import PostMortemService
+from app.services.similarity_service import SimilarityService
+from app.services.archive_service import ArchiveService
 from app.services.ai_service import AIServiceError
+from app.core.cache import cached_response
+from app.core.idempotency import idempotent_response
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 logger = logging.getLogger(__name__)
 
-@router.get("/", response_model=List[incident_schemas.IncidentRead])
+def _expected_version(if_match: Optional[str]) -> Optional[int]:
+  """If-Match carries the incident version the client last read, e.g. `"3"`; `*` or no header skips the check."""
+  if if_match is None or if_match.strip() == "*":
+    return None
+  try:
+    return int(if_match.strip().removeprefix("W/").strip('"'))
+  except ValueError:
+    raise HTTPException(status_code=400, detail='If-Match must be an incident version, e.g. "3"')
+
+@router.get("/", response_model=List[incident_schemas.IncidentRead], response_class=ORJSONResponse)
 def get_incidents(
+  request: Request,
+  service: IncidentService = Depends(get_incident_service),
+  current_org_id: UUID = Depends(get_current_org_id),
+):
+  # response_model documents the shape; returning the response directly skips re-validation
+  return cached_response(request, current_org_id, "incidents", lambda: service.list_incidents(current_org_id))
+
+@router.get("/search", response_model=incident_schemas.IncidentSearchResults)
+def search_incidents(
+  q: str = Query(..., min_length=1, max_length=200, description="Words to match in titles, descriptions and comments"),
+  limit: int = Query(20, ge=1, le=100),
+  offset: int = Query(0, ge=0),
   service: IncidentService = Depends(get_incident_service),
   current_org_id: UUID = Depends(get_current_org_id),
 ):
-  return service.list_incidents(current_org_id)
+  return service.search_incidents(current_org_id, q, limit, offset)
 
 @router.post("/", response_model=dict)
 def create_incident(
   incident: incident_schemas.IncidentCreate,
   service: IncidentService = Depends(get_incident_service),
   current_user: models.User = Depends(get_current_user),
-  current_org_id: UUID = Depends(get_current_org_id)
+  current_org_id: UUID = Depends(get_current_org_id),
+  idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-  new_incident = service.create_incident(incident, current_user, current_org_id)
-  payload = {
-    "id": str(new_incident.id),
-    "title": new_incident.title,
-    "description": new_incident.description,
-    "severity": new_incident.severity.value if hasattr(new_incident.severity, "value") else str(new_incident.severity),
-    "status": new_incident.status.value if hasattr(new_incident.status, "value") else str(new_incident.status),
-    "owner_id": str(new_incident.owner_id) if new_incident.owner_id else None,
-    "updated_at": new_incident.updated_at,
-  }
-  payload["message"] = "Incident created successfully"
-  return payload
+  def create():
+    new_incident = service.create_incident(incident, current_user, current_org_id)
+    payload = {
+      "id": str(new_incident.id),
+      "title": new_incident.title,
+      "description": new_incident.description,
+      "severity": new_incident.severity.value if hasattr(new_incident.severity, "value") else str(new_incident.severity),
+      "status": new_incident.status.value if hasattr(new_incident.status, "value") else str(new_incident.status),
+      "owner_id": str(new_incident.owner_id) if new_incident.owner_id else None,
+      "updated_at": new_incident.updated_at,
+      "version": new_incident.version,
+      "sla_deadline": new_incident.sla_deadline,
+    }
+    payload["message"] = "Incident created successfully"
+    return payload
+
+  return idempotent_response(idempotency_key, current_user.id, "create_incident", incident.model_dump(mode="json"), create)
 
 @router.post("/{incident_id}/transition")
 def transition_incident(
@@ -53,17 +89,24 @@ def transition_incident(
   request: incident_schemas.TransitionRequest,
   service: IncidentService = Depends(get_incident_service),
   current_user: models.User = Depends(get_current_user),
-  current_org_id: UUID = Depends(get_current_org_id)
+  current_org_id: UUID = Depends(get_current_org_id),
+  idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
+  if_match: Optional[str] = Header(None),
 ):
-  try:
-    updated = service.transition_incident(incident_id, request, current_user, current_org_id)
-  except HTTPException as he:
-    raise he
-  return {
-    "id": str(incident_id),
-    "status": updated.status.value,
-    "message": f"Incident transitioned to {request.new_state} successfully"
-  }
+  expected_version = _expected_version(if_match)
+
+  def transition():
+    updated = service.transition_incident(incident_id, request, current_user, current_org_id, expected_version)
+    return {
+      "id": str(incident_id),
+      "status": updated.status.value,
+      "version": updated.version,
+      "message": f"Incident transitioned to {request.new_state} successfully"
+    }
+
+  return idempotent_response(
+    idempotency_key, current_user.id, f"transition_incident:{incident_id}", request.model_dump(mode="json"), transition
+  )
 
 @router.patch("/{incident_id}")
 def update_incident(
@@ -71,10 +114,11 @@ def update_incident(
   request: incident_schemas.IncidentUpdate,
   service: IncidentService = Depends(get_incident_service),
   current_user: models.User = Depends(require_manager),
-  current_org_id: UUID = Depends(get_current_org_id)
+  current_org_id: UUID = Depends(get_current_org_id),
+  if_match: Optional[str] = Header(None),
 ):
   try:
-    updated = service.update_incident(incident_id, request, current_user, current_org_id)
+    updated = service.update_incident(incident_id, request, current_user, current_org_id, _expected_version(if_match))
   except HTTPException as he:
     raise he
   payload = {
@@ -85,6 +129,8 @@ def update_incident(
     "status": updated.status.value if hasattr(updated.status, "value") else str(updated.status),
     "owner_id": str(updated.owner_id) if updated.owner_id else None,
     "updated_at": updated.updated_at,
+    "version": updated.version,
+    "sla_deadline": updated.sla_deadline,
   }
   payload["message"] = "Incident updated successfully"
   return payload
@@ -95,13 +141,16 @@ def comment_on_incident(
   request: incident_schemas.CommentRequest,
   service: IncidentService = Depends(get_incident_service),
   current_user: models.User = Depends(get_current_user),
-  current_org_id: UUID = Depends(get_current_org_id)
+  current_org_id: UUID = Depends(get_current_org_id),
+  idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key"),
 ):
-  try:
+  def comment():
     service.add_comment(incident_id, request, current_user, current_org_id)
-  except HTTPException as he:
-    raise he
-  return {"id": str(incident_id), "message": "Comment added successfully"}
+    return {"id": str(incident_id), "message": "Comment added successfully"}
+
+  return idempotent_response(
+    idempotency_key, current_user.id, f"comment_on_incident:{incident_id}", request.model_dump(mode="json"), comment
+  )
 
 @router.delete("/{incident_id}")
 def delete_incident(
@@ -123,18 +172,44 @@ def get_incident_events(
   current_org_id: UUID = Depends(get_current_org_id)
 ):
   try:
-    return service.get_incident_events(incident_id, current_org_id)
+    events, complete = service.get_incident_events(incident_id, current_org_id)
   except HTTPException as he:
     raise he
+  # Archived events could not be read from storage: the list holds the recent (hot) events only
+  headers = None if complete else {"X-Events-Archive": "unavailable"}
+  return ORJSONResponse(events, headers=headers)
+
+@router.post("/{incident_id}/events/rehydrate")
+def rehydrate_incident_events(
+  incident_id: UUID,
+  service: ArchiveService = Depends(get_archive_service),
+  current_user: models.User = Depends(require_admin),
+  current_org_id: UUID = Depends(get_current_org_id)
+):
+  restored = service.rehydrate_events(incident_id, current_org_id)
+  return {"id": str(incident_id), "restored": restored, "message": "Incident events restored"}
+
+@router.get("/{incident_id}/similar", response_model=List[incident_schemas.SimilarIncident])
+def get_similar_incidents(
+  incident_id: UUID,
+  k: int = Query(5, ge=1, le=20, description="Number of matches to return"),
+  service: SimilarityService = Depends(get_similarity_service),
+  current_org_id: UUID = Depends(get_current_org_id),
+):
+  return service.find_similar(incident_id, current_org_id, k)
 
 @router.get("/{incident_id}/postmortem")
 def get_incident_postmortem(
   incident_id: UUID,
+  request: Request,
   service: PostMortemService = Depends(get_postmortem_service),
   current_org_id: UUID = Depends(get_current_org_id),
 ):
   try:
-    return service.get_saved(incident_id, current_org_id)
+    return cached_response(
+      request, current_org_id, f"postmortem:{incident_id}",
+      lambda: service.get_saved(incident_id, current_org_id)
+    )
   except HTTPException:
     raise
   except ValueError as ve:
@@ -146,7 +221,7 @@ def get_incident_postmortem(
     logger.exception("Unexpected post-mortem fetch error for incident %s", incident_id)
     raise HTTPException(status_code=500, detail="Post-mortem fetch failed")
 
-@router.post("/{incident_id}/postmortem")
+@router.post("/{incident_id}/postmortem", dependencies=[Depends(rate_limit_expensive)])
 def generate_incident_postmortem(
   incident_id: UUID,
   service: PostMortemService = Depends(get_postmortem_service),
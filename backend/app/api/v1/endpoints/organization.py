@@ -1,4 +1,4 @@
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request
 from uuid import UUID
 
 from app.schemas import organization as org_schemas
@@ -7,19 +7,26 @@ from app.api.deps import (
   get_current_org_id,
   get_org_service,
   require_admin,
+  rate_limit,
+  rate_limit_expensive,
 )
 from app.db import models
 from app.services.org_service import OrganizationService
+from app.core.cache import cached_response
 
 router = APIRouter()
 
-@router.get("/org_profile", response_model=org_schemas.OrgProfile)
+@router.get("/org_profile", response_model=org_schemas.OrgProfile, dependencies=[Depends(rate_limit)])
 def get_org_profile(
+  request: Request,
   service: OrganizationService = Depends(get_org_service),
   current_org_id: UUID = Depends(get_current_org_id)
 ):
   """Get the current organization's profile information."""
-  return service.get_org(current_org_id)
+  return cached_response(
+    request, current_org_id, "org_profile",
+    lambda: org_schemas.OrgProfile.model_validate(service.get_org(current_org_id)).model_dump()
+  )
 
 @router.post("/register", response_model=org_schemas.OrgRegistrationResponse)
 def register_organization(
@@ -38,7 +45,7 @@ def register_organization(
 
   return {"organization": org, "user": user}
 
-@router.post("/invite", response_model=org_schemas.InviteResponse)
+@router.post("/invite", response_model=org_schemas.InviteResponse, dependencies=[Depends(rate_limit)])
 def invite_user(
   request: org_schemas.InviteRequest,
   service: OrganizationService = Depends(get_org_service),
@@ -51,3 +58,17 @@ def invite_user(
     "message": f"Invitation sent to {request.email}",
     "user_id": new_user_id
   }
+
+@router.post("/invite/bulk", response_model=org_schemas.BulkInviteResponse,
+             dependencies=[Depends(rate_limit), Depends(rate_limit_expensive)])
+def invite_users(
+  request: org_schemas.BulkInviteRequest,
+  service: OrganizationService = Depends(get_org_service),
+  current_org_id: UUID = Depends(get_current_org_id),
+  current_user: models.User = Depends(require_admin)
+):
+  """
+  Invites several users at once. Emails that could not be invited are listed in `failed`;
+  the rest are added to the organization together.
+  """
+  return service.invite_users([(invite.email, invite.role) for invite in request.invites], current_org_id)
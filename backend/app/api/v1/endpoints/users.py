@@ -1,21 +1,25 @@
 from typing import List
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse
 
 from app.db import models
 from app.schemas import user as user_schemas
 from app.schemas import common as org_schemas
 from app.api.deps import get_current_user, get_current_org_id, get_user_service, require_admin
 from app.services.user_service import UserService
+from app.core.cache import cached_response
+from app.core.profiling import ProfiledRoute
 
-router = APIRouter()
+router = APIRouter(route_class=ProfiledRoute)
 
-@router.get("/", response_model=List[user_schemas.UserRead])
+@router.get("/", response_model=List[user_schemas.UserRead], response_class=ORJSONResponse)
 def get_users(
+  request: Request,
   service: UserService = Depends(get_user_service),
   current_org_id: UUID = Depends(get_current_org_id)
 ):
-  return service.list_users(org_id=current_org_id)
+  return cached_response(request, current_org_id, "users", lambda: service.list_users(org_id=current_org_id))
 
 @router.patch("/{user_id}/role")
 def update_user_role(
@@ -1,19 +1,24 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
 from app.api.v1.endpoints import incidents, users, admin, attachments, organization
+from app.api.deps import rate_limit, authorize_profiling
 
 api_router = APIRouter()
 
+# Every authenticated router draws from the caller's default rate-limit budget and can be profiled by admins.
+# /orgs is limited per route because /orgs/register runs before the user row exists.
+limited = [Depends(rate_limit), Depends(authorize_profiling)]
+
 # Mount Incidents at /incidents
-api_router.include_router(incidents.router, prefix="/incidents", tags=["incidents"])
+api_router.include_router(incidents.router, prefix="/incidents", tags=["incidents"], dependencies=limited)
 
 # Mount Users at /users
-api_router.include_router(users.router, prefix="/users", tags=["users"])
+api_router.include_router(users.router, prefix="/users", tags=["users"], dependencies=limited)
 
 # Mount Organizations at /orgs
 api_router.include_router(organization.router, prefix="/orgs", tags=["organization"])
 
 # Mount Admin at /admin
-api_router.include_router(admin.router, prefix="/admin", tags=["admin"])
+api_router.include_router(admin.router, prefix="/admin", tags=["admin"], dependencies=limited)
 
 # Mount Attachments at /incidents (because the paths start with /{incident_id}/attachments)
-api_router.include_router(attachments.router, prefix="/incidents", tags=["attachments"])
\ No newline at end of file
+api_router.include_router(attachments.router, prefix="/incidents", tags=["attachments"], dependencies=limited)
\ No newline at end of file
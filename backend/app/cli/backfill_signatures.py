@@ -0,0 +1,33 @@
+# backend/app/cli/backfill_signatures.py
+#
+# Signs every incident that has no similarity signature yet (those created before similarity
+# search shipped, or missed by the indexer). Safe to rerun; batches are committed as they go.
+# Run from backend/:  python -m app.cli.backfill_signatures [--batch-size 500]
+# or queue it on a worker:  app.core.tasks.backfill_similarity_signatures.delay()
+
+import argparse
+import sys
+import time
+
+from app.db.session import SessionLocal
+from app.services.similarity_service import SIGNATURE_BACKFILL_BATCH, SimilarityService
+
+
+def main(argv=None) -> int:
+  parser = argparse.ArgumentParser(description="Compute missing incident similarity signatures")
+  parser.add_argument("--batch-size", type=int, default=SIGNATURE_BACKFILL_BATCH, help="Incidents per transaction")
+  args = parser.parse_args(argv)
+
+  started = time.perf_counter()
+  db = SessionLocal()
+  try:
+    signed = SimilarityService(db).backfill_signatures(args.batch_size)
+  finally:
+    db.close()
+
+  print(f"signed={signed} ({time.perf_counter() - started:.1f}s)", file=sys.stderr)
+  return 0
+
+
+if __name__ == "__main__":
+  sys.exit(main())
@@ -0,0 +1,61 @@
+# backend/app/cli/import_incidents.py
+#
+# Bulk import of historical incidents exported from other tools.
+# Run from backend/:  python -m app.cli.import_incidents --org acme-corp incidents.jsonl [--source pagerduty] [--dry-run]
+#
+# Each line (JSONL) or row (CSV) looks like:
+#   {"title": "...", "description": "...", "severity": "SEV2", "owner_email": "a@acme.com",
+#    "created_at": "2023-04-01T10:00:00Z", "status": "CLOSED",
+#    "history": [{"at": "2023-04-01T10:05:00Z", "status": "INVESTIGATING", "actor_email": "a@acme.com"}, ...]}
+# In CSV files `history` is a JSON array in a single column.
+
+import argparse
+import sys
+import time
+
+from app.db.session import SessionLocal
+from app.db.models import Organization
+from app.core.importer import FORMATS, guess_format
+from app.services.import_service import ImportService
+
+
+def main(argv=None) -> int:
+  parser = argparse.ArgumentParser(description="Import historical incidents from a JSONL or CSV export")
+  parser.add_argument("file")
+  parser.add_argument("--org", required=True, help="Organization slug")
+  parser.add_argument("--format", choices=FORMATS, help="Defaults to the file extension")
+  parser.add_argument("--source", default="import", help="Tool name recorded on the creation event")
+  parser.add_argument("--dry-run", action="store_true", help="Validate only, write nothing")
+  args = parser.parse_args(argv)
+
+  db = SessionLocal()
+  try:
+    org = db.query(Organization).filter(Organization.slug == args.org).first()
+    if org is None:
+      print(f"Organization '{args.org}' not found", file=sys.stderr)
+      return 1
+
+    started = time.perf_counter()
+
+    def progress(report):
+      rate = report.processed / max(time.perf_counter() - started, 1e-9)
+      print(f"processed={report.processed} imported={report.imported} failed={report.failed} ({rate:,.0f} rows/s)", file=sys.stderr)
+
+    with open(args.file, "rb") as stream:
+      report = ImportService(db).import_stream(
+        stream, args.format or guess_format(args.file), org.id,
+        source=args.source, dry_run=args.dry_run, on_progress=progress
+      )
+  finally:
+    db.close()
+
+  for failure in report.failures:
+    print(f"line {failure.line}: {failure.error}", file=sys.stderr)
+  if report.unknown_users:
+    print(f"unknown users (imported without owner/actor): {', '.join(sorted(report.unknown_users))}", file=sys.stderr)
+  print(report.model_dump_json(exclude={"failures"}))
+  return 0 if report.failed == 0 else 2
+
+
+if __name__ == "__main__":
+  sys.exit(main())
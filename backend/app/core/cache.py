@@ -0,0 +1,183 @@
+# backend/app/core/cache.py
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple
+from uuid import UUID
+
+import orjson
+import redis
+from fastapi import Request, Response
+from fastapi.responses import ORJSONResponse
+
+from app.db.replicas import on_primary
+
+logger = logging.getLogger(__name__)
+
+# redis://... shares versions across workers, memory:// is single-process (tests/dev), unset disables caching
+RESPONSE_CACHE_URL = os.getenv("RESPONSE_CACHE_URL")
+# How long rendered bodies are kept per ETag; 0 keeps only the version counters
+RESPONSE_CACHE_TTL = int(os.getenv("RESPONSE_CACHE_TTL", "300"))
+# Bodies the memory:// backend keeps; least recently used ones go first
+MEMORY_CACHE_MAX_BODIES = 1024
+
+
+class InMemoryCache:
+  """Process-local backend. Versions are not shared between workers, so use it with a single process only."""
+
+  def __init__(self, max_bodies: int = MEMORY_CACHE_MAX_BODIES):
+    self._lock = threading.Lock()
+    self._versions: Dict[str, int] = {}
+    self._bodies: "OrderedDict[str, Tuple[float, bytes]]" = OrderedDict()
+    self._max_bodies = max_bodies
+
+  def get_version(self, org_id: str) -> int:
+    with self._lock:
+      # Seed from the clock so a restart never reissues a version a client may still hold
+      return self._versions.setdefault(org_id, time.time_ns())
+
+  def bump_version(self, org_id: str) -> int:
+    with self._lock:
+      version = self._versions.get(org_id, time.time_ns()) + 1
+      self._versions[org_id] = version
+      return version
+
+  def get_body(self, key: str) -> Optional[bytes]:
+    with self._lock:
+      entry = self._bodies.get(key)
+      if entry is None:
+        return None
+      if entry[0] < time.monotonic():
+        del self._bodies[key]
+        return None
+      self._bodies.move_to_end(key)
+      return entry[1]
+
+  def set_body(self, key: str, body: bytes, ttl: int) -> None:
+    now = time.monotonic()
+    with self._lock:
+      self._bodies[key] = (now + ttl, body)
+      self._bodies.move_to_end(key)
+      # Bodies of superseded versions are never read again: drop expired ones, then the least recently used
+      for stale in [k for k, (expires, _) in self._bodies.items() if expires < now]:
+        del self._bodies[stale]
+      while len(self._bodies) > self._max_bodies:
+        self._bodies.popitem(last=False)
+
+
+class RedisCache:
+  def __init__(self, url: str):
+    self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+  @staticmethod
+  def _version_key(org_id: str) -> str:
+    return f"cache:org_version:{org_id}"
+
+  def get_version(self, org_id: str) -> int:
+    key = self._version_key(org_id)
+    self.client.set(key, time.time_ns(), nx=True)
+    return int(self.client.get(key))
+
+  def bump_version(self, org_id: str) -> int:
+    key = self._version_key(org_id)
+    pipe = self.client.pipeline()
+    pipe.set(key, time.time_ns(), nx=True)
+    pipe.incr(key)
+    return pipe.execute()[-1]
+
+  def get_body(self, key: str) -> Optional[bytes]:
+    return self.client.get(key)
+
+  def set_body(self, key: str, body: bytes, ttl: int) -> None:
+    self.client.set(key, body, ex=ttl)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def configure_cache(url: Optional[str]):
+  """(Re)build the cache backend from a URL; None disables response caching."""
+  global _cache
+  with _cache_lock:
+    if not url:
+      _cache = None
+    elif url.startswith("memory://"):
+      _cache = InMemoryCache()
+    else:
+      _cache = RedisCache(url)
+  return _cache
+
+
+def get_cache():
+  if _cache is None and RESPONSE_CACHE_URL:
+    return configure_cache(RESPONSE_CACHE_URL)
+  return _cache
+
+
+def bump_org_version(org_id: UUID) -> None:
+  """Invalidate every cached read of an organization. Call after each committed write."""
+  cache = get_cache()
+  if cache is None:
+    return
+  try:
+    cache.bump_version(str(org_id))
+  except redis.RedisError:
+    logger.warning("Failed to bump cache version for org %s", org_id, exc_info=True)
+
+
+def _etag_matches(request: Request, etag: str) -> bool:
+  header = request.headers.get("if-none-match")
+  if not header:
+    return False
+  candidates = [tag.strip().removeprefix("W/") for tag in header.split(",")]
+  return etag in candidates or "*" in candidates
+
+
+def cached_response(request: Request, org_id: UUID, scope: str, build: Callable[[], Any]) -> Response:
+  """
+  Serves an org-scoped JSON read with an ETag derived from the org's version counter.
+  A matching If-None-Match gets a 304 without calling `build`; otherwise the rendered
+  body is reused from the cache when present. Bodies are always built on the primary database.
+  """
+  cache = get_cache()
+  if cache is None:
+    return ORJSONResponse(build())
+
+  try:
+    # Read the version before building so a concurrent write can only make the tag older, never the body
+    version = cache.get_version(str(org_id))
+  except redis.RedisError:
+    logger.warning("Response cache unavailable, serving %s uncached", scope, exc_info=True)
+    return ORJSONResponse(build())
+
+  digest = hashlib.sha1(f"{org_id}:{scope}:{version}".encode("utf-8")).hexdigest()[:20]
+  etag = f'"{digest}"'
+  headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+
+  if _etag_matches(request, etag):
+    return Response(status_code=304, headers=headers)
+
+  body_key = f"cache:body:{digest}"
+  body = None
+  if RESPONSE_CACHE_TTL > 0:
+    try:
+      body = cache.get_body(body_key)
+    except redis.RedisError:
+      body = None
+
+  if body is None:
+    # A lagging replica would pin a body that misses the write behind this version until the next write
+    with on_primary():
+      body = orjson.dumps(build())
+    if RESPONSE_CACHE_TTL > 0:
+      try:
+        cache.set_body(body_key, body, RESPONSE_CACHE_TTL)
+      except redis.RedisError:
+        pass
+
+  return Response(content=body, media_type="application/json", headers=headers)
@@ -1,17 +1,33 @@
 import os
 from celery import Celery
 from celery.schedules import crontab
+from kombu import Queue
 
 # Get Redis URL from environment or localhost (for local testing)
 BROKER_URL = os.getenv("CELERY_BROKER_URL", "redis://localhost:6379/0")
+# Worst-case delay between an SLA deadline passing and the incident being escalated
+SLA_POLL_SECONDS = float(os.getenv("SLA_POLL_SECONDS", "15"))
+# How stale the admin charts' MTTR / MTTA / breach rate may get (Postgres materialized view refresh)
+ANALYTICS_REFRESH_SECONDS = float(os.getenv("ANALYTICS_REFRESH_SECONDS", "300"))
+
+# Every task is fire-and-forget; set this only to inspect results while debugging
+RESULT_BACKEND_URL = os.getenv("CELERY_RESULT_BACKEND")
 
 celery = Celery(
   "incidentflow",
   broker=BROKER_URL,
-  backend=BROKER_URL,
+  backend=RESULT_BACKEND_URL,
   include=["app.core.tasks"]
 )
 
+# One queue per kind of work so a flood of one never delays another; run a worker per queue group
+# (see docker-compose.yml): alerts/sla are short and latency-sensitive, ai/maintenance are long.
+QUEUES = ("alerts", "sla", "ai", "maintenance")
+
+# Redis priorities run 0 (first) to 9; messages without one are filed at task_default_priority
+ALERT_PRIORITIES = {"SEV1": 0, "SEV2": 3}
+DEFAULT_PRIORITY = 6
+
 # Optional configuration
 celery.conf.update(
   task_serializer="json",
@@ -19,12 +35,44 @@ celery.conf.update(
   result_serializer="json",
   timezone="UTC",
   enable_utc=True,
+  task_queues=[Queue(name) for name in QUEUES],
+  task_default_queue="maintenance",
+  task_routes={
+    "app.core.tasks.send_incident_alert_email": {"queue": "alerts"},
+    "app.core.tasks.check_sla_breaches": {"queue": "sla"},
+    "app.core.tasks.index_incident_similarity": {"queue": "ai"},
+    "app.core.tasks.index_incidents_similarity": {"queue": "ai"},
+    "app.core.tasks.backfill_similarity_signatures": {"queue": "ai"},
+    "app.core.tasks.archive_closed_incident_events": {"queue": "maintenance"},
+    "app.core.tasks.ensure_event_partitions": {"queue": "maintenance"},
+    "app.core.tasks.export_dataset": {"queue": "maintenance"},
+    "app.core.tasks.refresh_analytics_views": {"queue": "maintenance"},
+  },
+  task_ignore_result=True,
+  task_default_priority=DEFAULT_PRIORITY,
+  broker_transport_options={"queue_order_strategy": "priority", "priority_steps": list(range(10)), "sep": ":"},
+  # Reserve one message per process at a time so priorities hold and a long export cannot hold short tasks hostage
+  worker_prefetch_multiplier=1,
 )
 
 # Beat Schedule
 celery.conf.beat_schedule = {
-  "check-slas-hourly": {
-    "task": "app.core.tasks.check_sla_breaches", # The function name
-    "schedule": crontab(minute=0), # Run every 60 minutes
-  }
+  "check-slas": {
+    "task": "app.core.tasks.check_sla_breaches",
+    "schedule": SLA_POLL_SECONDS, # Cheap index probe; deadlines are precomputed per incident
+    "options": {"expires": SLA_POLL_SECONDS}, # Never let missed polls pile up behind a busy worker
+  },
+  "ensure-event-partitions-daily": {
+    "task": "app.core.tasks.ensure_event_partitions",
+    "schedule": crontab(minute=15, hour=0),
+  },
+  "refresh-analytics-views": {
+    "task": "app.core.tasks.refresh_analytics_views",
+    "schedule": ANALYTICS_REFRESH_SECONDS,
+    "options": {"expires": ANALYTICS_REFRESH_SECONDS}, # The next run covers anything a skipped one would have
+  },
+  "archive-closed-incident-events-daily": {
+    "task": "app.core.tasks.archive_closed_incident_events",
+    "schedule": crontab(minute=30, hour=3), # Off-peak
+  },
 }
\ No newline at end of file
@@ -0,0 +1,118 @@
+# backend/app/core/distribution.py
+
+from typing import Dict, Hashable, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+# Quantiles are reported within 1% of the true value. Buckets are log-spaced (DDSketch):
+# bucket i holds durations in (MIN_SECONDS * GAMMA**(i-1), MIN_SECONDS * GAMMA**i].
+RELATIVE_ACCURACY = 0.01
+MIN_SECONDS = 1.0 # Anything faster is reported as about a second
+MAX_SECONDS = 10 * 365 * 86400.0 # Anything slower is clamped to ten years
+_GAMMA = (1 + RELATIVE_ACCURACY) / (1 - RELATIVE_ACCURACY)
+_LOG_GAMMA = np.log(_GAMMA)
+NUM_BUCKETS = int(np.ceil(np.log(MAX_SECONDS / MIN_SECONDS) / _LOG_GAMMA)) + 1
+
+# Exact histogram bins: [edge, next edge), the last one open-ended
+HISTOGRAM_EDGES = (0, 300, 900, 1800, 3600, 4 * 3600, 8 * 3600, 86400, 3 * 86400, 7 * 86400)
+HISTOGRAM_LABELS = ("<5m", "5-15m", "15-30m", "30m-1h", "1-4h", "4-8h", "8-24h", "1-3d", "3-7d", ">=7d")
+
+_EDGES = np.asarray(HISTOGRAM_EDGES, dtype=np.float64)
+_BUCKET_VALUES = MIN_SECONDS * _GAMMA ** np.arange(NUM_BUCKETS) * 2 / (1 + _GAMMA)
+
+
+def _buckets(seconds: np.ndarray) -> np.ndarray:
+  clamped = np.clip(seconds, MIN_SECONDS, MAX_SECONDS)
+  return np.ceil(np.log(clamped / MIN_SECONDS) / _LOG_GAMMA).astype(np.intp)
+
+
+class DurationSketch:
+  """
+  Streaming, mergeable distribution of durations (seconds), one row per key (a severity, an owner...).
+  Memory is fixed per key however many values are added, so arrays can be fed chunk by chunk.
+  Quantiles come from the log buckets; counts, means and histograms are exact.
+  """
+
+  def __init__(self):
+    self.keys: List[Hashable] = []
+    self._rows: Dict[Hashable, int] = {}
+    self.buckets = np.zeros((0, NUM_BUCKETS), dtype=np.int64)
+    self.histograms = np.zeros((0, len(HISTOGRAM_EDGES)), dtype=np.int64)
+    self.totals = np.zeros(0, dtype=np.float64)
+
+  def _codes(self, keys: Sequence[Hashable]) -> np.ndarray:
+    rows = self._rows
+    codes = np.fromiter((rows.setdefault(key, len(rows)) for key in keys), dtype=np.intp, count=len(keys))
+    if len(rows) > len(self.keys):
+      self.keys.extend(list(rows)[len(self.keys):])
+      grow = len(rows) - self.buckets.shape[0]
+      self.buckets = np.vstack([self.buckets, np.zeros((grow, NUM_BUCKETS), dtype=np.int64)])
+      self.histograms = np.vstack([self.histograms, np.zeros((grow, len(HISTOGRAM_EDGES)), dtype=np.int64)])
+      self.totals = np.concatenate([self.totals, np.zeros(grow)])
+    return codes
+
+  def add(self, seconds: np.ndarray, keys: Optional[Sequence[Hashable]] = None) -> None:
+    """Adds a chunk of durations; `keys[i]` is the row of `seconds[i]` (all under None when omitted)."""
+    seconds = np.maximum(np.asarray(seconds, dtype=np.float64), 0.0) # Clock skew can make a few negative
+    if not seconds.size:
+      return
+    if keys is None:
+      codes = np.full(seconds.size, self._codes([None])[0], dtype=np.intp)
+    else:
+      codes = self._codes(keys)
+    rows = len(self.keys)
+    self.buckets += np.bincount(
+      codes * NUM_BUCKETS + _buckets(seconds), minlength=rows * NUM_BUCKETS
+    ).reshape(rows, NUM_BUCKETS)
+    bins = np.searchsorted(_EDGES, seconds, side="right") - 1
+    self.histograms += np.bincount(
+      codes * len(HISTOGRAM_EDGES) + bins, minlength=rows * len(HISTOGRAM_EDGES)
+    ).reshape(rows, len(HISTOGRAM_EDGES))
+    self.totals += np.bincount(codes, weights=seconds, minlength=rows)
+
+  def merge(self, other: "DurationSketch") -> None:
+    for key, row in other._rows.items():
+      [mine] = self._codes([key])
+      self.buckets[mine] += other.buckets[row]
+      self.histograms[mine] += other.histograms[row]
+      self.totals[mine] += other.totals[row]
+
+  def quantiles(self, qs: Iterable[float]) -> np.ndarray:
+    """Per key (rows, in `keys` order) and per q (columns); 0 for keys without values."""
+    qs = np.asarray(list(qs), dtype=np.float64)
+    cumulative = np.cumsum(self.buckets, axis=1)
+    counts = cumulative[:, -1:]
+    # Nearest rank: the q-quantile is the ceil(q * n)-th smallest value, i.e. the first bucket reaching that count
+    ranks = np.maximum(np.ceil(qs[None, :] * counts), 1)
+    indexes = (cumulative[:, None, :] < ranks[:, :, None]).sum(axis=2)
+    return np.where(counts > 0, _BUCKET_VALUES[np.minimum(indexes, NUM_BUCKETS - 1)], 0.0)
+
+  def summaries(self, qs: Sequence[float] = (0.5, 0.9, 0.99)) -> Dict[Hashable, dict]:
+    """Plain-Python count, mean, quantiles (keyed "p50", "p90"...) and histogram for every key."""
+    counts = self.histograms.sum(axis=1)
+    means = np.divide(self.totals, counts, out=np.zeros_like(self.totals), where=counts > 0)
+    quantiles = self.quantiles(qs)
+    names = [f"p{round(q * 100):g}" for q in qs]
+    return {
+      key: {
+        "count": int(counts[row]),
+        "mean": float(means[row]),
+        **{name: float(value) for name, value in zip(names, quantiles[row])},
+        "histogram": self.histograms[row].tolist(),
+      }
+      for row, key in enumerate(self.keys)
+    }
+
+
+def sketch_durations(partitions: Iterable[Sequence[tuple]]) -> Dict[str, DurationSketch]:
+  """
+  Feeds chunks of (seconds, severity, owner_id) rows into three sketches: "overall", "severity"
+  and "owner". Only one chunk of rows is held at a time.
+  """
+  sketches = {"overall": DurationSketch(), "severity": DurationSketch(), "owner": DurationSketch()}
+  for rows in partitions:
+    seconds = np.fromiter((row[0] for row in rows), dtype=np.float64, count=len(rows))
+    sketches["overall"].add(seconds)
+    sketches["severity"].add(seconds, [row[1] for row in rows])
+    sketches["owner"].add(seconds, [row[2] for row in rows])
+  return sketches
@@ -0,0 +1,42 @@
+# backend/app/core/event_archive.py
+
+import gzip
+from datetime import datetime
+from typing import List
+from uuid import UUID
+
+import orjson
+from app.core import storage
+
+# Cold storage for the audit log of long-closed incidents: one gzip'd JSONL object per incident
+def archive_key(org_id: UUID, incident_id: UUID) -> str:
+  return f"orgs/{org_id}/archive/incident_events/{incident_id}.jsonl.gz"
+
+def write_event_archive(org_id: UUID, incident_id: UUID, rows: List[dict]) -> str:
+  key = archive_key(org_id, incident_id)
+  body = gzip.compress(b"".join(orjson.dumps(row) + b"\n" for row in rows))
+  storage.get_s3_client().put_object(
+    Bucket=storage.BUCKET_NAME,
+    Key=key,
+    Body=body,
+    ContentType="application/x-ndjson",
+    ContentEncoding="gzip",
+  )
+  return key
+
+def read_event_archive(org_id: UUID, incident_id: UUID) -> List[dict]:
+  response = storage.get_s3_client().get_object(Bucket=storage.BUCKET_NAME, Key=archive_key(org_id, incident_id))
+  lines = gzip.decompress(response["Body"].read()).splitlines()
+  return [orjson.loads(line) for line in lines if line]
+
+_UUID_FIELDS = ("id", "incident_id", "actor_id", "organization_id")
+
+def decode_event(row: dict) -> dict:
+  """Turns an archived JSON row back into column values (UUIDs, datetimes)."""
+  event = dict(row)
+  for field in _UUID_FIELDS:
+    if event.get(field):
+      event[field] = UUID(event[field])
+  if event.get("created_at"):
+    event["created_at"] = datetime.fromisoformat(event["created_at"])
+  return event
@@ -0,0 +1,57 @@
+# backend/app/core/export.py
+
+import csv
+import enum
+import io
+import zlib
+from datetime import datetime
+from typing import Iterable, Iterator, List, Sequence
+from uuid import UUID
+
+import orjson
+
+# Streaming encoders for admin exports. Each yields one bytes chunk per batch of rows,
+# so memory stays bounded by the batch size rather than the export size.
+
+FORMATS = {"csv": ("text/csv", "csv"), "jsonl": ("application/x-ndjson", "jsonl")}
+
+def _csv_value(value):
+  if value is None:
+    return ""
+  if isinstance(value, enum.Enum):
+    return value.value
+  if isinstance(value, datetime):
+    return value.isoformat()
+  if isinstance(value, UUID):
+    return str(value)
+  return value
+
+def iter_csv(batches: Iterable[Sequence[dict]], columns: List[str]) -> Iterator[bytes]:
+  buffer = io.StringIO()
+  writer = csv.writer(buffer)
+  writer.writerow(columns)
+  for batch in batches:
+    writer.writerows([_csv_value(row.get(c)) for c in columns] for row in batch)
+    yield buffer.getvalue().encode("utf-8")
+    buffer.seek(0)
+    buffer.truncate()
+  if buffer.tell():
+    yield buffer.getvalue().encode("utf-8")
+
+def iter_jsonl(batches: Iterable[Sequence[dict]], columns: List[str]) -> Iterator[bytes]:
+  for batch in batches:
+    if batch:
+      yield b"".join(orjson.dumps(row) + b"\n" for row in batch)
+
+def iter_gzip(chunks: Iterable[bytes], level: int = 6) -> Iterator[bytes]:
+  # wbits=31 writes a gzip header/trailer, so the stream is a regular .gz file
+  compressor = zlib.compressobj(level, zlib.DEFLATED, 31)
+  for chunk in chunks:
+    compressed = compressor.compress(chunk)
+    if compressed:
+      yield compressed
+  yield compressor.flush()
+
+def encode(batches: Iterable[Sequence[dict]], columns: List[str], fmt: str, compress: bool = False) -> Iterator[bytes]:
+  chunks = iter_csv(batches, columns) if fmt == "csv" else iter_jsonl(batches, columns)
+  return iter_gzip(chunks) if compress else chunks
@@ -1,8 +1,13 @@
 # backend/app/core/fsm.py
 
+import json
+import os
 from enum import Enum
+from functools import lru_cache
+from typing import Dict, Iterable, Mapping, Optional, Tuple
+from uuid import UUID
 
-# Define incident statuses
+# Define incident statuses (canonical; app.db.models re-exports this enum)
 class IncidentStatus(str, Enum):
   DETECTED = "DETECTED"
   INVESTIGATING = "INVESTIGATING"
@@ -12,8 +17,12 @@ class IncidentStatus(str, Enum):
   CLOSED = "CLOSED"
   ESCALATED = "ESCALATED"
 
-# Valid transitions map
-VALID_TRANSITIONS = {
+STATES: Tuple[IncidentStatus, ...] = tuple(IncidentStatus)
+# str-valued enum members hash like their values, so raw DB strings hit the same keys
+_BIT = {state: 1 << i for i, state in enumerate(STATES)}
+
+# Default transitions
+DEFAULT_TRANSITIONS = {
   IncidentStatus.DETECTED: [IncidentStatus.INVESTIGATING, IncidentStatus.CLOSED, IncidentStatus.ESCALATED],
   IncidentStatus.INVESTIGATING: [IncidentStatus.MITIGATED, IncidentStatus.ESCALATED],
   IncidentStatus.MITIGATED: [IncidentStatus.RESOLVED, IncidentStatus.INVESTIGATING], # Regression possible
@@ -23,6 +32,60 @@ VALID_TRANSITIONS = {
   IncidentStatus.ESCALATED: [IncidentStatus.INVESTIGATING] # Re-assignment after escalation
 }
 
+
+class Workflow:
+  """
+  A transition table compiled once: one bitmask per state for O(1) checks,
+  plus the allowed targets as a shared tuple, in table order, for serialization.
+  """
+  __slots__ = ("masks", "allowed")
+
+  def __init__(self, transitions: Mapping[IncidentStatus, Iterable[IncidentStatus]]):
+    unknown = [s for s in transitions if s not in _BIT]
+    if unknown:
+      raise ValueError(f"Unknown states in workflow: {', '.join(map(str, unknown))}")
+    masks: Dict[IncidentStatus, int] = {}
+    allowed: Dict[IncidentStatus, Tuple[IncidentStatus, ...]] = {}
+    for state in STATES:
+      targets = tuple(IncidentStatus(t) for t in transitions.get(state, ()))
+      if state in targets:
+        raise ValueError(f"{state.value} cannot transition to itself")
+      masks[state] = sum(_BIT[t] for t in set(targets))
+      allowed[state] = targets
+    self.masks = masks
+    self.allowed = allowed
+
+  def can_transition(self, current_state, new_state) -> bool:
+    return bool(self.masks.get(current_state, 0) & _BIT.get(new_state, 0))
+
+  def allowed_transitions(self, state) -> Tuple[IncidentStatus, ...]:
+    return self.allowed.get(state, ())
+
+
+DEFAULT_WORKFLOW = Workflow(DEFAULT_TRANSITIONS)
+
+# Valid transitions map (state -> cached tuple of targets)
+VALID_TRANSITIONS = DEFAULT_WORKFLOW.allowed
+
 def can_transition(current_state: IncidentStatus, new_state: IncidentStatus) -> bool:
   # Check if the transition is valid, return True if valid, else False
-  return new_state in VALID_TRANSITIONS.get(current_state, [])
\ No newline at end of file
+  return DEFAULT_WORKFLOW.can_transition(current_state, new_state)
+
+
+# --- Per-org workflows ---
+# INCIDENT_WORKFLOWS_FILE points at JSON of the form {"<org_id>": {"DETECTED": ["INVESTIGATING", ...], ...}}.
+# States missing from an org's table have no outgoing transitions. The file is read once per process.
+INCIDENT_WORKFLOWS_FILE = os.getenv("INCIDENT_WORKFLOWS_FILE")
+
+@lru_cache(maxsize=None)
+def _load_workflows(path: Optional[str]) -> Dict[str, Workflow]:
+  if not path:
+    return {}
+  with open(path, "r", encoding="utf-8") as f:
+    definitions = json.load(f)
+  return {str(UUID(org_id)): Workflow(table) for org_id, table in definitions.items()}
+
+def get_workflow(org_id: Optional[UUID] = None) -> Workflow:
+  if org_id is None:
+    return DEFAULT_WORKFLOW
+  return _load_workflows(INCIDENT_WORKFLOWS_FILE).get(str(org_id), DEFAULT_WORKFLOW)
@@ -0,0 +1,171 @@
+# backend/app/core/idempotency.py
+
+import hashlib
+import logging
+import os
+import threading
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
+
+import orjson
+import redis
+from fastapi import HTTPException, Response
+
+logger = logging.getLogger(__name__)
+
+# redis://... shares keys across workers, memory:// is single-process (tests/dev), unset ignores Idempotency-Key
+IDEMPOTENCY_URL = os.getenv("IDEMPOTENCY_URL")
+# How long a completed response is replayed for
+IDEMPOTENCY_TTL = int(os.getenv("IDEMPOTENCY_TTL", "86400"))
+# How long a claim survives a crashed worker, and how long a duplicate waits for the original to finish
+IDEMPOTENCY_LOCK_TTL = 60
+IDEMPOTENCY_WAIT_SECONDS = float(os.getenv("IDEMPOTENCY_WAIT_SECONDS", "5"))
+_POLL_INTERVAL = 0.05
+_MAX_KEY_LENGTH = 255
+
+
+class InMemoryIdempotencyStore:
+  """Process-local backend. Keys are not shared between workers, so use it with a single process only."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._records: Dict[str, Tuple[float, bytes]] = {}
+
+  def _live(self, key: str) -> Optional[bytes]:
+    entry = self._records.get(key)
+    if entry is None or entry[0] < time.monotonic():
+      return None
+    return entry[1]
+
+  def claim(self, key: str, record: bytes, ttl: int) -> bool:
+    with self._lock:
+      if self._live(key) is not None:
+        return False
+      self._records[key] = (time.monotonic() + ttl, record)
+      return True
+
+  def get(self, key: str) -> Optional[bytes]:
+    with self._lock:
+      return self._live(key)
+
+  def save(self, key: str, record: bytes, ttl: int) -> None:
+    with self._lock:
+      self._records[key] = (time.monotonic() + ttl, record)
+
+  def release(self, key: str) -> None:
+    with self._lock:
+      self._records.pop(key, None)
+
+
+class RedisIdempotencyStore:
+  def __init__(self, url: str):
+    self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+  def claim(self, key: str, record: bytes, ttl: int) -> bool:
+    return bool(self.client.set(key, record, nx=True, ex=ttl))
+
+  def get(self, key: str) -> Optional[bytes]:
+    return self.client.get(key)
+
+  def save(self, key: str, record: bytes, ttl: int) -> None:
+    self.client.set(key, record, ex=ttl)
+
+  def release(self, key: str) -> None:
+    self.client.delete(key)
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def configure_idempotency(url: Optional[str]):
+  """(Re)build the idempotency backend from a URL; None disables Idempotency-Key handling."""
+  global _store
+  with _store_lock:
+    if not url:
+      _store = None
+    elif url.startswith("memory://"):
+      _store = InMemoryIdempotencyStore()
+    else:
+      _store = RedisIdempotencyStore(url)
+  return _store
+
+
+def get_idempotency_store():
+  if _store is None and IDEMPOTENCY_URL:
+    return configure_idempotency(IDEMPOTENCY_URL)
+  return _store
+
+
+def _fingerprint(operation: str, payload: Any) -> str:
+  body = orjson.dumps(payload, option=orjson.OPT_SORT_KEYS)
+  return hashlib.sha256(operation.encode("utf-8") + b"\n" + body).hexdigest()
+
+
+def _wait_for(store, key: str) -> Optional[dict]:
+  deadline = time.monotonic() + IDEMPOTENCY_WAIT_SECONDS
+  while True:
+    raw = store.get(key)
+    record = orjson.loads(raw) if raw else None
+    if record is None or record["state"] == "done" or time.monotonic() >= deadline:
+      return record
+    time.sleep(_POLL_INTERVAL)
+
+
+def idempotent_response(key: Optional[str], owner_id, operation: str, payload: Any,
+                        build: Callable[[], Any], status_code: int = 200) -> Any:
+  """
+  Runs `build` at most once per (owner, Idempotency-Key) and replays its JSON response for retries.
+  `operation` and `payload` fingerprint the request: reusing a key for a different request is a 422.
+  A duplicate that arrives while the original is still running waits for it, then gets a 409 if it never finished.
+  Failed requests release the key so the client can retry them.
+  """
+  store = get_idempotency_store()
+  if not key or store is None:
+    return build()
+  if len(key) > _MAX_KEY_LENGTH:
+    raise HTTPException(status_code=400, detail=f"Idempotency-Key must be at most {_MAX_KEY_LENGTH} characters")
+
+  record_key = f"idempotency:{owner_id}:{key}"
+  fingerprint = _fingerprint(operation, payload)
+
+  try:
+    while not store.claim(record_key, orjson.dumps({"state": "pending", "fingerprint": fingerprint}), IDEMPOTENCY_LOCK_TTL):
+      record = _wait_for(store, record_key)
+      if record is None:
+        continue # Original failed and released the key: take it over
+      if record["fingerprint"] != fingerprint:
+        raise HTTPException(status_code=422, detail="Idempotency-Key was already used for a different request")
+      if record["state"] != "done":
+        raise HTTPException(status_code=409, detail="A request with this Idempotency-Key is still in progress", headers={"Retry-After": "1"})
+      return Response(
+        content=record["body"].encode("utf-8"),
+        status_code=record["status"],
+        media_type="application/json",
+        headers={"Idempotent-Replayed": "true"},
+      )
+  except redis.RedisError:
+    logger.warning("Idempotency store unavailable, running %s without replay protection", operation, exc_info=True)
+    return build()
+
+  try:
+    result = build()
+  except BaseException:
+    _release(store, record_key)
+    raise
+
+  body = orjson.dumps(result)
+  try:
+    store.save(record_key, orjson.dumps({
+      "state": "done", "fingerprint": fingerprint, "status": status_code, "body": body.decode("utf-8"),
+    }), IDEMPOTENCY_TTL)
+  except redis.RedisError:
+    logger.warning("Failed to store idempotent response for %s", operation, exc_info=True)
+  return Response(content=body, status_code=status_code, media_type="application/json")
+
+
+def _release(store, record_key: str) -> None:
+  try:
+    store.release(record_key)
+  except redis.RedisError:
+    logger.warning("Failed to release idempotency key %s", record_key, exc_info=True)
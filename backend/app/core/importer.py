@@ -0,0 +1,40 @@
+# backend/app/core/importer.py
+
+import codecs
+import csv
+from typing import BinaryIO, Iterator, Tuple, Union
+
+import orjson
+
+# Streaming readers for bulk imports: one record at a time, so file size never bounds memory.
+# Records are returned undecoded; the import service validates them so a bad line is a reported failure, not a crash.
+
+FORMATS = ("jsonl", "csv")
+
+def guess_format(file_name: str) -> str:
+  name = file_name.lower()
+  return "csv" if name.endswith(".csv") else "jsonl"
+
+def iter_records(stream: BinaryIO, fmt: str) -> Iterator[Tuple[int, Union[bytes, dict]]]:
+  """Yields (line number, raw record) pairs."""
+  if fmt == "csv":
+    reader = csv.DictReader(codecs.iterdecode(stream, "utf-8-sig"))
+    for row in reader:
+      yield reader.line_num, row
+    return
+
+  for line_no, line in enumerate(stream, start=1):
+    if line.strip():
+      yield line_no, line
+
+def load_record(raw: Union[bytes, dict]) -> dict:
+  if isinstance(raw, dict):
+    # CSV cells are strings; empty cells mean "not set" and history is a JSON array
+    record = {k: v for k, v in raw.items() if k and v not in ("", None)}
+    if "history" in record:
+      record["history"] = orjson.loads(record["history"])
+    return record
+  record = orjson.loads(raw)
+  if not isinstance(record, dict):
+    raise ValueError("each line must be a JSON object")
+  return record
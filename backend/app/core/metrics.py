@@ -0,0 +1,58 @@
+# backend/app/core/metrics.py
+
+import threading
+from typing import Dict
+
+
+class CallStats:
+  __slots__ = ("calls", "errors", "total_seconds", "max_seconds", "counters")
+
+  def __init__(self):
+    self.calls = 0
+    self.errors = 0
+    self.total_seconds = 0.0
+    self.max_seconds = 0.0
+    self.counters: Dict[str, int] = {}
+
+  def as_dict(self) -> dict:
+    return {
+      "calls": self.calls,
+      "errors": self.errors,
+      "avg_ms": round(self.total_seconds / self.calls * 1000, 2) if self.calls else 0.0,
+      "max_ms": round(self.max_seconds * 1000, 2),
+      **self.counters,
+    }
+
+
+class MetricsRegistry:
+  """
+  Process-local call statistics for outbound dependencies (latency, error count, usage counters),
+  keyed by a name such as "groq:llama-3.3-70b-versatile". Each worker keeps its own numbers.
+  """
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._stats: Dict[str, CallStats] = {}
+
+  def record(self, name: str, seconds: float, ok: bool = True, **counters: int) -> None:
+    with self._lock:
+      stats = self._stats.get(name)
+      if stats is None:
+        stats = self._stats[name] = CallStats()
+      stats.calls += 1
+      stats.errors += 0 if ok else 1
+      stats.total_seconds += seconds
+      stats.max_seconds = max(stats.max_seconds, seconds)
+      for key, value in counters.items():
+        stats.counters[key] = stats.counters.get(key, 0) + (value or 0)
+
+  def snapshot(self) -> Dict[str, dict]:
+    with self._lock:
+      return {name: stats.as_dict() for name, stats in self._stats.items()}
+
+  def reset(self) -> None:
+    with self._lock:
+      self._stats.clear()
+
+
+metrics = MetricsRegistry()
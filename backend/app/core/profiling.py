@@ -0,0 +1,257 @@
+# backend/app/core/profiling.py
+
+import functools
+import inspect
+import logging
+import os
+import sys
+import threading
+import time
+import uuid
+from contextvars import ContextVar
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs
+
+import orjson
+from fastapi.routing import APIRoute
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.concurrency import run_in_threadpool
+
+from app.core import storage
+
+logger = logging.getLogger(__name__)
+
+# Seconds between stack samples of a profiled request
+PROFILE_SAMPLE_INTERVAL = float(os.getenv("PROFILE_SAMPLE_INTERVAL", "0.001"))
+PROFILE_LINK_EXPIRY = 3600
+
+_TRUTHY = {"1", "true", "yes"}
+_current: ContextVar[Optional["RequestProfile"]] = ContextVar("request_profile", default=None)
+_labels: Dict[object, str] = {}
+
+
+def current_profile() -> Optional["RequestProfile"]:
+  return _current.get()
+
+
+def _label(code) -> str:
+  label = _labels.get(code)
+  if label is None:
+    path = code.co_filename
+    for marker in ("/site-packages/", "/backend/"):
+      if marker in path:
+        path = path.split(marker, 1)[1]
+        break
+    label = _labels[code] = f"{code.co_qualname} ({path}:{code.co_firstlineno})"
+  return label
+
+
+class RequestProfile:
+  """
+  Stack samples and SQL timings of one request, collected only after `start()` (i.e. once the caller
+  has been checked to be an admin). Stacks are kept from the endpoint frame down, in the folded format
+  flamegraph.pl, speedscope and inferno read.
+  """
+
+  def __init__(self, method: str, path: str):
+    self.method = method
+    self.path = path
+    self.key: Optional[str] = None
+    self.stacks: Dict[str, int] = {}
+    self.samples = 0
+    self.sql: List[tuple] = [] # (seconds, statement)
+    self.started: Optional[float] = None
+    self.finished: Optional[float] = None
+    self._stop = threading.Event()
+    self._sampler: Optional[threading.Thread] = None
+    self._thread: Optional[int] = None
+    self._root = None # Frame of ProfiledRoute's wrapper around this request's endpoint
+
+  @property
+  def active(self) -> bool:
+    return self.started is not None
+
+  def start(self, org_id) -> None:
+    if self.active:
+      return
+    stamp = datetime.now(timezone.utc).strftime("%Y%m%dT%H%M%SZ")
+    self.key = f"orgs/{org_id}/profiles/{stamp}-{uuid.uuid4().hex[:8]}.folded"
+    self.started = time.perf_counter()
+    _watch_sql(True)
+    self._sampler = threading.Thread(target=self._sample, name="request-profiler", daemon=True)
+    self._sampler.start()
+
+  def enter_endpoint(self, frame) -> None:
+    self._thread = threading.get_ident()
+    self._root = frame
+
+  def stop(self) -> None:
+    if not self.active or self.finished is not None:
+      return
+    self._stop.set()
+    self._sampler.join()
+    self.finished = time.perf_counter()
+    self._root = None
+    _watch_sql(False)
+
+  def _sample(self) -> None:
+    # Only this request's endpoint call is sampled: other requests running the same endpoint, on other
+    # threads or interleaved on the event loop, never have our wrapper frame below them
+    while not self._stop.wait(PROFILE_SAMPLE_INTERVAL):
+      root = self._root
+      if root is None:
+        continue
+      frame = sys._current_frames().get(self._thread)
+      stack = []
+      while frame is not None and frame is not root:
+        stack.append(frame.f_code)
+        frame = frame.f_back
+      if frame is None or not stack:
+        continue
+      folded = ";".join(_label(code) for code in reversed(stack))
+      self.stacks[folded] = self.stacks.get(folded, 0) + 1
+      self.samples += 1
+
+  @property
+  def duration_ms(self) -> float:
+    return ((self.finished or time.perf_counter()) - self.started) * 1000
+
+  def server_timing(self) -> str:
+    sql_ms = sum(seconds for seconds, _ in self.sql) * 1000
+    return f'app;dur={self.duration_ms:.1f}, sql;dur={sql_ms:.1f};desc="{len(self.sql)} statements"'
+
+  def folded(self) -> bytes:
+    return "".join(f"{stack} {count}\n" for stack, count in sorted(self.stacks.items())).encode()
+
+  def summary(self) -> dict:
+    return {
+      "method": self.method,
+      "path": self.path,
+      "duration_ms": round(self.duration_ms, 2),
+      "samples": self.samples,
+      "sample_interval_ms": PROFILE_SAMPLE_INTERVAL * 1000,
+      "sql": [
+        {"ms": round(seconds * 1000, 3), "statement": statement}
+        for seconds, statement in sorted(self.sql, key=lambda item: item[0], reverse=True)
+      ],
+    }
+
+
+def write_profile(profile: RequestProfile) -> None:
+  """Stores the folded stacks and, next to them, the request summary with SQL timings."""
+  s3 = storage.get_s3_client()
+  try:
+    s3.put_object(Bucket=storage.BUCKET_NAME, Key=profile.key, Body=profile.folded(), ContentType="text/plain")
+    s3.put_object(
+      Bucket=storage.BUCKET_NAME,
+      Key=profile.key.removesuffix(".folded") + ".json",
+      Body=orjson.dumps(profile.summary()),
+      ContentType="application/json",
+    )
+  except Exception:
+    logger.warning("Error storing request profile %s", profile.key, exc_info=True)
+
+
+def _profiled(endpoint):
+  if inspect.iscoroutinefunction(endpoint):
+    @functools.wraps(endpoint)
+    async def call(*args, **kwargs):
+      profile = _current.get()
+      if profile is not None and profile.active:
+        profile.enter_endpoint(sys._getframe())
+      return await endpoint(*args, **kwargs)
+  else:
+    @functools.wraps(endpoint)
+    def call(*args, **kwargs):
+      # Sync endpoints run in the threadpool, which copies the request's context (and so `_current`) over
+      profile = _current.get()
+      if profile is not None and profile.active:
+        profile.enter_endpoint(sys._getframe())
+      return endpoint(*args, **kwargs)
+  return call
+
+
+class ProfiledRoute(APIRoute):
+  """Route class of profilable routers: the endpoint tells a running profile which thread and frame it is."""
+
+  def __init__(self, path: str, endpoint, **kwargs):
+    super().__init__(path, _profiled(endpoint), **kwargs)
+
+
+# SQL timings: engine listeners exist only while at least one profile is running
+_sql_lock = threading.Lock()
+_sql_watchers = 0
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  if _current.get() is not None:
+    conn.info.setdefault("profile_started", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+  profile = _current.get()
+  started = conn.info.get("profile_started")
+  if profile is not None and started:
+    profile.sql.append((time.perf_counter() - started.pop(), statement))
+
+
+def _watch_sql(on: bool) -> None:
+  global _sql_watchers
+  with _sql_lock:
+    _sql_watchers += 1 if on else -1
+    if on and _sql_watchers == 1:
+      event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+      event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+    elif not on and _sql_watchers == 0:
+      event.remove(Engine, "before_cursor_execute", _before_cursor_execute)
+      event.remove(Engine, "after_cursor_execute", _after_cursor_execute)
+
+
+def _requested(scope) -> bool:
+  query = scope.get("query_string", b"")
+  if b"profile=" in query and any(v.lower() in _TRUTHY for v in parse_qs(query.decode("latin-1")).get("profile", [])):
+    return True
+  for name, value in scope["headers"]:
+    if name == b"x-profile":
+      return value.decode("latin-1").lower() in _TRUTHY
+  return False
+
+
+class ProfilingMiddleware:
+  """
+  Profiles requests sent with `X-Profile: 1` or `?profile=1`. The middleware only opens the profile;
+  sampling starts in `authorize_profiling` (app/api/deps.py) once the caller is known to be an admin,
+  so other callers get a 403 and nothing runs for requests without the switch. Only routers built with
+  `route_class=ProfiledRoute` are sampled. The response carries a Server-Timing summary and an
+  `X-Profile-Url` link to the stored profile.
+  """
+
+  def __init__(self, app):
+    self.app = app
+
+  async def __call__(self, scope, receive, send):
+    if scope["type"] != "http" or not _requested(scope):
+      return await self.app(scope, receive, send)
+
+    profile = RequestProfile(scope["method"], scope["path"])
+    reset = _current.set(profile)
+
+    async def send_with_profile(message):
+      if message["type"] == "http.response.start" and profile.active:
+        profile.stop()
+        url = await run_in_threadpool(storage.create_presigned_get, profile.key, PROFILE_LINK_EXPIRY)
+        headers = [(b"server-timing", profile.server_timing().encode()), (b"x-profile-key", profile.key.encode())]
+        if url:
+          headers.append((b"x-profile-url", url.encode()))
+        message = {**message, "headers": [*message.get("headers", []), *headers]}
+      await send(message)
+
+    try:
+      await self.app(scope, receive, send_with_profile)
+    finally:
+      _current.reset(reset)
+      if profile.active:
+        profile.stop()
+        await run_in_threadpool(write_profile, profile)
@@ -0,0 +1,170 @@
+# backend/app/core/rate_limit.py
+
+import logging
+import math
+import os
+import threading
+import time
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import redis
+
+logger = logging.getLogger(__name__)
+
+# redis://... shares buckets across workers, memory:// is single-process (tests/dev), unset disables limiting
+RATE_LIMIT_URL = os.getenv("RATE_LIMIT_URL")
+
+
+class Budget(NamedTuple):
+  """Token bucket: `burst` requests at once, refilled at `rate` tokens per second."""
+  burst: int
+  rate: float
+
+  @classmethod
+  def parse(cls, spec: str) -> "Budget":
+    # "<requests>/<seconds>", e.g. "600/60": bursts of 600, refilled at 10 per second
+    requests, seconds = spec.split("/")
+    return cls(int(requests), int(requests) / float(seconds))
+
+
+# Per-user and per-org buckets for each route class. Expensive routes (LLM calls, heavy aggregates)
+# draw from their own, much smaller budget on top of the default one.
+BUDGETS: Dict[str, Dict[str, Budget]] = {
+  "default": {
+    "user": Budget.parse(os.getenv("RATE_LIMIT_USER", "300/60")),
+    "org": Budget.parse(os.getenv("RATE_LIMIT_ORG", "1200/60")),
+  },
+  "expensive": {
+    "user": Budget.parse(os.getenv("RATE_LIMIT_EXPENSIVE_USER", "10/60")),
+    "org": Budget.parse(os.getenv("RATE_LIMIT_EXPENSIVE_ORG", "30/60")),
+  },
+}
+
+
+class Decision(NamedTuple):
+  allowed: bool
+  remaining: int
+  retry_after: float
+
+
+# Atomically refills and charges every bucket in KEYS, or none of them.
+# ARGV holds (burst, rate) pairs per key; the clock is Redis' own so workers never disagree.
+TOKEN_BUCKET_LUA = """
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+local tokens = {}
+local allowed = 1
+local remaining = math.huge
+local retry_after = 0
+
+for i, key in ipairs(KEYS) do
+  local burst = tonumber(ARGV[i * 2 - 1])
+  local rate = tonumber(ARGV[i * 2])
+  local state = redis.call('HMGET', key, 'tokens', 'ts')
+  local level = tonumber(state[1]) or burst
+  local ts = tonumber(state[2]) or now
+  level = math.min(burst, level + math.max(0, now - ts) * rate)
+  tokens[i] = level
+  if level < 1 then
+    allowed = 0
+    retry_after = math.max(retry_after, (1 - level) / rate)
+  end
+end
+
+for i, key in ipairs(KEYS) do
+  local burst = tonumber(ARGV[i * 2 - 1])
+  local rate = tonumber(ARGV[i * 2])
+  local level = tokens[i]
+  if allowed == 1 then
+    level = level - 1
+  end
+  remaining = math.min(remaining, level)
+  redis.call('HSET', key, 'tokens', level, 'ts', now)
+  redis.call('EXPIRE', key, math.ceil(burst / rate) + 1)
+end
+
+return {allowed, tostring(remaining), tostring(retry_after)}
+"""
+
+
+class InMemoryRateLimiter:
+  """Process-local token buckets. Also the fallback while Redis is unreachable."""
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._buckets: Dict[str, Tuple[float, float]] = {}
+
+  def hit(self, buckets: Sequence[Tuple[str, Budget]]) -> Decision:
+    now = time.monotonic()
+    with self._lock:
+      levels = []
+      retry_after = 0.0
+      for key, budget in buckets:
+        level, ts = self._buckets.get(key, (budget.burst, now))
+        level = min(budget.burst, level + (now - ts) * budget.rate)
+        levels.append(level)
+        if level < 1:
+          retry_after = max(retry_after, (1 - level) / budget.rate)
+
+      allowed = retry_after == 0.0
+      remaining = math.inf
+      for (key, _), level in zip(buckets, levels):
+        if allowed:
+          level -= 1
+        remaining = min(remaining, level)
+        self._buckets[key] = (level, now)
+    return Decision(allowed, int(remaining), retry_after)
+
+
+class RedisRateLimiter:
+  def __init__(self, url: str):
+    self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+    self.script = self.client.register_script(TOKEN_BUCKET_LUA)
+    self.fallback = InMemoryRateLimiter()
+
+  def hit(self, buckets: Sequence[Tuple[str, Budget]]) -> Decision:
+    args: List[float] = []
+    for _, budget in buckets:
+      args.extend((budget.burst, budget.rate))
+    try:
+      allowed, remaining, retry_after = self.script(keys=[key for key, _ in buckets], args=args)
+    except redis.RedisError:
+      # Degrade to per-process limits rather than failing open or taking the API down with Redis
+      logger.warning("Rate limiter backend unavailable, using in-process buckets", exc_info=True)
+      return self.fallback.hit(buckets)
+    return Decision(bool(allowed), int(float(remaining)), float(retry_after))
+
+
+_limiter = None
+_limiter_lock = threading.Lock()
+
+
+def configure_rate_limiter(url: Optional[str]):
+  """(Re)build the limiter backend from a URL; None disables rate limiting."""
+  global _limiter
+  with _limiter_lock:
+    if not url:
+      _limiter = None
+    elif url.startswith("memory://"):
+      _limiter = InMemoryRateLimiter()
+    else:
+      _limiter = RedisRateLimiter(url)
+  return _limiter
+
+
+def get_rate_limiter():
+  if _limiter is None and RATE_LIMIT_URL:
+    return configure_rate_limiter(RATE_LIMIT_URL)
+  return _limiter
+
+
+def check_rate_limit(budget: str, user_id, org_id) -> Optional[Decision]:
+  """Charges one request to the user's and the org's bucket for `budget`. None when limiting is disabled."""
+  limiter = get_rate_limiter()
+  if limiter is None:
+    return None
+  limits = BUDGETS[budget]
+  return limiter.hit([
+    (f"ratelimit:{budget}:user:{user_id}", limits["user"]),
+    (f"ratelimit:{budget}:org:{org_id}", limits["org"]),
+  ])
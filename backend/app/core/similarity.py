@@ -0,0 +1,132 @@
+# backend/app/core/similarity.py
+
+import re
+import threading
+import zlib
+from datetime import datetime, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+from uuid import UUID
+
+import numpy as np
+
+# MinHash over word unigrams + bigrams. 64 permutations keep signatures at 256 bytes
+# while estimating Jaccard similarity to within ~0.1.
+NUM_PERM = 64
+_MAX_HASH = np.uint64(0xFFFFFFFF)
+_PRIME = np.uint64((1 << 61) - 1)
+_rng = np.random.default_rng(20240611) # Fixed seed: signatures must match across processes
+_A = _rng.integers(1, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+_B = _rng.integers(0, (1 << 61) - 1, NUM_PERM, dtype=np.uint64)
+
+EMPTY_SIGNATURE = np.full(NUM_PERM, _MAX_HASH, dtype=np.uint32)
+
+_STOPWORDS = frozenset(
+  "a an and are as at be by for from has in is it of on or that the to was were with".split()
+)
+
+def _shingles(text: str) -> set:
+  words = [w for w in re.findall(r"[a-z0-9]+", text.lower()) if len(w) > 1 and w not in _STOPWORDS]
+  return set(words) | {f"{a} {b}" for a, b in zip(words, words[1:])}
+
+def compute_signature(texts: Iterable[Optional[str]]) -> np.ndarray:
+  tokens = _shingles(" ".join(t for t in texts if t))
+  if not tokens:
+    return EMPTY_SIGNATURE.copy()
+
+  # crc32 is stable across processes, unlike hash()
+  hashes = np.fromiter((zlib.crc32(t.encode("utf-8")) for t in tokens), dtype=np.uint64, count=len(tokens))
+  with np.errstate(over="ignore"):
+    permuted = ((hashes[:, None] * _A + _B) % _PRIME) & _MAX_HASH
+  return permuted.min(axis=0).astype(np.uint32)
+
+def to_bytes(signature: np.ndarray) -> bytes:
+  return signature.astype("<u4").tobytes()
+
+def from_bytes(data: bytes) -> np.ndarray:
+  return np.frombuffer(data, dtype="<u4").astype(np.uint32)
+
+
+class _OrgIndex:
+  __slots__ = ("ids", "positions", "matrix", "synced_at")
+
+  def __init__(self):
+    self.ids: List[UUID] = []
+    self.positions: Dict[UUID, int] = {}
+    self.matrix = np.empty((0, NUM_PERM), dtype=np.uint32)
+    self.synced_at: Optional[datetime] = None
+
+
+class SimilarityIndex:
+  """
+  Per-org signature matrices held in process memory.
+  Callers feed it rows changed since `synced_at(org)`, so each refresh only reads new signatures.
+  """
+
+  # Re-read a small window before the last sync so rows committed late by slow transactions are not missed
+  REFRESH_OVERLAP = timedelta(seconds=60)
+
+  def __init__(self):
+    self._lock = threading.Lock()
+    self._orgs: Dict[UUID, _OrgIndex] = {}
+
+  def refresh_since(self, org_id: UUID) -> Optional[datetime]:
+    index = self._orgs.get(org_id)
+    if index is None or index.synced_at is None:
+      return None
+    return index.synced_at - self.REFRESH_OVERLAP
+
+  def upsert(self, org_id: UUID, rows: Iterable[Tuple[UUID, bytes, Optional[datetime]]]) -> None:
+    with self._lock:
+      index = self._orgs.setdefault(org_id, _OrgIndex())
+      appended = []
+      for incident_id, data, updated_at in rows:
+        signature = from_bytes(data)
+        pos = index.positions.get(incident_id)
+        if pos is None:
+          index.positions[incident_id] = len(index.ids) + len(appended)
+          appended.append((incident_id, signature))
+        else:
+          index.matrix[pos] = signature
+        if updated_at and (index.synced_at is None or updated_at > index.synced_at):
+          index.synced_at = updated_at
+      if appended:
+        index.ids.extend(incident_id for incident_id, _ in appended)
+        index.matrix = np.vstack([index.matrix, np.stack([sig for _, sig in appended])])
+
+  def remove(self, org_id: UUID, incident_ids: Iterable[UUID]) -> None:
+    with self._lock:
+      index = self._orgs.get(org_id)
+      if index is None:
+        return
+      dropped = {i for i in incident_ids if i in index.positions}
+      if not dropped:
+        return
+      keep = [pos for pos, incident_id in enumerate(index.ids) if incident_id not in dropped]
+      index.ids = [index.ids[pos] for pos in keep]
+      index.matrix = index.matrix[keep]
+      index.positions = {incident_id: pos for pos, incident_id in enumerate(index.ids)}
+
+  def get(self, org_id: UUID, incident_id: UUID) -> Optional[np.ndarray]:
+    index = self._orgs.get(org_id)
+    if index is None or incident_id not in index.positions:
+      return None
+    return index.matrix[index.positions[incident_id]]
+
+  def top_k(self, org_id: UUID, signature: np.ndarray, k: int, exclude: Optional[UUID] = None) -> List[Tuple[UUID, float]]:
+    with self._lock:
+      index = self._orgs.get(org_id)
+      if index is None or not index.ids or np.array_equal(signature, EMPTY_SIGNATURE):
+        return []
+      ids = list(index.ids)
+      # Fraction of matching minimums estimates Jaccard similarity, for every incident at once
+      scores = (index.matrix == signature).mean(axis=1)
+      if exclude in index.positions:
+        scores[index.positions[exclude]] = -1.0
+
+    k = min(k, len(ids))
+    top = np.argpartition(-scores, k - 1)[:k]
+    top = top[np.argsort(-scores[top])]
+    return [(ids[pos], float(scores[pos])) for pos in top if scores[pos] > 0]
+
+
+similarity_index = SimilarityIndex()
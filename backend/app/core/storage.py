@@ -1,10 +1,9 @@
 # backend/app/core/storage.py
 
 import os
-import boto3
 import json
+from functools import lru_cache
 from botocore.exceptions import ClientError
-from botocore.config import Config
 
 # Configuration for MinIO
 S3_INTERNAL_ENDPOINT = os.getenv("S3_ENDPOINT", "http://minio:9000")
@@ -14,8 +13,12 @@ S3_ACCESS_KEY = os.getenv("S3_ACCESS_KEY", "minioadmin")
 S3_SECRET_KEY = os.getenv("S3_SECRET_KEY", "minioadmin")
 BUCKET_NAME = "incident-attachments"
 
-# Initialize S3 client for MinIO
-def get_s3_client():
+# Initialize S3 client for MinIO (once per process; boto3 clients are thread-safe)
+@lru_cache(maxsize=1)
+def _s3_client():
+  # boto3 takes ~100ms to import, so API processes only pay for it on their first storage call
+  import boto3
+  from botocore.config import Config
   return boto3.client(
     "s3",
     endpoint_url=S3_INTERNAL_ENDPOINT,
@@ -24,6 +27,9 @@ def get_s3_client():
     config=Config(signature_version='s3v4')
   )
 
+def get_s3_client():
+  return _s3_client()
+
 # Function that creates a presigned URL for uploading an attachment
 def create_presigned_post(object_name: str, expiration: int = 3600):
   """
@@ -67,4 +73,19 @@ def create_presigned_post(object_name: str, expiration: int = 3600):
   except ClientError as e:
     print(f"Error generating presigned URL: {e}")
     return None
-  return response
\ No newline at end of file
+  return response
+
+# Function that creates a presigned URL for downloading an object
+def create_presigned_get(object_name: str, expiration: int = 3600):
+  s3_client = get_s3_client()
+  try:
+    url = s3_client.generate_presigned_url(
+      "get_object",
+      Params={"Bucket": BUCKET_NAME, "Key": object_name},
+      ExpiresIn=expiration
+    )
+  except ClientError as e:
+    print(f"Error generating presigned URL: {e}")
+    return None
+  # Same host rewrite as uploads, so the link works from the browser
+  return url.replace("minio:9000", "localhost:9000")
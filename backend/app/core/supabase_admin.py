@@ -0,0 +1,33 @@
+# backend/app/core/supabase_admin.py
+
+import logging
+import os
+import threading
+
+logger = logging.getLogger(__name__)
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_supabase_admin():
+  """
+  Process-wide Supabase admin (service-role) client, built on first use so requests that never
+  invite anyone skip its construction. The client keeps one HTTP connection pool for the process.
+  None when SUPABASE_URL / SUPABASE_KEY are not configured or the client cannot be built.
+  """
+  global _client
+  if _client is not None:
+    return _client
+
+  url, key = os.getenv("SUPABASE_URL"), os.getenv("SUPABASE_KEY")
+  if not (url and key):
+    return None
+  with _client_lock:
+    if _client is None:
+      try:
+        from supabase import create_client # Only the invite paths pay for importing the SDK
+        _client = create_client(url, key)
+      except Exception:
+        logger.warning("Failed to initialize Supabase client", exc_info=True)
+  return _client
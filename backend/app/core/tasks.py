@@ -4,28 +4,38 @@ import os
 import smtplib
 from email.message import EmailMessage
 import uuid
-from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from datetime import datetime, timezone
 
-from app.core.celery_app import celery
+from app.core.celery_app import celery, ALERT_PRIORITIES, DEFAULT_PRIORITY
+from app.services.similarity_service import SimilarityService
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService, write_export_status
+from app.services.sla_service import SlaService
+from app.repositories.analytics_repo import AnalyticsRepository
 from app.db.session import SessionLocal
-import app.db.models as models
-from mailjet_rest import Client
-
-SLA_TRESHOLDS = {
-  models.IncidentSeverity.SEV1: timedelta(minutes=60),
-  models.IncidentSeverity.SEV2: timedelta(minutes=120),
-  models.IncidentSeverity.SEV3: timedelta(hours=4),
-  models.IncidentSeverity.SEV4: timedelta(hours=24),
-}
+from sqlalchemy import text
 
 MAILJET_API_KEY = os.getenv("MAILJET_API_KEY")
 MAILJET_API_SECRET = os.getenv("MAILJET_API_SECRET")
 MAILJET_SENDER_EMAIL = os.getenv("MAILJET_SENDER_EMAIL", "alerts@incidentflow.email")
 
-mailjet = Client(auth=(MAILJET_API_KEY, MAILJET_API_SECRET), version='v3.1')
+@lru_cache(maxsize=1)
+def get_mailjet_client():
+  # Built on the first email a worker sends, not when the API imports this module to queue tasks
+  from mailjet_rest import Client
+  return Client(auth=(MAILJET_API_KEY, MAILJET_API_SECRET), version='v3.1')
 
-@celery.task
-def send_incident_alert_email(to_email: str, incident_title: str, incident_id: str, severity: str):
+def queue_alert_email(to_email: str, incident_title: str, incident_id: str, severity):
+  """Queues an alert email; SEV1/SEV2 alerts jump ahead of everything else waiting on the alerts queue."""
+  severity = getattr(severity, "value", severity)
+  send_incident_alert_email.apply_async(
+    kwargs={"to_email": to_email, "incident_title": incident_title, "incident_id": incident_id, "severity": severity},
+    priority=ALERT_PRIORITIES.get(severity, DEFAULT_PRIORITY),
+  )
+
+@celery.task(bind=True, max_retries=3)
+def send_incident_alert_email(self, to_email: str, incident_title: str, incident_id: str, severity: str):
   """
   Sends an email notification via Mailjet.
   """
@@ -68,7 +78,7 @@ def send_incident_alert_email(to_email: str, incident_title: str, incident_id: s
 
   try:
     # Execute the API call to send the email
-    result = mailjet.send.create(data=data)
+    result = get_mailjet_client().send.create(data=data)
     
     # Mailjet returns 200 on success
     if result.status_code == 200:
@@ -81,62 +91,121 @@ def send_incident_alert_email(to_email: str, incident_title: str, incident_id: s
     print(f"❌ Exception while sending email for Incident ID: {incident_id}. Error: {e}")
     raise self.retry(exc=e, countdown=60)  # Retry after 60 seconds
   
-@celery.task(bind=True)
-def check_sla_breaches(self):
+@celery.task(acks_late=True)
+def index_incident_similarity(incident_id: str):
   """
-  Checks for incidents that are "DETECTED" and older than their SLA threshold.
-  Auto-escalates their status to "ESCALATED" if breached.
+  Refreshes the similarity signature of one incident after its text changed.
   """
-  
   db = SessionLocal()
-  now = datetime.now(timezone.utc)
-  escalated_count = 0
-  
   try:
-    # 1. Fetch all incidents that are in "DETECTED" status
-    active_incidents = db.query(models.Incident).filter(models.Incident.status == models.IncidentStatus.DETECTED).all()
-    
-    for incident in active_incidents:
-      sla_treshold = SLA_TRESHOLDS.get(incident.severity)
-      if sla_treshold and (now - incident.created_at.replace(tzinfo=timezone.utc)) > sla_treshold:
-        
-        print(f"⚠️ SLA Breach detected for Incident ID: {incident.id}")
-        
-        # Update the incident status to ESCALATED
-        old_status = incident.status
-        incident.status = models.IncidentStatus.ESCALATED
-        
-        # Create an audit log for this change
-        audit_log = models.IncidentEvent(
-          incident_id=incident.id,
-          actor_id=SYSTEM_BOT_UUID,  # System action
-          event_type="SLA_BREACH",
-          old_value=old_status,
-          new_value=models.IncidentStatus.ESCALATED,
-          comment=f"Auto-escalated: {incident.severity} incident breached SLA of {sla_treshold}."
-        )
-        
-        db.add(audit_log)
-        
-        # 2. Dynamic Email Routing - send email to assigned user and org admins
-        recipients = [user.email for user in incident.assigned_users] + [admin.email for admin in incident.organization.admins]
-        
-        # Queue an email alert for each recipient
-        for email in set(recipients):  # Use set to avoid duplicates
-          send_incident_alert_email.delay(
-            to_email=email,
-            incident_title=f"SLA BREACH: {incident.title}",
-            incident_id=str(incident.id),
-            severity=str(incident.severity)
-          )
-          
-        escalated_count += 1
-        
-    # 3. Batch commit at the end to save DB operations
+    SimilarityService(db).index_incident(uuid.UUID(incident_id))
+  finally:
+    db.close()
+
+@celery.task(acks_late=True)
+def index_incidents_similarity(incident_ids: list):
+  """
+  Signs a batch of incidents at once (each chunk of an import).
+  """
+  db = SessionLocal()
+  try:
+    return SimilarityService(db).index_incidents([uuid.UUID(i) for i in incident_ids])
+  finally:
+    db.close()
+
+@celery.task(acks_late=True)
+def backfill_similarity_signatures():
+  """
+  Signs every incident that has no signature yet, e.g. those created before similarity search shipped.
+  Batches are committed as they go, so a rerun picks up where an interrupted one stopped.
+  """
+  db = SessionLocal()
+  try:
+    return f"Signed {SimilarityService(db).backfill_signatures()} incidents."
+  finally:
+    db.close()
+
+@celery.task(acks_late=True)
+def archive_closed_incident_events():
+  """
+  Moves the audit log of long-closed incidents out of the hot incident_events table.
+  """
+  db = SessionLocal()
+  try:
+    archived = ArchiveService(db).archive_closed_incidents()
+    return f"Archived events of {archived} incidents."
+  finally:
+    db.close()
+
+@celery.task
+def ensure_event_partitions(months_ahead: int = 3):
+  """
+  Keeps monthly incident_events partitions created ahead of time, so inserts never land in the default partition.
+  """
+  db = SessionLocal()
+  try:
+    if db.get_bind().dialect.name != "postgresql":
+      return "Partitioning is only used on PostgreSQL."
+    start = datetime.now(timezone.utc).date().replace(day=1)
+    db.execute(
+      text("SELECT ensure_incident_event_partitions(CAST(:start AS date), :months)"),
+      {"start": start, "months": months_ahead + 1}
+    )
     db.commit()
-    return f"Escalated {escalated_count} incidents due to SLA breaches."
-  except Exception as e:
-    print(f"❌ Exception in SLA breach check: {e}")
+    return f"Ensured incident_events partitions from {start} for {months_ahead + 1} months."
+  finally:
+    db.close()
+
+@celery.task
+def refresh_analytics_views():
+  """
+  Recomputes the incident_daily_metrics view behind the admin charts; readers keep the old rows meanwhile.
+  """
+  db = SessionLocal()
+  try:
+    if db.get_bind().dialect.name != "postgresql":
+      return "Materialized views are only used on PostgreSQL."
+    AnalyticsRepository(db).refresh_metrics_views()
+    db.commit()
+    return "Refreshed incident_daily_metrics."
+  finally:
+    db.close()
+
+@celery.task(acks_late=True)
+def export_dataset(org_id: str, dataset: str, fmt: str, start: str, end: str, compress: bool, key: str, export_id: str):
+  """
+  Writes an admin export to the attachment bucket under `key`, keeping its job marker up to date.
+  """
+  org_uuid, export_uuid = uuid.UUID(org_id), uuid.UUID(export_id)
+  db = SessionLocal()
+  try:
+    write_export_status(org_uuid, export_uuid, "running", key)
+    ExportService(db).export_to_storage(
+      org_uuid, dataset, fmt,
+      datetime.fromisoformat(start), datetime.fromisoformat(end), compress, key
+    )
+    write_export_status(org_uuid, export_uuid, "ready", key)
+    return key
+  except Exception as exc:
+    write_export_status(org_uuid, export_uuid, "failed", key, error=f"{type(exc).__name__}: {exc}")
     raise
   finally:
-    db.close()
\ No newline at end of file
+    db.close()
+
+@celery.task
+def check_sla_breaches():
+  """
+  Escalates DETECTED incidents whose SLA deadline has passed and alerts their owner and org admins.
+  Beat runs this every SLA_POLL_SECONDS; a run is one range scan of the sla_deadline index, so idle runs are cheap.
+  """
+  db = SessionLocal()
+  try:
+    alerts = SlaService(db).escalate_due()
+  finally:
+    db.close()
+
+  for alert in alerts:
+    print(f"⚠️ SLA Breach detected for Incident ID: {alert['incident_id']}")
+    for email in alert["recipients"]:
+      queue_alert_email(email, f"SLA BREACH: {alert['title']}", alert["incident_id"], alert["severity"])
+  return f"Escalated {len(alerts)} incidents due to SLA breaches."
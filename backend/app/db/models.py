@@ -2,10 +2,12 @@
 
 from os import name
 import uuid
-from sqlalchemy import Column, String, ForeignKey, DateTime, UUID, Enum as SQLEnum, Text
-from sqlalchemy.orm import relationship
+from sqlalchemy import Column, String, ForeignKey, DateTime, UUID, Enum as SQLEnum, Text, LargeBinary, Index, Integer
+from sqlalchemy.orm import relationship, deferred
 from sqlalchemy.sql import func
 from app.db.session import Base
+from app.db.search import register_search_ddl
+from app.core.fsm import IncidentStatus # Canonical definition lives with the FSM
 import enum
 
 # --- Enums ---
@@ -15,15 +17,6 @@ class IncidentSeverity(str, enum.Enum):
   SEV3 = "SEV3"
   SEV4 = "SEV4"
 
-class IncidentStatus(str, enum.Enum):
-  DETECTED = "DETECTED"
-  INVESTIGATING = "INVESTIGATING"
-  MITIGATED = "MITIGATED"
-  RESOLVED = "RESOLVED"
-  POSTMORTEM = "POSTMORTEM"
-  CLOSED = "CLOSED"
-  ESCALATED = "ESCALATED"
-
 class UserRole(str, enum.Enum):
   ENGINEER = "ENGINEER"
   MANAGER = "MANAGER"
@@ -65,13 +58,16 @@ class Incident(Base):
 
   id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
   title = Column(String, nullable=False)
-  description = Column(Text)
+  description = deferred(Column(Text)) # Loaded on first access; list views project columns instead
   severity = Column(SQLEnum(IncidentSeverity, name="incident_severity"), nullable=False)
   status = Column(SQLEnum(IncidentStatus, name="incident_status"), default=IncidentStatus.DETECTED, nullable=False)
   owner_id = Column(UUID(as_uuid=True), ForeignKey("users.id"))
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
   resolved_at = Column(DateTime(timezone=True), nullable=True)
+  events_archived_at = Column(DateTime(timezone=True), nullable=True) # Audit log moved to cold storage
+  version = Column(Integer, nullable=False, default=1, server_default="1") # Optimistic concurrency counter
+  sla_deadline = Column(DateTime(timezone=True), nullable=True) # When a still-DETECTED incident breaches its SLA; NULL once acknowledged
   organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
 
   # Relationships
@@ -80,11 +76,23 @@ class Incident(Base):
   attachments = relationship("IncidentAttachment", back_populates="incident", cascade="all, delete-orphan")
   organization = relationship("Organization", back_populates="incidents")
 
+  # Fetch server defaults (created_at/updated_at) via RETURNING instead of a follow-up SELECT.
+  # version_id_col turns every ORM UPDATE into `... WHERE id = :id AND version = :v` and bumps it;
+  # a concurrent writer that got there first makes the flush raise StaleDataError instead of overwriting.
+  __mapper_args__ = {"eager_defaults": True, "version_id_col": version}
+
+  # The SLA scheduler only ever range-scans pending deadlines, so the index skips the NULL majority
+  __table_args__ = (
+    Index("ix_incidents_sla_deadline", "sla_deadline", postgresql_where=sla_deadline.isnot(None)),
+  )
+
 
 class IncidentEvent(Base):
   """
   Immutable Audit Log. 
   Every state change, assignment, or comment creates a row here.
+  On Postgres the table is range-partitioned by month on created_at (primary key (id, created_at));
+  events of long-CLOSED incidents are moved to cold storage by the archival task.
   """
   __tablename__ = "incident_events"
 
@@ -94,7 +102,7 @@ class IncidentEvent(Base):
   event_type = Column(String, nullable=False) # e.g., 'STATUS_CHANGE', 'COMMENT', 'CREATION', 'SLA_BREACH'
   old_value = Column(String)
   new_value = Column(String)
-  comment = Column(Text)
+  comment = deferred(Column(Text))
   created_at = Column(DateTime(timezone=True), server_default=func.now())
   organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
 
@@ -102,6 +110,8 @@ class IncidentEvent(Base):
   incident = relationship("Incident", back_populates="events")
   actor = relationship("User", back_populates="actions")
 
+  __mapper_args__ = {"eager_defaults": True}
+
 class IncidentAttachment(Base):
   __tablename__ = "incident_attachments"
   
@@ -115,4 +125,39 @@ class IncidentAttachment(Base):
   
   # Relationships
   incident = relationship("Incident", back_populates="attachments")
-  uploader = relationship("User")  # To get uploader details
\ No newline at end of file
+  uploader = relationship("User")  # To get uploader details
+
+
+class SlaPolicy(Base):
+  """
+  Per-org response-time target for one severity: a DETECTED incident is escalated
+  once it has gone `response_minutes` without being acknowledged.
+  Severities without a row fall back to DEFAULT_SLA_THRESHOLDS.
+  """
+  __tablename__ = "sla_policies"
+
+  organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+  severity = Column(SQLEnum(IncidentSeverity, name="incident_severity"), primary_key=True)
+  response_minutes = Column(Integer, nullable=False)
+  updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class IncidentSignature(Base):
+  """
+  MinHash signature of an incident's title, description and comments.
+  Written by the background indexer, read incrementally into the in-memory similarity index.
+  """
+  __tablename__ = "incident_signatures"
+
+  incident_id = Column(UUID(as_uuid=True), ForeignKey("incidents.id", ondelete="CASCADE"), primary_key=True)
+  organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+  signature = Column(LargeBinary, nullable=False)
+  updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+  __table_args__ = (
+    Index("ix_incident_signatures_org_updated", "organization_id", "updated_at"),
+  )
+
+
+# Full-text search column/triggers (tsvector on Postgres, FTS5 on SQLite)
+register_search_ddl(Incident.__table__, IncidentEvent.__table__)
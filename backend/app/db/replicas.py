@@ -0,0 +1,228 @@
+# backend/app/db/replicas.py
+
+import itertools
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from functools import wraps
+from typing import Dict, List, Optional
+
+import redis
+from sqlalchemy import event, text
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.orm import Session
+
+logger = logging.getLogger(__name__)
+
+# A replica further behind the primary than this is skipped until it catches up
+REPLICA_MAX_LAG_SECONDS = float(os.getenv("REPLICA_MAX_LAG_SECONDS", "5"))
+# Give up connecting to a replica after this long (libpq connect_timeout) and read from the primary
+REPLICA_CONNECT_TIMEOUT_SECONDS = int(os.getenv("REPLICA_CONNECT_TIMEOUT_SECONDS", "2"))
+# How often each replica's lag is measured (one small query per replica per interval)
+REPLICA_CHECK_SECONDS = float(os.getenv("REPLICA_CHECK_SECONDS", "5"))
+# After a user's own write their reads go to the primary for this long (read-your-writes)
+REPLICA_STICKY_SECONDS = float(os.getenv("REPLICA_STICKY_SECONDS", "10"))
+# redis://... shares recent writers across API workers; unset keeps them per process
+REPLICA_STICKY_URL = os.getenv("REPLICA_STICKY_URL")
+
+# Set inside `on_primary()`: every query goes to the primary, replica markers included
+_pinned_to_primary: ContextVar[bool] = ContextVar("pinned_to_primary", default=False)
+
+
+def replica_lag_seconds(conn: Connection) -> float:
+  """How far a replica's replay is behind its primary; 0 for databases without streaming replication."""
+  if conn.dialect.name != "postgresql":
+    return 0.0
+  lag = conn.execute(text(
+    "SELECT CASE WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+    "ELSE EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()) END"
+  )).scalar()
+  return float(lag or 0)
+
+
+class _Replica:
+  __slots__ = ("engine", "healthy", "checked_at", "probing")
+
+  def __init__(self, engine: Engine):
+    self.engine = engine
+    self.healthy = False
+    self.checked_at = float("-inf")
+    self.probing = False
+
+
+class ReplicaSet:
+  """Read replicas taken round-robin, skipping any that lag too far behind or cannot be reached."""
+
+  def __init__(self, engines: List[Engine], max_lag: float = REPLICA_MAX_LAG_SECONDS, check_every: float = REPLICA_CHECK_SECONDS):
+    self.replicas = [_Replica(engine) for engine in engines]
+    self.max_lag = max_lag
+    self.check_every = check_every
+    self._turn = itertools.count()
+    self._lock = threading.Lock()
+
+  def _is_healthy(self, replica: _Replica) -> bool:
+    now = time.monotonic()
+    if now - replica.checked_at < self.check_every:
+      return replica.healthy
+    with self._lock:
+      if replica.probing or now - replica.checked_at < self.check_every:
+        return replica.healthy # Another thread is checking it; go by the last verdict meanwhile
+      replica.probing = True
+    # Probed outside the lock: a replica that hangs on connect only delays the one read that probes it
+    try:
+      with replica.engine.connect() as conn:
+        lag = replica_lag_seconds(conn)
+      replica.healthy = lag <= self.max_lag
+      if not replica.healthy:
+        logger.warning("Replica %s is %.1fs behind; reading from the primary", replica.engine.url, lag)
+    except Exception:
+      logger.warning("Replica %s unreachable; reading from the primary", replica.engine.url, exc_info=True)
+      replica.healthy = False
+    finally:
+      replica.checked_at = time.monotonic()
+      replica.probing = False
+    return replica.healthy
+
+  def pick(self) -> Optional[Engine]:
+    """The next healthy replica's engine, or None when every replica should be avoided."""
+    start = next(self._turn)
+    for i in range(len(self.replicas)):
+      replica = self.replicas[(start + i) % len(self.replicas)]
+      if self._is_healthy(replica):
+        return replica.engine
+    return None
+
+
+class InMemoryWriterLog:
+  """Process-local recent writers. Enough for one API process; use Redis when running several."""
+
+  def __init__(self):
+    self._until: Dict[str, float] = {}
+
+  def mark(self, user_id: str, ttl: float) -> None:
+    self._until[user_id] = time.monotonic() + ttl
+
+  def recent(self, user_id: str) -> bool:
+    return self._until.get(user_id, 0) > time.monotonic()
+
+
+class RedisWriterLog:
+  def __init__(self, url: str):
+    self.client = redis.Redis.from_url(url, socket_timeout=0.5, socket_connect_timeout=0.5)
+
+  def mark(self, user_id: str, ttl: float) -> None:
+    self.client.set(f"replica:writer:{user_id}", 1, px=int(ttl * 1000))
+
+  def recent(self, user_id: str) -> bool:
+    return bool(self.client.exists(f"replica:writer:{user_id}"))
+
+
+_writers = None
+_writers_lock = threading.Lock()
+
+
+def configure_writer_log(url: Optional[str]):
+  """(Re)build the recent-writer store from a URL; None or memory:// keeps it in this process."""
+  global _writers
+  with _writers_lock:
+    _writers = RedisWriterLog(url) if url and url.startswith("redis") else InMemoryWriterLog()
+  return _writers
+
+
+def get_writer_log():
+  if _writers is None:
+    return configure_writer_log(REPLICA_STICKY_URL)
+  return _writers
+
+
+class RoutingSession(Session):
+  """
+  Session whose reads inside `use_replica` (or a `replica_reads` repository method) go to a replica.
+  Everything else uses the primary, and so do replica reads once this session has written, or while
+  its user (`info["user_id"]`, set at authentication) wrote within the last REPLICA_STICKY_SECONDS.
+  """
+
+  def __init__(self, *args, replicas: Optional[ReplicaSet] = None, **kwargs):
+    super().__init__(*args, **kwargs)
+    self.replicas = replicas
+    self._replica_depth = 0
+    self._wrote = False
+    self._sticky: Optional[bool] = None
+
+  def _user_wrote_recently(self) -> bool:
+    if self._sticky is None:
+      user_id = self.info.get("user_id")
+      try:
+        self._sticky = user_id is not None and get_writer_log().recent(str(user_id))
+      except redis.RedisError:
+        logger.warning("Recent-writer lookup failed; reading from the primary", exc_info=True)
+        self._sticky = True
+    return self._sticky
+
+  def get_bind(self, mapper=None, clause=None, **kw):
+    if self._replica_depth and self.replicas is not None and not self._flushing and not self._wrote \
+        and not _pinned_to_primary.get() and not self._user_wrote_recently():
+      replica = self.replicas.pick()
+      if replica is not None:
+        return replica
+    return super().get_bind(mapper, clause=clause, **kw)
+
+
+@event.listens_for(RoutingSession, "after_flush")
+def _after_flush(session, flush_context):
+  session._wrote = True
+
+
+@event.listens_for(RoutingSession, "do_orm_execute")
+def _on_execute(orm_execute_state):
+  # Bulk INSERT/UPDATE/DELETE statements skip the flush
+  if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+    orm_execute_state.session._wrote = True
+
+
+@event.listens_for(RoutingSession, "after_commit")
+def _after_commit(session):
+  user_id = session.info.get("user_id")
+  if session._wrote and user_id is not None and session.replicas is not None:
+    try:
+      get_writer_log().mark(str(user_id), REPLICA_STICKY_SECONDS)
+    except redis.RedisError:
+      logger.warning("Failed to record write by user %s; their next reads may lag", user_id, exc_info=True)
+
+
+@contextmanager
+def on_primary():
+  """
+  Reads inside the block ignore `use_replica` / `replica_reads`. Used where a result outlives the request
+  (cached response bodies, which are stored under the org's current version and must not lag it).
+  """
+  token = _pinned_to_primary.set(True)
+  try:
+    yield
+  finally:
+    _pinned_to_primary.reset(token)
+
+
+@contextmanager
+def use_replica(db: Session):
+  """Lets the queries inside the block read from a replica; a no-op for plain sessions (tests, scripts)."""
+  if not isinstance(db, RoutingSession):
+    yield
+    return
+  db._replica_depth += 1
+  try:
+    yield
+  finally:
+    db._replica_depth -= 1
+
+
+def replica_reads(method):
+  """Marks a read-only repository method (on `self.db`) as safe to serve from a replica."""
+  @wraps(method)
+  def wrapper(self, *args, **kwargs):
+    with use_replica(self.db):
+      return method(self, *args, **kwargs)
+  return wrapper
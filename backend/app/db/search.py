@@ -0,0 +1,99 @@
+# backend/app/db/search.py
+#
+# Full-text search DDL for incidents.
+# PostgreSQL keeps a weighted tsvector on `incidents` (title A, description B, comments C) behind a GIN index.
+# SQLite (tests, local benchmarks) mirrors it with an FTS5 table kept current by triggers.
+# Both are attached to metadata.create_all; existing Postgres databases get the same DDL via Alembic.
+
+from sqlalchemy import DDL, event
+
+POSTGRES_INCIDENT_DDL = [
+  "ALTER TABLE incidents ADD COLUMN IF NOT EXISTS search_vector tsvector",
+  "CREATE INDEX IF NOT EXISTS ix_incidents_search_vector ON incidents USING GIN (search_vector)",
+  """
+  CREATE OR REPLACE FUNCTION incidents_search_vector_refresh() RETURNS trigger AS $$
+  BEGIN
+    NEW.search_vector :=
+      setweight(to_tsvector('english', coalesce(NEW.title, '')), 'A') ||
+      setweight(to_tsvector('english', coalesce(NEW.description, '')), 'B') ||
+      setweight(to_tsvector('english', coalesce((
+        SELECT string_agg(comment, ' ') FROM incident_events
+        WHERE incident_id = NEW.id AND event_type = 'COMMENT'
+      ), '')), 'C');
+    RETURN NEW;
+  END
+  $$ LANGUAGE plpgsql
+  """,
+  """
+  CREATE TRIGGER incidents_search_vector_trg
+  BEFORE INSERT OR UPDATE OF title, description ON incidents
+  FOR EACH ROW EXECUTE FUNCTION incidents_search_vector_refresh()
+  """,
+]
+
+POSTGRES_EVENT_DDL = [
+  # Comments are appended to the parent's vector, so indexing cost per event stays constant
+  """
+  CREATE OR REPLACE FUNCTION incident_events_search_vector_append() RETURNS trigger AS $$
+  BEGIN
+    UPDATE incidents
+    SET search_vector = coalesce(search_vector, ''::tsvector) || setweight(to_tsvector('english', NEW.comment), 'C')
+    WHERE id = NEW.incident_id;
+    RETURN NULL;
+  END
+  $$ LANGUAGE plpgsql
+  """,
+  """
+  CREATE TRIGGER incident_events_search_vector_trg
+  AFTER INSERT ON incident_events
+  FOR EACH ROW WHEN (NEW.event_type = 'COMMENT' AND NEW.comment IS NOT NULL)
+  EXECUTE FUNCTION incident_events_search_vector_append()
+  """,
+]
+
+SQLITE_INCIDENT_DDL = [
+  """
+  CREATE VIRTUAL TABLE IF NOT EXISTS incident_search USING fts5(
+    incident_id UNINDEXED, organization_id UNINDEXED, title, description, comments
+  )
+  """,
+  """
+  CREATE TRIGGER IF NOT EXISTS incident_search_insert AFTER INSERT ON incidents BEGIN
+    INSERT INTO incident_search (incident_id, organization_id, title, description, comments)
+    VALUES (NEW.id, NEW.organization_id, NEW.title, coalesce(NEW.description, ''), '');
+  END
+  """,
+  """
+  CREATE TRIGGER IF NOT EXISTS incident_search_update AFTER UPDATE OF title, description ON incidents BEGIN
+    UPDATE incident_search SET title = NEW.title, description = coalesce(NEW.description, '')
+    WHERE incident_id = NEW.id;
+  END
+  """,
+  """
+  CREATE TRIGGER IF NOT EXISTS incident_search_delete AFTER DELETE ON incidents BEGIN
+    DELETE FROM incident_search WHERE incident_id = OLD.id;
+  END
+  """,
+]
+
+SQLITE_EVENT_DDL = [
+  """
+  CREATE TRIGGER IF NOT EXISTS incident_search_comment AFTER INSERT ON incident_events
+  WHEN NEW.event_type = 'COMMENT' AND NEW.comment IS NOT NULL BEGIN
+    UPDATE incident_search SET comments = comments || ' ' || NEW.comment
+    WHERE incident_id = NEW.incident_id;
+  END
+  """,
+]
+
+
+def register_search_ddl(incidents_table, events_table):
+  for statement in POSTGRES_INCIDENT_DDL:
+    event.listen(incidents_table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+  for statement in POSTGRES_EVENT_DDL:
+    event.listen(events_table, "after_create", DDL(statement).execute_if(dialect="postgresql"))
+  for statement in SQLITE_INCIDENT_DDL:
+    event.listen(incidents_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+  for statement in SQLITE_EVENT_DDL:
+    event.listen(events_table, "after_create", DDL(statement).execute_if(dialect="sqlite"))
+  event.listen(incidents_table, "before_drop", DDL("DROP TABLE IF EXISTS incident_search").execute_if(dialect="sqlite"))
@@ -5,6 +5,7 @@ from sqlalchemy import create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from dotenv import load_dotenv
+from app.db.replicas import REPLICA_CONNECT_TIMEOUT_SECONDS, ReplicaSet, RoutingSession
 
 # 1. Load environment variables from .env file
 load_dotenv()
@@ -15,26 +16,39 @@ DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./test.db")
 if not DATABASE_URL:
   raise ValueError("DATABASE_URL is not set in the environment variables.")
 
-# 3. Create the Engine
-connect_args = {}
-if "sqlite" in DATABASE_URL:
-  connect_args = {"check_same_thread": False}
-elif "supabase.co" in DATABASE_URL:
-  connect_args = {"sslmode": "require"}
-else:
+# 3. Create the Engines
+def _connect_args(url: str) -> dict:
+  if "sqlite" in url:
+    return {"check_same_thread": False}
+  elif "supabase.co" in url:
+    return {"sslmode": "require"}
   # Local Docker Postgres
-  connect_args = {"sslmode": "disable"}
+  return {"sslmode": "disable"}
 
-engine = create_engine(
-  DATABASE_URL,
-  connect_args=connect_args,
-  pool_pre_ping=True,
-  pool_recycle=300 
-)
+def _create_engine(url: str, connect_timeout: int = None):
+  connect_args = _connect_args(url)
+  if connect_timeout and "sqlite" not in url:
+    connect_args["connect_timeout"] = connect_timeout
+  return create_engine(
+    url,
+    connect_args=connect_args,
+    pool_pre_ping=True,
+    pool_recycle=300 
+  )
+
+engine = _create_engine(DATABASE_URL)
+
+# Optional read replicas (comma-separated URLs). Read-only repository methods use them; see app/db/replicas.py
+DATABASE_REPLICA_URLS = [url.strip() for url in os.getenv("DATABASE_REPLICA_URLS", "").split(",") if url.strip()]
+replica_engines = [_create_engine(url, REPLICA_CONNECT_TIMEOUT_SECONDS) for url in DATABASE_REPLICA_URLS]
 
 # 4. Create the Session Local class
 # Each request will create a new instance of this class.
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+# expire_on_commit=False keeps committed objects readable without a refresh SELECT.
+SessionLocal = sessionmaker(
+  autocommit=False, autoflush=False, expire_on_commit=False, bind=engine,
+  class_=RoutingSession, replicas=ReplicaSet(replica_engines) if replica_engines else None,
+)
 
 # 5. Create the Base class
 # All your models in models.py will inherit from this.
@@ -1,6 +1,7 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from app.api.v1.router import api_router
+from app.core.profiling import ProfilingMiddleware
 
 app = FastAPI(title="IncidentFlow API")
 
@@ -10,8 +11,12 @@ app.add_middleware(
   allow_credentials=True,
   allow_methods=["*"],
   allow_headers=["*"],
+  expose_headers=["Server-Timing", "X-Profile-Key", "X-Profile-Url", "X-Events-Archive"],
 )
 
+# Admin-only request profiling (X-Profile: 1); a header check for everyone else
+app.add_middleware(ProfilingMiddleware)
+
 # Include the V1 Master Router
 app.include_router(api_router, prefix="/api/v1")
 
@@ -1,30 +1,47 @@
 from sqlalchemy.orm import Session
-from sqlalchemy import func, text
+from sqlalchemy import func, select, text
 from uuid import UUID
 from datetime import datetime, timedelta
 import app.db.models as models
+from app.db.replicas import replica_reads
+
+# Per org / UTC day / severity sums behind MTTR, MTTA and breach rate (see the 9a41c7e2d5b8 migration)
+METRICS_VIEW = "incident_daily_metrics"
+# Rows per chunk when streaming durations into the percentile sketches
+DURATION_CHUNK_ROWS = 10_000
+
+def _mean(total, count) -> float:
+  return float(total) / int(count) if count else 0.0
+
+def _breach_summary(total: int, breached: int) -> dict:
+  breach_rate = (breached / total * 100) if total > 0 else 0.0
+  return {"total": total, "breached": breached, "breach_rate": round(breach_rate, 2)}
 
 class AnalyticsRepository:
   def __init__(self, db: Session):
     self.db = db
 
+  @replica_reads
   def get_total_users(self, org_id: UUID) -> int:
     return self.db.query(models.User).filter(
       models.User.role != models.UserRole.BOT, 
       models.User.organization_id == org_id
     ).count()
 
+  @replica_reads
   def get_total_incidents(self, org_id: UUID) -> int:
     return self.db.query(models.Incident).filter(
       models.Incident.organization_id == org_id
     ).count()
 
+  @replica_reads
   def get_active_incidents(self, org_id: UUID) -> int:
     return self.db.query(models.Incident).filter(
       models.Incident.status != models.IncidentStatus.CLOSED, 
       models.Incident.organization_id == org_id
     ).count()
 
+  @replica_reads
   def get_severity_counts(self, org_id: UUID):
     return self.db.query(
       models.Incident.severity, 
@@ -33,6 +50,7 @@ class AnalyticsRepository:
       models.Incident.organization_id == org_id
     ).group_by(models.Incident.severity).all()
 
+  @replica_reads
   def get_volume_trend(self, org_id: UUID, days: int = 30):
     """
     Dynamic Chart History:
@@ -49,72 +67,182 @@ class AnalyticsRepository:
       models.Incident.organization_id == org_id
     ).group_by('date').order_by('date').all()
     
+  def _uses_metrics_view(self) -> bool:
+    # incident_daily_metrics is a Postgres materialized view; other databases aggregate the raw tables
+    return self.db.get_bind().dialect.name == "postgresql"
+
+  def _seconds_between(self, end, start):
+    if self.db.get_bind().dialect.name == "sqlite":
+      return (func.julianday(end) - func.julianday(start)) * 86400
+    return func.extract("epoch", end - start)
+
+  def _daily_metrics(self, org_id: UUID, days: int):
+    """
+    Window totals from the incident_daily_metrics view (refreshed every ANALYTICS_REFRESH_SECONDS).
+    Buckets are whole UTC days, so the window starts at midnight of its first day.
+    """
+    start_day = (datetime.utcnow() - timedelta(days=days)).date()
+    return self.db.execute(text(f"""
+      SELECT
+        COALESCE(SUM(incidents), 0) AS incidents,
+        COALESCE(SUM(resolved), 0) AS resolved,
+        COALESCE(SUM(resolve_seconds), 0) AS resolve_seconds,
+        COALESCE(SUM(acknowledged), 0) AS acknowledged,
+        COALESCE(SUM(ack_seconds), 0) AS ack_seconds,
+        COALESCE(SUM(breached), 0) AS breached
+      FROM {METRICS_VIEW}
+      WHERE organization_id = :org_id
+      AND day >= :start_day
+    """), {"org_id": str(org_id), "start_day": start_day}).fetchone()
+
+  def refresh_metrics_views(self):
+    """Rebuilds the metrics view without blocking readers (PostgreSQL only)."""
+    self.db.execute(text(f"REFRESH MATERIALIZED VIEW CONCURRENTLY {METRICS_VIEW}"))
+
+  @replica_reads
   def calculate_mttr_seconds(self, org_id: UUID, days: int = 30) -> float:
-    """"
+    """
     Mean Time to Resolve (MTTR) Calculation:
-    Uses raw SQL to calculate the average time eposh difference between incident creation and resolution.
+    Average seconds between incident creation and resolution, for incidents created in the window.
     """
+    if self._uses_metrics_view():
+      metrics = self._daily_metrics(org_id, days)
+      return _mean(metrics.resolve_seconds, metrics.resolved)
+
     start_date = datetime.utcnow() - timedelta(days=days)
-    mttr_query = text("""
-      SELECT AVG(EXTRACT(EPOCH FROM (resolved_at - created_at)))
-      FROM incidents
-      WHERE resolved_at IS NOT NULL
-      AND organization_id = :org_id
-      AND created_at >= :start_date
-    """)
-    
-    return self.db.execute(mttr_query, {"org_id": str(org_id), "start_date": start_date}).scalar() or 0
+    mttr = self.db.query(
+      func.avg(self._seconds_between(models.Incident.resolved_at, models.Incident.created_at))
+    ).filter(
+      models.Incident.resolved_at.isnot(None),
+      models.Incident.organization_id == org_id,
+      models.Incident.created_at >= start_date
+    ).scalar()
+    return float(mttr or 0)
   
+  @replica_reads
   def calculate_mtta_seconds(self, org_id: UUID, days: int = 30) -> float:
     """
     Mean Time to Acknowledge (MTTA) Calculation:
     Calculates the time difference between incident creation and the first acknowledgment event.
     Which is the epoch difference between the creation and *first* status change.
     """
+    if self._uses_metrics_view():
+      metrics = self._daily_metrics(org_id, days)
+      return _mean(metrics.ack_seconds, metrics.acknowledged)
+
     start_date = datetime.utcnow() - timedelta(days=days)
-    mtta_query = text("""                
-      WITH FirstResponse AS (
-        SELECT incident_id, MIN(created_at) as ack_time
-        FROM incident_events
-        WHERE event_type IN ('STATUS_CHANGE', 'OWNER_CHANGE')
-        GROUP BY incident_id 
-      )
-        
-      SELECT AVG(EXTRACT(EPOCH FROM (fr.ack_time - i.created_at)))
-      FROM incidents i
-      JOIN FirstResponse fr ON i.id = fr.incident_id
-      WHERE i.organization_id = :org_id
-      AND i.created_at >= :start_date
-    """)
-    return self.db.execute(mtta_query, {"org_id": str(org_id), "start_date": start_date}).scalar() or 0.0
+    first_response = self.db.query(
+      models.IncidentEvent.incident_id,
+      func.min(models.IncidentEvent.created_at).label("ack_time")
+    ).filter(
+      models.IncidentEvent.event_type.in_(("STATUS_CHANGE", "OWNER_CHANGE")),
+      models.IncidentEvent.organization_id == org_id,
+      models.IncidentEvent.created_at >= start_date # Events never predate their incident
+    ).group_by(models.IncidentEvent.incident_id).subquery()
+
+    mtta = self.db.query(
+      func.avg(self._seconds_between(first_response.c.ack_time, models.Incident.created_at))
+    ).join(
+      first_response, models.Incident.id == first_response.c.incident_id
+    ).filter(
+      models.Incident.organization_id == org_id,
+      models.Incident.created_at >= start_date
+    ).scalar()
+    return float(mtta or 0)
   
+  @replica_reads
   def calculate_sla_breach_rate(self, org_id: UUID, days: int = 30):
     """
     SLA Breach Rate Calculation:
     Determines the percentage of incidents that breached their SLA based on their severity.
     """
-    
-    start_date = datetime.utcnow() - timedelta(days=days)
-    
-    # The query counts total incidents and those that had an SLA_BREACH event.
-    breach_query = text("""
-      SELECT
-        COUNT(DISTINCT i.id) as total_incidents,
-        COUNT(DISTINCT CASE WHEN ie.event_type = 'SLA_BREACH' THEN i.id END) as breached_incidents
-      FROM incidents i
-      LEFT JOIN incident_events ie ON i.id = ie.incident_id
-      WHERE i.organization_id = :org_id
-      AND i.created_at >= :start_date  
-    """)
-    
-    result = self.db.execute(breach_query, {"org_id": str(org_id), "start_date": start_date}).fetchone()
-    
-    total = result.total_incidents or 0
-    breached = result.breached_incidents or 0
-    breach_rate = (breached / total * 100) if total > 0 else 0.0
-    return {"total": total, "breached": breached, "breach_rate": round(breach_rate, 2)}
+    if self._uses_metrics_view():
+      metrics = self._daily_metrics(org_id, days)
+      total, breached = int(metrics.incidents), int(metrics.breached)
+    else:
+      start_date = datetime.utcnow() - timedelta(days=days)
+      breaches = self.db.query(models.IncidentEvent.incident_id).filter(
+        models.IncidentEvent.event_type == "SLA_BREACH",
+        models.IncidentEvent.organization_id == org_id,
+        models.IncidentEvent.created_at >= start_date
+      ).distinct().subquery()
+
+      total, breached = self.db.query(
+        func.count(models.Incident.id),
+        func.count(breaches.c.incident_id)
+      ).outerjoin(
+        breaches, models.Incident.id == breaches.c.incident_id
+      ).filter(
+        models.Incident.organization_id == org_id,
+        models.Incident.created_at >= start_date
+      ).one()
+
+    return _breach_summary(total, breached)
+
+  @replica_reads
+  def calculate_window_metrics(self, org_id: UUID, days: int = 30) -> dict:
+    """
+    MTTR and MTTA (seconds) plus the SLA breach summary of the window. On PostgreSQL all of them come
+    from a single read of incident_daily_metrics; elsewhere each is aggregated from the raw tables.
+    """
+    if not self._uses_metrics_view():
+      return {
+        "mttr_seconds": self.calculate_mttr_seconds(org_id, days),
+        "mtta_seconds": self.calculate_mtta_seconds(org_id, days),
+        "sla": self.calculate_sla_breach_rate(org_id, days),
+      }
+    metrics = self._daily_metrics(org_id, days)
+    return {
+      "mttr_seconds": _mean(metrics.resolve_seconds, metrics.resolved),
+      "mtta_seconds": _mean(metrics.ack_seconds, metrics.acknowledged),
+      "sla": _breach_summary(int(metrics.incidents), int(metrics.breached)),
+    }
   
   
+  @replica_reads
+  def stream_resolve_durations(self, org_id: UUID, days: int = 30, chunk_rows: int = DURATION_CHUNK_ROWS):
+    """
+    (seconds, severity, owner_id) of each incident created in the window and resolved since.
+    Read it with `.partitions()`: rows arrive `chunk_rows` at a time (a server-side cursor on Postgres).
+    """
+    start_date = datetime.utcnow() - timedelta(days=days)
+    query = select(
+      self._seconds_between(models.Incident.resolved_at, models.Incident.created_at),
+      models.Incident.severity,
+      models.Incident.owner_id
+    ).where(
+      models.Incident.resolved_at.isnot(None),
+      models.Incident.organization_id == org_id,
+      models.Incident.created_at >= start_date
+    ).execution_options(yield_per=chunk_rows)
+    return self.db.execute(query)
+
+  @replica_reads
+  def stream_acknowledge_durations(self, org_id: UUID, days: int = 30, chunk_rows: int = DURATION_CHUNK_ROWS):
+    """Like `stream_resolve_durations`, up to the first status or owner change (as in MTTA)."""
+    start_date = datetime.utcnow() - timedelta(days=days)
+    first_response = select(
+      models.IncidentEvent.incident_id,
+      func.min(models.IncidentEvent.created_at).label("ack_time")
+    ).where(
+      models.IncidentEvent.event_type.in_(("STATUS_CHANGE", "OWNER_CHANGE")),
+      models.IncidentEvent.organization_id == org_id,
+      models.IncidentEvent.created_at >= start_date
+    ).group_by(models.IncidentEvent.incident_id).subquery()
+
+    query = select(
+      self._seconds_between(first_response.c.ack_time, models.Incident.created_at),
+      models.Incident.severity,
+      models.Incident.owner_id
+    ).select_from(models.Incident).join(
+      first_response, models.Incident.id == first_response.c.incident_id
+    ).where(
+      models.Incident.organization_id == org_id,
+      models.Incident.created_at >= start_date
+    ).execution_options(yield_per=chunk_rows)
+    return self.db.execute(query)
+
+  @replica_reads
   def get_detailed_user_stats(self, org_id: UUID):
     """
     Individual User Performance Metrics:
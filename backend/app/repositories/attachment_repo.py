@@ -1,7 +1,9 @@
 from sqlalchemy.orm import Session
+from sqlalchemy import and_
 from uuid import UUID
-from typing import List, Optional
-from app.db.models import IncidentAttachment
+from typing import Optional
+from app.db.models import Incident, IncidentAttachment, User
+from app.db.replicas import replica_reads
 
 class AttachmentRepository:
   def __init__(self, db: Session):
@@ -20,11 +22,32 @@ class AttachmentRepository:
       IncidentAttachment.organization_id == org_id
     ).first()
 
-  def list_by_incident(self, incident_id: UUID, org_id: UUID) -> List[IncidentAttachment]:
-    return self.db.query(IncidentAttachment).filter(
-      IncidentAttachment.incident_id == incident_id,
-      IncidentAttachment.organization_id == org_id
-    ).all()
+  @replica_reads
+  def list_with_uploaders(self, incident_id: UUID, org_id: UUID):
+    """
+    Attachments joined to their uploader's name in a single statement.
+    The query starts from the incident, so an unknown or foreign incident returns no rows,
+    while an incident without attachments returns one row whose attachment columns are NULL.
+    """
+    return self.db.query(
+      IncidentAttachment.id,
+      IncidentAttachment.file_name,
+      IncidentAttachment.file_key,
+      IncidentAttachment.created_at,
+      User.full_name.label("uploader_name"),
+    ).select_from(Incident).outerjoin(
+      IncidentAttachment,
+      and_(
+        IncidentAttachment.incident_id == Incident.id,
+        IncidentAttachment.organization_id == org_id
+      )
+    ).outerjoin(
+      User,
+      User.id == IncidentAttachment.uploaded_by
+    ).filter(
+      Incident.id == incident_id,
+      Incident.organization_id == org_id
+    ).order_by(IncidentAttachment.created_at).all()
 
   def delete_entity(self, attachment: IncidentAttachment):
     self.db.delete(attachment)
@@ -0,0 +1,50 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+from uuid import UUID
+from datetime import datetime
+from typing import Iterator, List
+from app.db.models import Incident, IncidentEvent
+
+INCIDENT_COLUMNS = [
+  Incident.id, Incident.title, Incident.description, Incident.severity, Incident.status,
+  Incident.owner_id, Incident.created_at, Incident.updated_at, Incident.resolved_at,
+]
+
+EVENT_COLUMNS = [
+  IncidentEvent.id, IncidentEvent.incident_id, IncidentEvent.actor_id, IncidentEvent.event_type,
+  IncidentEvent.old_value, IncidentEvent.new_value, IncidentEvent.comment, IncidentEvent.created_at,
+]
+
+class ExportRepository:
+  def __init__(self, db: Session):
+    self.db = db
+
+  def _stream(self, statement, batch_size: int) -> Iterator[List[dict]]:
+    # yield_per implies stream_results: Postgres uses a server-side cursor and only `batch_size` rows are held at once
+    result = self.db.execute(statement.execution_options(yield_per=batch_size))
+    for partition in result.partitions():
+      yield [row._asdict() for row in partition]
+
+  def iter_incidents(self, org_id: UUID, start: datetime, end: datetime, batch_size: int) -> Iterator[List[dict]]:
+    statement = select(*INCIDENT_COLUMNS).where(
+      Incident.organization_id == org_id,
+      Incident.created_at >= start,
+      Incident.created_at < end
+    ).order_by(Incident.created_at, Incident.id)
+    return self._stream(statement, batch_size)
+
+  def iter_events(self, org_id: UUID, start: datetime, end: datetime, batch_size: int) -> Iterator[List[dict]]:
+    statement = select(*EVENT_COLUMNS).where(
+      IncidentEvent.organization_id == org_id,
+      IncidentEvent.created_at >= start,
+      IncidentEvent.created_at < end
+    ).order_by(IncidentEvent.created_at, IncidentEvent.id)
+    return self._stream(statement, batch_size)
+
+  def list_archived_incident_ids(self, org_id: UUID, end: datetime) -> List[UUID]:
+    # Events never predate their incident, so incidents created after the window cannot contribute
+    return self.db.scalars(select(Incident.id).where(
+      Incident.organization_id == org_id,
+      Incident.events_archived_at.is_not(None),
+      Incident.created_at < end
+    ).order_by(Incident.created_at)).all()
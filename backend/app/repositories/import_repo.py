@@ -0,0 +1,39 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import insert, select, func, text
+from uuid import UUID
+from datetime import date
+from typing import Dict, Iterable, List
+from app.db.models import Incident, IncidentEvent, User
+
+class ImportRepository:
+  def __init__(self, db: Session):
+    self.db = db
+
+  def find_user_ids_by_email(self, org_id: UUID, emails: Iterable[str]) -> Dict[str, UUID]:
+    emails = list(emails)
+    if not emails:
+      return {}
+    rows = self.db.execute(select(func.lower(User.email), User.id).where(
+      User.organization_id == org_id,
+      func.lower(User.email).in_(emails)
+    )).all()
+    return {email: user_id for email, user_id in rows}
+
+  # Core inserts on the tables with pre-generated ids: a plain executemany (multi-row VALUES on Postgres).
+  # The ORM bulk path would honour eager_defaults and fall back to per-row RETURNING.
+  def insert_incidents(self, rows: List[dict]):
+    if rows:
+      self.db.execute(insert(Incident.__table__), rows)
+
+  def insert_events(self, rows: List[dict]):
+    if rows:
+      self.db.execute(insert(IncidentEvent.__table__), rows)
+
+  def ensure_event_partitions(self, start_month: date, months: int):
+    """Creates monthly incident_events partitions for back-dated history (PostgreSQL only)."""
+    if self.db.get_bind().dialect.name != "postgresql":
+      return
+    self.db.execute(
+      text("SELECT ensure_incident_event_partitions(CAST(:start AS date), :months)"),
+      {"start": start_month, "months": months}
+    )
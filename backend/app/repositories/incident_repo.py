@@ -1,34 +1,45 @@
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, undefer
+from sqlalchemy import insert
 from uuid import UUID
+from datetime import datetime
 from typing import List, Optional
-from app.db.models import Incident, IncidentEvent, IncidentAttachment
+from app.db.models import Incident, IncidentEvent, IncidentAttachment, IncidentStatus
+from app.db.replicas import replica_reads
 
 class IncidentRepository:
   def __init__(self, db: Session):
     self.db = db
 
-  def get_by_id(self, incident_id: UUID, org_id: UUID) -> Optional[Incident]:
-    return self.db.query(Incident).filter(
+  def get_by_id(self, incident_id: UUID, org_id: UUID, with_description: bool = False) -> Optional[Incident]:
+    query = self.db.query(Incident).filter(
       Incident.id == incident_id,
       Incident.organization_id == org_id
-    ).first()
+    )
+    if with_description:
+      query = query.options(undefer(Incident.description))
+    return query.first()
 
-  def get_all(self, org_id: UUID) -> List[Incident]:
-    return self.db.query(Incident).filter(
+  @replica_reads
+  def list_summaries(self, org_id: UUID):
+    """Column projection of the IncidentRead fields; rows bypass the identity map."""
+    return self.db.query(
+      Incident.id,
+      Incident.title,
+      Incident.description,
+      Incident.severity,
+      Incident.status,
+      Incident.owner_id,
+      Incident.created_at,
+      Incident.updated_at,
+      Incident.version,
+      Incident.sla_deadline,
+    ).filter(
       Incident.organization_id == org_id
     ).all()
 
   def add(self, incident: Incident) -> Incident:
+    # Written by the caller's commit; server defaults come back via RETURNING (eager_defaults)
     self.db.add(incident)
-    self.db.flush()
-    self.db.refresh(incident)
-    return incident
-
-  def flush(self):
-    self.db.flush()
-
-  def refresh(self, incident: Incident) -> Incident:
-    self.db.refresh(incident)
     return incident
 
   def delete_entity(self, incident: Incident):
@@ -38,14 +49,64 @@ class IncidentRepository:
 
   def add_event(self, event: IncidentEvent):
     self.db.add(event)
-    self.db.flush()
 
+  @replica_reads
   def get_events(self, incident_id: UUID, org_id: UUID) -> List[IncidentEvent]:
-    return self.db.query(IncidentEvent).filter(
+    """Full audit entities with comments and actors loaded up front (post-mortem timeline)."""
+    return self.db.query(IncidentEvent).options(
+      undefer(IncidentEvent.comment),
+      joinedload(IncidentEvent.actor)
+    ).filter(
+      IncidentEvent.incident_id == incident_id,
+      IncidentEvent.organization_id == org_id
+    ).order_by(IncidentEvent.created_at.desc()).all()
+
+  @replica_reads
+  def list_event_summaries(self, incident_id: UUID, org_id: UUID):
+    """Column projection of the audit log for the events view; rows bypass the identity map."""
+    return self.db.query(
+      IncidentEvent.id,
+      IncidentEvent.incident_id,
+      IncidentEvent.actor_id,
+      IncidentEvent.event_type,
+      IncidentEvent.old_value,
+      IncidentEvent.new_value,
+      IncidentEvent.comment,
+      IncidentEvent.created_at,
+      IncidentEvent.organization_id,
+    ).filter(
       IncidentEvent.incident_id == incident_id,
       IncidentEvent.organization_id == org_id
     ).order_by(IncidentEvent.created_at.desc()).all()
 
+  # --- Event archival ---
+
+  def list_archivable(self, cutoff: datetime, limit: int):
+    """CLOSED incidents untouched since `cutoff` whose audit log is still in the hot table."""
+    return self.db.query(Incident.id, Incident.organization_id).filter(
+      Incident.status == IncidentStatus.CLOSED,
+      Incident.updated_at < cutoff,
+      Incident.events_archived_at.is_(None)
+    ).order_by(Incident.updated_at).limit(limit).all()
+
+  def delete_events(self, incident_id: UUID, org_id: UUID):
+    self.db.query(IncidentEvent).filter(
+      IncidentEvent.incident_id == incident_id,
+      IncidentEvent.organization_id == org_id
+    ).delete(synchronize_session=False)
+
+  def insert_event_rows(self, rows: List[dict]):
+    if rows:
+      self.db.execute(insert(IncidentEvent), rows)
+
+  def set_events_archived_at(self, incident_id: UUID, archived_at: Optional[datetime], updated_at: Optional[datetime] = None):
+    # Core UPDATE so archiving does not bump updated_at through the ORM; rehydration passes `updated_at`
+    # explicitly, which restarts the archival clock (list_archivable) for the restored incident
+    self.db.query(Incident).filter(Incident.id == incident_id).update(
+      {Incident.events_archived_at: archived_at, Incident.updated_at: updated_at or Incident.updated_at},
+      synchronize_session="evaluate"
+    )
+
   # --- Attachments ---
   def add_attachment(self, attachment: IncidentAttachment) -> IncidentAttachment:
     self.db.add(attachment)
@@ -0,0 +1,86 @@
+import html
+import re
+from sqlalchemy.orm import Session
+from sqlalchemy import text
+from uuid import UUID
+from app.db.replicas import replica_reads
+
+# Match delimiters handed to ts_headline/snippet (private-use code points). The fragment is HTML-escaped
+# first and only then are these swapped for <mark> tags, so user text can never inject markup.
+_MARK_START, _MARK_END = "\ue000", "\ue001"
+_HEADLINE_OPTIONS = f"StartSel={_MARK_START}, StopSel={_MARK_END}, MaxFragments=2, MaxWords=20, MinWords=5"
+
+
+def _safe_highlight(fragment: str) -> str:
+  return html.escape(fragment or "").replace(_MARK_START, "<mark>").replace(_MARK_END, "</mark>")
+
+
+class SearchRepository:
+  def __init__(self, db: Session):
+    self.db = db
+
+  @replica_reads
+  def search_incidents(self, org_id: UUID, query: str, limit: int, offset: int):
+    """
+    Ranked full-text search over title, description and comments, scoped to one org.
+    Returns dicts of (id, title, severity, status, created_at, rank, highlight), best match first.
+    `highlight` is safe HTML: escaped text with the matched terms wrapped in <mark>.
+    """
+    if self.db.get_bind().dialect.name == "sqlite":
+      rows = self._search_fts5(org_id, query, limit, offset)
+    else:
+      rows = self._search_tsvector(org_id, query, limit, offset)
+    return [{**row._asdict(), "highlight": _safe_highlight(row.highlight)} for row in rows]
+
+  def _search_tsvector(self, org_id: UUID, query: str, limit: int, offset: int):
+    # Rank and page on the GIN-indexed vector first; ts_headline only runs for the returned page
+    search_query = text("""
+      WITH q AS (SELECT websearch_to_tsquery('english', :query) AS tsq),
+      hits AS (
+        SELECT i.id, ts_rank_cd(i.search_vector, q.tsq) AS rank
+        FROM incidents i, q
+        WHERE i.organization_id = :org_id
+        AND i.search_vector @@ q.tsq
+        ORDER BY rank DESC, i.created_at DESC
+        LIMIT :limit OFFSET :offset
+      )
+      SELECT i.id, i.title, i.severity, i.status, i.created_at, hits.rank,
+        ts_headline(
+          'english',
+          i.title || ' ' || coalesce(i.description, '') || ' ' || coalesce((
+            SELECT string_agg(e.comment, ' ') FROM incident_events e
+            WHERE e.incident_id = i.id AND e.event_type = 'COMMENT'
+          ), ''),
+          q.tsq, :headline_options
+        ) AS highlight
+      FROM hits
+      JOIN incidents i ON i.id = hits.id, q
+      ORDER BY hits.rank DESC, i.created_at DESC
+    """)
+    return self.db.execute(search_query, {
+      "org_id": str(org_id), "query": query, "limit": limit, "offset": offset, "headline_options": _HEADLINE_OPTIONS
+    }).fetchall()
+
+  def _search_fts5(self, org_id: UUID, query: str, limit: int, offset: int):
+    # Quote each term so user input can never be parsed as FTS5 query syntax
+    terms = re.findall(r"\w+", query)
+    if not terms:
+      return []
+    match = " ".join(f'"{term}"' for term in terms)
+
+    # bm25 weights follow the column order: incident_id, organization_id, title, description, comments
+    search_query = text("""
+      SELECT i.id, i.title, i.severity, i.status, i.created_at,
+        -bm25(incident_search, 0.0, 0.0, 10.0, 4.0, 1.0) AS rank,
+        snippet(incident_search, -1, :mark_start, :mark_end, '…', 16) AS highlight
+      FROM incident_search
+      JOIN incidents i ON i.id = incident_search.incident_id
+      WHERE incident_search MATCH :match
+      AND incident_search.organization_id = :org_id
+      ORDER BY rank DESC, i.created_at DESC
+      LIMIT :limit OFFSET :offset
+    """)
+    return self.db.execute(search_query, {
+      "org_id": org_id.hex, "match": match, "limit": limit, "offset": offset,
+      "mark_start": _MARK_START, "mark_end": _MARK_END
+    }).fetchall()
@@ -0,0 +1,81 @@
+from sqlalchemy.orm import Session
+from uuid import UUID
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+from app.db.models import Incident, IncidentEvent, IncidentSignature
+from app.db.replicas import replica_reads
+
+class SimilarityRepository:
+  def __init__(self, db: Session):
+    self.db = db
+
+  def get_source_text(self, incident_id: UUID) -> Optional[Tuple[UUID, List[str]]]:
+    """Returns (organization_id, [title, description, *comments]) or None if the incident is gone."""
+    return self.get_source_texts([incident_id]).get(incident_id)
+
+  def get_source_texts(self, incident_ids: List[UUID]) -> Dict[UUID, Tuple[UUID, List[str]]]:
+    """Same as `get_source_text` for a batch, in two queries; incidents that are gone are left out."""
+    if not incident_ids:
+      return {}
+    incidents = self.db.query(
+      Incident.id, Incident.organization_id, Incident.title, Incident.description
+    ).filter(Incident.id.in_(incident_ids)).all()
+    sources = {row.id: (row.organization_id, [row.title, row.description]) for row in incidents}
+
+    comments = self.db.query(IncidentEvent.incident_id, IncidentEvent.comment).filter(
+      IncidentEvent.incident_id.in_(list(sources)),
+      IncidentEvent.event_type == "COMMENT"
+    ).all()
+    for row in comments:
+      sources[row.incident_id][1].append(row.comment)
+    return sources
+
+  def list_unsigned_incident_ids(self, limit: int) -> List[UUID]:
+    """Newest incidents without a signature yet (created before the indexer existed, or missed by it)."""
+    rows = self.db.query(Incident.id).outerjoin(
+      IncidentSignature, IncidentSignature.incident_id == Incident.id
+    ).filter(
+      IncidentSignature.incident_id.is_(None)
+    ).order_by(Incident.created_at.desc()).limit(limit).all()
+    return [row.id for row in rows]
+
+  def upsert_signature(self, incident_id: UUID, org_id: UUID, signature: bytes):
+    self.db.merge(IncidentSignature(incident_id=incident_id, organization_id=org_id, signature=signature))
+
+  def upsert_signatures(self, rows: List[Tuple[UUID, UUID, bytes]]):
+    """(incident_id, org_id, signature) rows: one SELECT for the existing ones, then updates and inserts."""
+    existing = {
+      signature.incident_id: signature
+      for signature in self.db.query(IncidentSignature).filter(IncidentSignature.incident_id.in_([row[0] for row in rows]))
+    }
+    for incident_id, org_id, signature in rows:
+      if incident_id in existing:
+        existing[incident_id].signature = signature
+      else:
+        self.db.add(IncidentSignature(incident_id=incident_id, organization_id=org_id, signature=signature))
+
+  @replica_reads
+  def list_signatures_since(self, org_id: UUID, since: Optional[datetime]):
+    query = self.db.query(
+      IncidentSignature.incident_id,
+      IncidentSignature.signature,
+      IncidentSignature.updated_at,
+    ).filter(IncidentSignature.organization_id == org_id)
+    if since is not None:
+      query = query.filter(IncidentSignature.updated_at >= since)
+    return query.all()
+
+  @replica_reads
+  def list_summaries_by_ids(self, org_id: UUID, incident_ids: List[UUID]):
+    if not incident_ids:
+      return []
+    return self.db.query(
+      Incident.id,
+      Incident.title,
+      Incident.severity,
+      Incident.status,
+      Incident.created_at,
+    ).filter(
+      Incident.organization_id == org_id,
+      Incident.id.in_(incident_ids)
+    ).all()
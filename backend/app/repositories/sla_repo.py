@@ -0,0 +1,74 @@
+from sqlalchemy.orm import Session
+from sqlalchemy import bindparam, or_, update
+from uuid import UUID
+from datetime import datetime
+from typing import Dict, Iterable, List
+from app.db.models import Incident, IncidentSeverity, IncidentStatus, SlaPolicy, User, UserRole
+
+class SlaRepository:
+  def __init__(self, db: Session):
+    self.db = db
+
+  # --- Policies ---
+
+  def get_policy_minutes(self, org_id: UUID) -> Dict[IncidentSeverity, int]:
+    rows = self.db.query(SlaPolicy.severity, SlaPolicy.response_minutes).filter(
+      SlaPolicy.organization_id == org_id
+    ).all()
+    return {IncidentSeverity(severity): minutes for severity, minutes in rows}
+
+  def upsert_policy(self, org_id: UUID, severity: IncidentSeverity, minutes: int) -> SlaPolicy:
+    policy = self.db.get(SlaPolicy, (org_id, severity))
+    if policy is None:
+      policy = SlaPolicy(organization_id=org_id, severity=severity)
+      self.db.add(policy)
+    policy.response_minutes = minutes
+    return policy
+
+  def delete_policy(self, org_id: UUID, severity: IncidentSeverity) -> bool:
+    return self.db.query(SlaPolicy).filter(
+      SlaPolicy.organization_id == org_id,
+      SlaPolicy.severity == severity
+    ).delete(synchronize_session=False) > 0
+
+  # --- Deadlines ---
+
+  def list_pending(self, org_id: UUID, severity: IncidentSeverity):
+    """DETECTED incidents of one severity that still have a deadline (policy changes re-time these)."""
+    return self.db.query(Incident.id, Incident.created_at).filter(
+      Incident.organization_id == org_id,
+      Incident.severity == severity,
+      Incident.status == IncidentStatus.DETECTED,
+      Incident.sla_deadline.isnot(None)
+    ).all()
+
+  def set_deadlines(self, deadlines: List[dict]):
+    # Core executemany: re-timing a deadline is bookkeeping, not an edit, so it neither bumps version nor updated_at
+    if not deadlines:
+      return
+    table = Incident.__table__
+    self.db.execute(
+      update(table).where(table.c.id == bindparam("_id")).values(
+        sla_deadline=bindparam("_deadline"), updated_at=table.c.updated_at
+      ),
+      [{"_id": d["id"], "_deadline": d["sla_deadline"]} for d in deadlines]
+    )
+
+  def claim_due(self, now: datetime, limit: int) -> List[Incident]:
+    """
+    Incidents whose deadline has passed, earliest first. An index range scan on sla_deadline;
+    on Postgres the rows are locked and ones another scheduler already holds are skipped.
+    """
+    return self.db.query(Incident).filter(
+      Incident.sla_deadline.isnot(None),
+      Incident.sla_deadline <= now
+    ).order_by(Incident.sla_deadline).limit(limit).with_for_update(skip_locked=True).all()
+
+  def find_recipients(self, owner_ids: Iterable[UUID], org_ids: Iterable[UUID]):
+    """Emails of the given owners and of every admin in the given orgs, in one query."""
+    return self.db.query(User.id, User.email, User.organization_id, User.role).filter(
+      or_(
+        User.id.in_(list(owner_ids)),
+        (User.organization_id.in_(list(org_ids))) & (User.role == UserRole.ADMIN)
+      )
+    ).all()
@@ -20,8 +20,17 @@ class UserRepository:
   def get_by_id_global(self, user_id: UUID) -> Optional[User]:
     return self.db.query(User).filter(User.id == user_id).first()
 
-  def list_all(self, org_id: UUID) -> List[User]:
-    return self.db.query(User).filter(
+  def list_summaries(self, org_id: UUID):
+    """Column projection of the UserRead fields; rows bypass the identity map."""
+    return self.db.query(
+      User.id,
+      User.email,
+      User.full_name,
+      User.role,
+      User.phone_number,
+      User.organization_id,
+      User.created_at,
+    ).filter(
       User.organization_id == org_id,
       User.role != UserRole.BOT
     ).all()
@@ -32,6 +41,16 @@ class UserRepository:
     self.db.refresh(user)
     return user
 
+  def add_all(self, users: List[User]):
+    self.db.add_all(users)
+    self.db.flush()
+
+  def find_existing_emails(self, emails: List[str]) -> List[str]:
+    """Which of the given (lower-cased) emails already belong to a user, in any org."""
+    if not emails:
+      return []
+    return [row[0] for row in self.db.query(func.lower(User.email)).filter(func.lower(User.email).in_(emails)).all()]
+
   def flush(self):
     self.db.flush()
 
@@ -35,4 +35,35 @@ class AnalyticsResponse(BaseModel):
   mtta_minutes: float
   sla_breach_rate: float
   total_breaches: int
-  volume_trend: List[VolumeTrendPoint]
\ No newline at end of file
+  volume_trend: List[VolumeTrendPoint]
+
+class HistogramBin(BaseModel):
+  label: str # e.g. "1-4h"
+  min_seconds: float
+  max_seconds: Optional[float] = None # None for the open-ended last bin
+
+class DurationDistribution(BaseModel):
+  count: int
+  mean_seconds: float
+  p50_seconds: float
+  p90_seconds: float
+  p99_seconds: float
+  histogram: List[int] # Counts per DistributionResponse.histogram_bins entry
+
+class SeverityDurationDistribution(DurationDistribution):
+  severity: str
+
+class OwnerDurationDistribution(DurationDistribution):
+  owner_id: Optional[UUID] = None # None: unassigned incidents
+  owner_name: Optional[str] = None
+
+class DurationBreakdown(BaseModel):
+  overall: DurationDistribution
+  by_severity: List[SeverityDurationDistribution]
+  by_owner: List[OwnerDurationDistribution]
+
+class DistributionResponse(BaseModel):
+  time_window_days: int
+  histogram_bins: List[HistogramBin]
+  resolve: DurationBreakdown # Creation to resolution
+  acknowledge: DurationBreakdown # Creation to first status or owner change
@@ -0,0 +1,21 @@
+from pydantic import BaseModel
+from typing import Literal, Optional
+from uuid import UUID
+from datetime import datetime
+
+ExportDataset = Literal["incidents", "events"]
+ExportFormat = Literal["csv", "jsonl"]
+
+class ExportRequest(BaseModel):
+  dataset: ExportDataset = "incidents"
+  format: ExportFormat = "csv"
+  start: Optional[datetime] = None
+  end: Optional[datetime] = None
+  gzip: bool = True
+
+class ExportJob(BaseModel):
+  export_id: UUID
+  status: Literal["queued", "running", "ready", "failed"]
+  key: str
+  download_url: Optional[str] = None # Only once ready, so the link's expiry starts when the file exists
+  error: Optional[str] = None
@@ -0,0 +1,40 @@
+from pydantic import BaseModel, model_validator
+from typing import Optional, List
+from datetime import datetime
+from app.core.fsm import IncidentStatus
+from app.schemas.incident import IncidentCreate
+
+# --- Bulk Import Schemas ---
+class ImportHistoryEntry(BaseModel):
+  at: datetime
+  status: Optional[IncidentStatus] = None
+  comment: Optional[str] = None
+  actor_email: Optional[str] = None
+
+  @model_validator(mode="after")
+  def check_not_empty(self):
+    if self.status is None and not self.comment:
+      raise ValueError("history entry needs a status or a comment")
+    return self
+
+class ImportRecord(IncidentCreate):
+  """One incident from another tool. `history` replays status changes and comments in order."""
+  description: str = ""
+  owner_email: Optional[str] = None
+  status: Optional[IncidentStatus] = None
+  created_at: datetime
+  resolved_at: Optional[datetime] = None
+  history: List[ImportHistoryEntry] = []
+
+class ImportFailure(BaseModel):
+  line: int
+  error: str
+
+class ImportReport(BaseModel):
+  processed: int = 0
+  imported: int = 0
+  failed: int = 0
+  events: int = 0
+  unknown_users: List[str] = []
+  failures: List[ImportFailure] = []
+  dry_run: bool = False
@@ -1,8 +1,8 @@
-from pydantic import BaseModel, computed_field
-from typing import Optional, List
+from pydantic import BaseModel
+from typing import Optional, List, Tuple
 from uuid import UUID
 from datetime import datetime
-from app.core.fsm import IncidentStatus, VALID_TRANSITIONS
+from app.core.fsm import IncidentStatus
 from app.db.models import IncidentSeverity
 
 class IncidentCreate(BaseModel):
@@ -20,11 +20,9 @@ class IncidentRead(BaseModel):
   owner_id: Optional[UUID]
   created_at: datetime
   updated_at: datetime
-  
-  @computed_field
-  @property
-  def allowed_transitions(self) -> List[str]:
-    return VALID_TRANSITIONS.get(IncidentStatus(self.status), [])
+  version: int
+  sla_deadline: Optional[datetime] = None # Set while the incident waits to be acknowledged
+  allowed_transitions: Tuple[str, ...] # From the org's workflow, filled in by IncidentService
   
   class Config:
     from_attributes = True
@@ -39,4 +37,28 @@ class CommentRequest(BaseModel):
 class IncidentUpdate(BaseModel):
   severity: Optional[IncidentSeverity] = None
   owner_id: Optional[UUID] = None
-  comment: Optional[str] = None
\ No newline at end of file
+  comment: Optional[str] = None
+
+class IncidentSearchHit(BaseModel):
+  id: UUID
+  title: str
+  severity: str
+  status: str
+  created_at: datetime
+  rank: float
+  highlight: str # Safe HTML: escaped text, matched terms wrapped in <mark>
+
+class IncidentSearchResults(BaseModel):
+  query: str
+  limit: int
+  offset: int
+  next_offset: Optional[int] = None # None when this is the last page
+  items: List[IncidentSearchHit]
+
+class SimilarIncident(BaseModel):
+  id: UUID
+  title: str
+  severity: str
+  status: str
+  created_at: datetime
+  score: float # Estimated Jaccard similarity of title, description and comments (0-1)
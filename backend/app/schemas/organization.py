@@ -1,7 +1,7 @@
-from pydantic import BaseModel, EmailStr
+from pydantic import BaseModel, EmailStr, Field
 from uuid import UUID
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 from app.schemas.common import OrgProfile
 from app.schemas.user import UserRead
@@ -21,6 +21,21 @@ class InviteResponse(BaseModel):
   message: str
   user_id: UUID
 
+class BulkInviteRequest(BaseModel):
+  invites: List[InviteRequest] = Field(..., min_length=1, max_length=200)
+
+class InvitedUser(BaseModel):
+  email: EmailStr
+  user_id: UUID
+
+class InviteFailure(BaseModel):
+  email: EmailStr
+  error: str
+
+class BulkInviteResponse(BaseModel):
+  invited: List[InvitedUser]
+  failed: List[InviteFailure]
+
 class OrgRead(BaseModel):
   id: UUID
   name: str
@@ -0,0 +1,11 @@
+from pydantic import BaseModel, Field
+from typing import Optional
+
+class SlaPolicyRead(BaseModel):
+  severity: str
+  response_minutes: int
+  is_default: bool # No org policy: the built-in target applies
+
+class SlaPolicyUpdate(BaseModel):
+  # None resets the severity to the built-in target
+  response_minutes: Optional[int] = Field(None, gt=0, le=60 * 24 * 30)
@@ -1,9 +1,28 @@
 import os
-from typing import List
-from groq import Groq
+import time
+import logging
+import threading
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 from botocore.exceptions import ClientError
 from app.db import models
 from app.core.storage import get_s3_client, BUCKET_NAME, S3_EXTERNAL_ENDPOINT
+from app.core.metrics import metrics
+
+if TYPE_CHECKING:
+  import httpx
+  from groq import Groq
+
+logger = logging.getLogger(__name__)
+
+# A stuck provider gives up after these instead of pinning a worker; retries cover 429/5xx/connection errors
+GROQ_CONNECT_TIMEOUT = float(os.getenv("GROQ_CONNECT_TIMEOUT", "5"))
+GROQ_READ_TIMEOUT = float(os.getenv("GROQ_READ_TIMEOUT", "60"))
+GROQ_MAX_RETRIES = int(os.getenv("GROQ_MAX_RETRIES", "2"))
+
+# One client per (API key, base URL) for the life of the process, all on one keep-alive connection pool
+_clients: Dict[Tuple[str, Optional[str]], "Groq"] = {}
+_http_client: Optional["httpx.Client"] = None
+_clients_lock = threading.Lock()
 
 class AIServiceError(Exception):
   """Raised when the AI provider cannot generate a post-mortem."""
@@ -35,11 +54,63 @@ class AIService:
       s3.create_bucket(Bucket=BUCKET_NAME)
 
   @staticmethod
-  def _get_client() -> Groq:
+  def _get_client() -> "Groq":
+    global _http_client
     api_key = os.environ.get("GROQ_API_KEY")
     if not api_key:
       raise AIServiceConfigError("GROQ_API_KEY is not configured")
-    return Groq(api_key=api_key)
+    key = (api_key, os.environ.get("GROQ_BASE_URL"))
+    client = _clients.get(key)
+    if client is not None:
+      return client
+
+    with _clients_lock:
+      if key not in _clients:
+        # The SDK and its HTTP stack are only imported by processes that generate post-mortems
+        import httpx
+        from groq import Groq
+        timeout = httpx.Timeout(GROQ_READ_TIMEOUT, connect=GROQ_CONNECT_TIMEOUT)
+        if _http_client is None:
+          _http_client = httpx.Client(timeout=timeout, limits=httpx.Limits(max_keepalive_connections=10))
+        _clients[key] = Groq(
+          api_key=api_key,
+          base_url=key[1],
+          timeout=timeout,
+          max_retries=GROQ_MAX_RETRIES,
+          http_client=_http_client,
+        )
+      return _clients[key]
+
+  @staticmethod
+  def _complete(client: "Groq", model_name: str, messages: List[dict]):
+    """One chat completion (including SDK retries), recorded in the process metrics as groq:<model>."""
+    started = time.perf_counter()
+    try:
+      completion = client.chat.completions.create(
+        model=model_name,
+        messages=messages,
+        temperature=0.3,
+        max_tokens=1024,
+      )
+    except Exception:
+      elapsed = time.perf_counter() - started
+      metrics.record(f"groq:{model_name}", elapsed, ok=False)
+      logger.warning("Groq completion failed model=%s latency_ms=%.0f", model_name, elapsed * 1000)
+      raise
+
+    elapsed = time.perf_counter() - started
+    usage = completion.usage
+    prompt_tokens = usage.prompt_tokens if usage else 0
+    completion_tokens = usage.completion_tokens if usage else 0
+    metrics.record(
+      f"groq:{model_name}", elapsed,
+      prompt_tokens=prompt_tokens, completion_tokens=completion_tokens,
+    )
+    logger.info(
+      "Groq completion model=%s latency_ms=%.0f prompt_tokens=%s completion_tokens=%s",
+      model_name, elapsed * 1000, prompt_tokens, completion_tokens,
+    )
+    return completion
 
   @staticmethod
   def _candidate_models() -> List[str]:
@@ -153,15 +224,10 @@ class AIService:
 
     for model_name in AIService._candidate_models():
       try:
-        completion = client.chat.completions.create(
-          model=model_name,
-          messages=[
-            {"role": "system", "content": "You are a senior SRE. Output only Markdown."},
-            {"role": "user", "content": prompt}
-          ],
-          temperature=0.3,
-          max_tokens=1024,
-        )
+        completion = AIService._complete(client, model_name, [
+          {"role": "system", "content": "You are a senior SRE. Output only Markdown."},
+          {"role": "user", "content": prompt}
+        ])
         break
       except Exception as exc:
         last_error = exc
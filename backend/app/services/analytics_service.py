@@ -3,6 +3,7 @@ from sqlalchemy.orm import Session
 from app.schemas import analytics as schemas
 from app.repositories.analytics_repo import AnalyticsRepository
 from app.repositories.user_repo import UserRepository
+from app.db.models import IncidentSeverity
 
 class AnalyticsService:
   def __init__(self, db: Session):
@@ -46,9 +47,8 @@ class AnalyticsService:
 
   def get_analytics_charts(self, org_id: UUID, days: int = 30) -> schemas.AnalyticsResponse:
     # 1. Dynamic Time Window Calculations
-    mttr_sec = self.analytics_repo.calculate_mttr_seconds(org_id, days)
-    mtta_sec = self.analytics_repo.calculate_mtta_seconds(org_id, days)
-    sla_data = self.analytics_repo.calculate_sla_breach_rate(org_id, days)
+    metrics = self.analytics_repo.calculate_window_metrics(org_id, days)
+    mttr_sec, mtta_sec, sla_data = metrics["mttr_seconds"], metrics["mtta_seconds"], metrics["sla"]
     
     # 2. Get Volume Trend
     trend_data = self.analytics_repo.get_volume_trend(org_id, days)
@@ -64,4 +64,58 @@ class AnalyticsService:
       sla_breach_rate=sla_data['breach_rate'],
       total_breaches=sla_data['breached'],
       volume_trend=formatted_trend
-    )
\ No newline at end of file
+    )
+
+  def get_duration_distributions(self, org_id: UUID, days: int = 30) -> schemas.DistributionResponse:
+    """
+    p50/p90/p99, mean and histogram of resolve and acknowledge times, overall, per severity and per owner.
+    Durations are streamed from the database in chunks into fixed-size sketches, so memory stays
+    flat however many incidents the window holds.
+    """
+    from app.core.distribution import HISTOGRAM_EDGES, HISTOGRAM_LABELS # NumPy is only loaded for this report
+
+    owner_names = {row.id: row.full_name for row in self.user_repo.list_summaries(org_id)}
+    bins = [
+      schemas.HistogramBin(label=label, min_seconds=low, max_seconds=high)
+      for label, low, high in zip(HISTOGRAM_LABELS, HISTOGRAM_EDGES, [*HISTOGRAM_EDGES[1:], None])
+    ]
+    return schemas.DistributionResponse(
+      time_window_days=days,
+      histogram_bins=bins,
+      resolve=self._duration_breakdown(self.analytics_repo.stream_resolve_durations(org_id, days), owner_names),
+      acknowledge=self._duration_breakdown(self.analytics_repo.stream_acknowledge_durations(org_id, days), owner_names),
+    )
+
+  def _duration_breakdown(self, result, owner_names: dict) -> schemas.DurationBreakdown:
+    from app.core.distribution import HISTOGRAM_EDGES, sketch_durations
+
+    sketches = sketch_durations(result.partitions())
+
+    def distribution(summary: dict) -> dict:
+      return {
+        "count": summary["count"],
+        "mean_seconds": round(summary["mean"], 1),
+        "p50_seconds": round(summary["p50"], 1),
+        "p90_seconds": round(summary["p90"], 1),
+        "p99_seconds": round(summary["p99"], 1),
+        "histogram": summary["histogram"],
+      }
+
+    no_incidents = {"count": 0, "mean": 0.0, "p50": 0.0, "p90": 0.0, "p99": 0.0, "histogram": [0] * len(HISTOGRAM_EDGES)}
+    overall = sketches["overall"].summaries().get(None, no_incidents)
+    by_severity = sketches["severity"].summaries()
+    by_owner = sketches["owner"].summaries()
+    return schemas.DurationBreakdown(
+      overall=schemas.DurationDistribution(**distribution(overall)),
+      by_severity=[
+        schemas.SeverityDurationDistribution(severity=severity.value, **distribution(by_severity[severity]))
+        for severity in IncidentSeverity if severity in by_severity
+      ],
+      by_owner=sorted(
+        (
+          schemas.OwnerDurationDistribution(owner_id=owner_id, owner_name=owner_names.get(owner_id), **distribution(summary))
+          for owner_id, summary in by_owner.items()
+        ),
+        key=lambda owner: owner.count, reverse=True
+      ),
+    )
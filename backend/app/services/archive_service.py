@@ -0,0 +1,56 @@
+# backend/app/services/archive_service.py
+
+import os
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.repositories.incident_repo import IncidentRepository
+from app.core.event_archive import write_event_archive, read_event_archive, decode_event
+from app.core.cache import bump_org_version
+
+EVENT_ARCHIVE_AFTER_DAYS = int(os.getenv("EVENT_ARCHIVE_AFTER_DAYS", "180"))
+
+class ArchiveService:
+  def __init__(self, db: Session):
+    self.repo = IncidentRepository(db)
+    self.db = db
+
+  def archive_closed_incidents(self, older_than_days: int = EVENT_ARCHIVE_AFTER_DAYS, batch_size: int = 100) -> int:
+    """
+    Moves the audit log of incidents CLOSED for `older_than_days` to object storage.
+    Each incident is its own transaction: the upload happens first, so a failed delete leaves both copies
+    and the next run simply overwrites the archive.
+    """
+    cutoff = datetime.now(timezone.utc) - timedelta(days=older_than_days)
+    archived = 0
+    for incident_id, org_id in self.repo.list_archivable(cutoff, batch_size):
+      rows = [row._asdict() for row in self.repo.list_event_summaries(incident_id, org_id)]
+      write_event_archive(org_id, incident_id, rows)
+      self.repo.delete_events(incident_id, org_id)
+      self.repo.set_events_archived_at(incident_id, datetime.now(timezone.utc))
+      self.db.commit()
+      bump_org_version(org_id)
+      archived += 1
+    return archived
+
+  def get_archived_events(self, incident_id: UUID, org_id: UUID) -> List[dict]:
+    return read_event_archive(org_id, incident_id)
+
+  def rehydrate_events(self, incident_id: UUID, org_id: UUID) -> int:
+    """Restores an archived audit log into the hot table, e.g. before re-opening an investigation."""
+    incident = self.repo.get_by_id(incident_id, org_id)
+    if not incident:
+      raise HTTPException(status_code=404, detail="Incident not found")
+    if incident.events_archived_at is None:
+      raise HTTPException(status_code=400, detail="Incident events are not archived")
+
+    rows = [decode_event(row) for row in read_event_archive(org_id, incident_id)]
+    self.repo.insert_event_rows(rows)
+    # Touch updated_at so the nightly archival does not move the log straight back out
+    self.repo.set_events_archived_at(incident_id, None, updated_at=datetime.now(timezone.utc))
+    self.db.commit()
+    bump_org_version(org_id)
+    return len(rows)
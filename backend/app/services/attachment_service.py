@@ -7,6 +7,7 @@ from app.repositories.incident_repo import IncidentRepository
 from app.core.storage import create_presigned_post, get_s3_client, BUCKET_NAME, S3_EXTERNAL_ENDPOINT
 from app.db import models
 from app.db.models import IncidentAttachment, User
+from app.core.cache import bump_org_version
 
 class AttachmentService:
   def __init__(self, db: Session):
@@ -14,8 +15,9 @@ class AttachmentService:
     self.incident_repo = IncidentRepository(db)
     self.db = db
 
-  def _commit(self):
+  def _commit(self, org_id: UUID):
     self.db.commit()
+    bump_org_version(org_id)
 
   def generate_upload_url(self, incident_id: UUID, org_id: UUID, file_name: str):
     incident = self.incident_repo.get_by_id(incident_id, org_id)
@@ -49,22 +51,21 @@ class AttachmentService:
       comment=f"Uploaded attachment: {data.file_name}"
     )
     self.incident_repo.add_event(audit)
-    self._commit()
+    self._commit(org_id)
     return created_attachment
 
   def get_incident_attachments(self, incident_id: UUID, org_id: UUID):
-    if not self.incident_repo.get_by_id(incident_id, org_id):
+    rows = self.repo.list_with_uploaders(incident_id, org_id)
+    if not rows:
       raise HTTPException(status_code=404, detail="Incident not found")
 
-    attachments = self.repo.list_by_incident(incident_id, org_id)
-
     return [{
-      "id": att.id,
-      "file_name": att.file_name,
-      "file_url": f"{S3_EXTERNAL_ENDPOINT}/{BUCKET_NAME}/{att.file_key}",
-      "created_at": att.created_at,
-      "uploaded_by": att.uploader.full_name if att.uploader else "Unknown"
-    } for att in attachments]
+      "id": row.id,
+      "file_name": row.file_name,
+      "file_url": f"{S3_EXTERNAL_ENDPOINT}/{BUCKET_NAME}/{row.file_key}",
+      "created_at": row.created_at,
+      "uploaded_by": row.uploader_name or "Unknown"
+    } for row in rows if row.id is not None]
 
   def remove_attachment(self, attachment_id: UUID, incident_id: UUID, org_id: UUID, current_user: User):
     att = self.repo.get_by_id(attachment_id, incident_id, org_id)
@@ -88,4 +89,4 @@ class AttachmentService:
     )
     self.incident_repo.add_event(audit)
     self.repo.delete_entity(att)
-    self._commit()
+    self._commit(org_id)
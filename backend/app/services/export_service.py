@@ -0,0 +1,96 @@
+# backend/app/services/export_service.py
+
+import os
+import tempfile
+from uuid import UUID
+from datetime import datetime, timezone
+from typing import Iterator, List, Optional
+import orjson
+from botocore.exceptions import ClientError
+from sqlalchemy.orm import Session
+
+from app.repositories.export_repo import ExportRepository, INCIDENT_COLUMNS, EVENT_COLUMNS
+from app.core import storage
+from app.core.event_archive import read_event_archive, decode_event
+from app.core.export import FORMATS, encode
+
+EXPORT_BATCH_SIZE = int(os.getenv("EXPORT_BATCH_SIZE", "1000"))
+# A queued or running export not finished after this long is reported as failed (its worker was lost)
+EXPORT_STALE_SECONDS = int(os.getenv("EXPORT_STALE_SECONDS", str(6 * 3600)))
+
+DATASET_COLUMNS = {
+  "incidents": [c.key for c in INCIDENT_COLUMNS],
+  "events": [c.key for c in EVENT_COLUMNS],
+}
+
+def _as_utc(value: datetime) -> datetime:
+  return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def _export_prefix(org_id: UUID, export_id: UUID) -> str:
+  return f"orgs/{org_id}/exports/{export_id}."
+
+def export_key(org_id: UUID, export_id: UUID, fmt: str, compress: bool) -> str:
+  return f"{_export_prefix(org_id, export_id)}{FORMATS[fmt][1]}{'.gz' if compress else ''}"
+
+def write_export_status(org_id: UUID, export_id: UUID, status: str, key: str, error: Optional[str] = None) -> None:
+  """Job marker next to the export: queued -> running -> ready | failed. Celery keeps no results, so this is the only record."""
+  marker = {"status": status, "key": key, "error": error, "updated_at": datetime.now(timezone.utc).isoformat()}
+  storage.get_s3_client().put_object(
+    Bucket=storage.BUCKET_NAME, Key=_export_prefix(org_id, export_id) + "status.json",
+    Body=orjson.dumps(marker), ContentType="application/json"
+  )
+
+def read_export_status(org_id: UUID, export_id: UUID) -> Optional[dict]:
+  """The job marker, None for an export that was never queued. Unfinished jobs past EXPORT_STALE_SECONDS read as failed."""
+  try:
+    obj = storage.get_s3_client().get_object(Bucket=storage.BUCKET_NAME, Key=_export_prefix(org_id, export_id) + "status.json")
+  except ClientError as exc:
+    if exc.response.get("Error", {}).get("Code") in {"NoSuchKey", "404"}:
+      return None
+    raise
+  marker = orjson.loads(obj["Body"].read())
+  if marker["status"] in ("queued", "running"):
+    age = datetime.now(timezone.utc) - datetime.fromisoformat(marker["updated_at"])
+    if age.total_seconds() > EXPORT_STALE_SECONDS:
+      marker = {**marker, "status": "failed", "error": f"Export did not finish within {EXPORT_STALE_SECONDS} seconds"}
+  return marker
+
+class ExportService:
+  def __init__(self, db: Session):
+    self.repo = ExportRepository(db)
+    self.db = db
+
+  def _event_batches(self, org_id: UUID, start: datetime, end: datetime) -> Iterator[List[dict]]:
+    yield from self.repo.iter_events(org_id, start, end, EXPORT_BATCH_SIZE)
+
+    # Audit logs of archived incidents live in object storage; one archive is one batch
+    columns = DATASET_COLUMNS["events"]
+    for incident_id in self.repo.list_archived_incident_ids(org_id, end):
+      batch = []
+      for row in read_event_archive(org_id, incident_id):
+        event = decode_event(row)
+        if start <= _as_utc(event["created_at"]) < end:
+          batch.append({c: event.get(c) for c in columns})
+      if batch:
+        yield batch
+
+  def stream_export(self, org_id: UUID, dataset: str, fmt: str, start: datetime, end: datetime, compress: bool = False) -> Iterator[bytes]:
+    """Encoded export of one dataset, created_at in [start, end). Rows are read in batches of EXPORT_BATCH_SIZE."""
+    start, end = _as_utc(start), _as_utc(end)
+    if dataset == "incidents":
+      batches = self.repo.iter_incidents(org_id, start, end, EXPORT_BATCH_SIZE)
+    else:
+      batches = self._event_batches(org_id, start, end)
+    return encode(batches, DATASET_COLUMNS[dataset], fmt, compress)
+
+  def export_to_storage(self, org_id: UUID, dataset: str, fmt: str, start: datetime, end: datetime, compress: bool, key: str) -> str:
+    # Spool to disk past 8 MB so large exports never sit in worker memory
+    with tempfile.SpooledTemporaryFile(max_size=8 * 1024 * 1024) as spool:
+      for chunk in self.stream_export(org_id, dataset, fmt, start, end, compress):
+        spool.write(chunk)
+      spool.seek(0)
+      storage.get_s3_client().upload_fileobj(
+        spool, storage.BUCKET_NAME, key,
+        ExtraArgs={"ContentType": "application/gzip" if compress else FORMATS[fmt][0]}
+      )
+    return key
@@ -0,0 +1,194 @@
+# backend/app/services/import_service.py
+
+import os
+import uuid
+from uuid import UUID
+from datetime import date, datetime, timedelta, timezone
+from typing import BinaryIO, Callable, Dict, Iterable, List, Optional, Tuple, Union
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.db.models import IncidentSeverity
+from app.repositories.import_repo import ImportRepository
+from app.services.sla_service import SlaService
+from app.schemas.importer import ImportRecord, ImportReport, ImportFailure
+from app.core.importer import iter_records, load_record
+from app.core.fsm import IncidentStatus, Workflow, DEFAULT_WORKFLOW, get_workflow
+from app.core.cache import bump_org_version
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "2000"))
+MAX_REPORTED_FAILURES = 100
+
+def _as_utc(value: datetime) -> datetime:
+  return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+def _month(value: datetime) -> date:
+  return value.date().replace(day=1)
+
+def _error_message(exc: Exception) -> str:
+  if isinstance(exc, ValidationError):
+    return "; ".join(f"{'.'.join(str(p) for p in e['loc']) or 'record'}: {e['msg']}" for e in exc.errors())
+  return str(exc)
+
+def check_history(record: ImportRecord, workflow: Workflow = DEFAULT_WORKFLOW) -> IncidentStatus:
+  """Replays the record's history through the org's workflow and returns the final status."""
+  state = IncidentStatus.DETECTED
+  previous_at = _as_utc(record.created_at)
+  replayed = False
+  for i, entry in enumerate(record.history):
+    if _as_utc(entry.at) < previous_at:
+      raise ValueError(f"history[{i}] is earlier than the previous entry")
+    previous_at = _as_utc(entry.at)
+    if entry.status is not None:
+      if not workflow.can_transition(state, entry.status):
+        raise ValueError(f"history[{i}]: invalid transition from {state.value} to {entry.status.value}")
+      state = entry.status
+      replayed = True
+
+  if record.status is not None and record.status != state:
+    if replayed:
+      raise ValueError(f"status {record.status.value} does not match the end of history ({state.value})")
+    state = record.status
+  return state
+
+class ImportService:
+  def __init__(self, db: Session):
+    self.repo = ImportRepository(db)
+    self.db = db
+    # Per-run state, reset by import_records
+    self._sla_thresholds: Dict[IncidentSeverity, timedelta] = {}
+    self._users: Dict[str, Optional[UUID]] = {}
+    self._partitions_from: Optional[date] = None
+
+  def import_stream(self, stream: BinaryIO, fmt: str, org_id: UUID, source: str = "import",
+                    dry_run: bool = False, on_progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+    return self.import_records(iter_records(stream, fmt), org_id, source, dry_run, on_progress)
+
+  def import_records(self, records: Iterable[Tuple[int, Union[bytes, dict]]], org_id: UUID, source: str = "import",
+                     dry_run: bool = False, on_progress: Optional[Callable[[ImportReport], None]] = None) -> ImportReport:
+    """
+    Validates and inserts incidents with their audit history, IMPORT_CHUNK_SIZE records per transaction.
+    Invalid records are reported by line number and skipped; valid ones in the same chunk are still imported.
+    """
+    report = ImportReport(dry_run=dry_run)
+    workflow = get_workflow(org_id)
+    self._sla_thresholds = SlaService(self.db).get_thresholds(org_id)
+    self._users = {}
+    self._partitions_from = None
+    chunk: List[Tuple[ImportRecord, IncidentStatus]] = []
+
+    for line_no, raw in records:
+      report.processed += 1
+      try:
+        record = ImportRecord.model_validate(load_record(raw))
+        chunk.append((record, check_history(record, workflow)))
+      except (ValueError, ValidationError) as exc:
+        report.failed += 1
+        if len(report.failures) < MAX_REPORTED_FAILURES:
+          report.failures.append(ImportFailure(line=line_no, error=_error_message(exc)))
+
+      if len(chunk) >= IMPORT_CHUNK_SIZE:
+        self._flush_chunk(chunk, org_id, source, dry_run, report)
+        chunk = []
+        if on_progress:
+          on_progress(report)
+
+    if chunk:
+      self._flush_chunk(chunk, org_id, source, dry_run, report)
+    if on_progress:
+      on_progress(report)
+    if report.imported and not dry_run:
+      bump_org_version(org_id)
+    return report
+
+  def _resolve_users(self, chunk: List[Tuple[ImportRecord, IncidentStatus]], org_id: UUID, report: ImportReport):
+    # One lookup per chunk for emails not seen before; unknown emails are remembered too
+    emails = {e.lower() for r, _ in chunk for e in [r.owner_email, *(h.actor_email for h in r.history)] if e}
+    missing = emails - self._users.keys()
+    if not missing:
+      return
+    found = self.repo.find_user_ids_by_email(org_id, missing)
+    for email in missing:
+      self._users[email] = found.get(email)
+      if email not in found:
+        report.unknown_users.append(email)
+
+  def _user_id(self, email: Optional[str]) -> Optional[UUID]:
+    return self._users.get(email.lower()) if email else None
+
+  def _flush_chunk(self, chunk: List[Tuple[ImportRecord, IncidentStatus]], org_id: UUID, source: str, dry_run: bool, report: ImportReport):
+    self._resolve_users(chunk, org_id, report)
+
+    incidents, events = [], []
+    for record, final_status in chunk:
+      incident_row, event_rows = self._build_rows(record, final_status, org_id, source)
+      incidents.append(incident_row)
+      events.extend(event_rows)
+
+    if not dry_run:
+      oldest = min(_month(row["created_at"]) for row in incidents)
+      if self._partitions_from is None or oldest < self._partitions_from:
+        today = date.today()
+        months = (today.year - oldest.year) * 12 + today.month - oldest.month + 1
+        self.repo.ensure_event_partitions(oldest, months)
+        self._partitions_from = oldest
+      self.repo.insert_incidents(incidents)
+      self.repo.insert_events(events)
+      self.db.commit()
+
+      from app.core.tasks import index_incidents_similarity # Keeps Celery out of API startup
+      index_incidents_similarity.delay([str(row["id"]) for row in incidents])
+
+    report.imported += len(incidents)
+    report.events += len(events)
+
+  def _build_rows(self, record: ImportRecord, final_status: IncidentStatus, org_id: UUID, source: str) -> Tuple[dict, List[dict]]:
+    incident_id = uuid.uuid4()
+    created_at = _as_utc(record.created_at)
+    owner_id = self._user_id(record.owner_email)
+    resolved_at = _as_utc(record.resolved_at) if record.resolved_at else None
+
+    def event(event_type, at, actor_id, old_value=None, new_value=None, comment=None):
+      return {
+        "id": uuid.uuid4(), "incident_id": incident_id, "organization_id": org_id, "actor_id": actor_id,
+        "event_type": event_type, "old_value": old_value, "new_value": new_value, "comment": comment, "created_at": at,
+      }
+
+    events = [event("CREATION", created_at, owner_id, new_value=IncidentStatus.DETECTED.value, comment=f"Imported from {source}")]
+    state = IncidentStatus.DETECTED
+    updated_at = created_at
+    for entry in record.history:
+      at = _as_utc(entry.at)
+      actor_id = self._user_id(entry.actor_email)
+      if entry.status is not None:
+        events.append(event("STATUS_CHANGE", at, actor_id, state.value, entry.status.value,
+                            entry.comment or f"State changed from {state.value} to {entry.status.value}"))
+        if entry.status == IncidentStatus.RESOLVED and record.resolved_at is None:
+          resolved_at = at
+        state = entry.status
+      else:
+        events.append(event("COMMENT", at, actor_id, comment=entry.comment))
+      updated_at = at
+
+    if final_status != state:
+      # Only a final status was exported; record the jump instead of inventing intermediate steps
+      at = resolved_at or updated_at
+      events.append(event("STATUS_CHANGE", at, owner_id, state.value, final_status.value,
+                          f"Imported with status {final_status.value} (no transition history in {source})"))
+      updated_at = max(updated_at, at)
+
+    incident = {
+      "id": incident_id,
+      "title": record.title,
+      "description": record.description,
+      "severity": record.severity,
+      "status": final_status,
+      "owner_id": owner_id,
+      "organization_id": org_id,
+      "created_at": created_at,
+      "updated_at": updated_at,
+      "resolved_at": resolved_at,
+      # Still-open imports join the SLA schedule as if they had been declared here
+      "sla_deadline": created_at + self._sla_thresholds[record.severity] if final_status == IncidentStatus.DETECTED else None,
+    }
+    return incident, events
@@ -1,27 +1,69 @@
 # backend/app/services/incident_service.py
 
+import logging
 from uuid import UUID
-from datetime import datetime
-from typing import List
+from datetime import datetime, timezone
+from typing import List, Optional, Tuple
+from botocore.exceptions import BotoCoreError, ClientError
 from fastapi import HTTPException
 from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
 
 from app.db import models
+from app.db.replicas import use_replica
 from app.schemas import incident as schemas
 from app.repositories.incident_repo import IncidentRepository
-from app.core.tasks import send_incident_alert_email
-from app.core.fsm import can_transition, IncidentStatus
+from app.repositories.search_repo import SearchRepository
+from app.services.sla_service import SlaService
+from app.core.fsm import IncidentStatus, get_workflow
+from app.core.cache import bump_org_version
+from app.core.event_archive import read_event_archive
+
+logger = logging.getLogger(__name__)
 
 class IncidentService:
   def __init__(self, db: Session):
     self.repo = IncidentRepository(db)
+    self.search_repo = SearchRepository(db)
+    self.sla = SlaService(db)
     self.db = db
 
-  def _commit(self):
-    self.db.commit()
+  def _commit(self, org_id: UUID):
+    try:
+      self.db.commit()
+    except StaleDataError:
+      # Another request updated the incident between our read and our conditional UPDATE
+      self.db.rollback()
+      raise HTTPException(status_code=409, detail="Incident was modified by another request; reload and retry")
+    bump_org_version(org_id)
+
+  @staticmethod
+  def _check_version(incident: models.Incident, expected_version: Optional[int]):
+    if expected_version is not None and incident.version != expected_version:
+      raise HTTPException(
+        status_code=409,
+        detail=f"Incident is at version {incident.version}, not {expected_version}; reload and retry"
+      )
 
-  def list_incidents(self, org_id: UUID) -> List[models.Incident]:
-    return self.repo.get_all(org_id)
+  def list_incidents(self, org_id: UUID) -> List[dict]:
+    # Rows are already shaped like IncidentRead, so they skip per-row Pydantic validation;
+    # allowed transitions are shared per-state tuples from the org's compiled workflow
+    allowed = get_workflow(org_id).allowed
+    return [
+      {**row._asdict(), "allowed_transitions": allowed.get(row.status, ())}
+      for row in self.repo.list_summaries(org_id)
+    ]
+
+  def search_incidents(self, org_id: UUID, query: str, limit: int = 20, offset: int = 0) -> schemas.IncidentSearchResults:
+    # Fetch one extra row to know whether another page exists without a COUNT(*)
+    rows = self.search_repo.search_incidents(org_id, query, limit + 1, offset)
+    return schemas.IncidentSearchResults(
+      query=query,
+      limit=limit,
+      offset=offset,
+      next_offset=offset + limit if len(rows) > limit else None,
+      items=[schemas.IncidentSearchHit.model_validate(row) for row in rows[:limit]]
+    )
 
   def create_incident(self, data: schemas.IncidentCreate, user: models.User, org_id: UUID) -> models.Incident:
     final_owner_id = user.id
@@ -30,19 +72,25 @@ class IncidentService:
         raise HTTPException(status_code=403, detail="Not authorized to assign incidents to others")
       final_owner_id = data.owner_id
 
+    # Resolve the alert recipient up front; self-assigned incidents need no lookup at all
+    if final_owner_id == user.id:
+      owner_email = user.email
+    else:
+      owner_email = self.db.query(models.User.email).filter(models.User.id == final_owner_id).scalar()
+
     new_incident = models.Incident(
       title=data.title,
       description=data.description,
       severity=data.severity,
       owner_id=final_owner_id,
       status=IncidentStatus.DETECTED,
-      organization_id=org_id
+      organization_id=org_id,
+      sla_deadline=self.sla.deadline_for(org_id, data.severity, datetime.now(timezone.utc))
     )
-
     created = self.repo.add(new_incident)
 
     audit = models.IncidentEvent(
-      incident_id=created.id,
+      incident=created,
       actor_id=user.id,
       organization_id=org_id,
       event_type="CREATION",
@@ -51,26 +99,24 @@ class IncidentService:
       + (f" (Assigned to {final_owner_id})" if final_owner_id != user.id else "")
     )
     self.repo.add_event(audit)
-    self._commit()
-    self.repo.refresh(created)
+    self._commit(org_id)
+    # Imported on first use so API startup does not load Celery and the worker-side services
+    from app.core.tasks import queue_alert_email, index_incident_similarity
+    index_incident_similarity.delay(str(created.id))
 
-    owner_email = self.db.query(models.User.email).filter(models.User.id == final_owner_id).scalar()
     if owner_email:
-      send_incident_alert_email.delay(
-        to_email=owner_email,
-        incident_title=created.title,
-        incident_id=str(created.id),
-        severity=str(created.severity)
-      )
+      queue_alert_email(owner_email, created.title, str(created.id), created.severity)
 
     return created
 
-  def transition_incident(self, incident_id: UUID, data: schemas.TransitionRequest, user: models.User, org_id: UUID):
+  def transition_incident(self, incident_id: UUID, data: schemas.TransitionRequest, user: models.User, org_id: UUID,
+                          expected_version: Optional[int] = None):
     incident = self.repo.get_by_id(incident_id, org_id)
     if not incident:
       raise HTTPException(status_code=404, detail="Incident not found")
+    self._check_version(incident, expected_version)
 
-    if not can_transition(incident.status, data.new_state):
+    if not get_workflow(org_id).can_transition(incident.status, data.new_state):
       raise HTTPException(status_code=400, detail=f"Invalid transition from {incident.status} to {data.new_state}")
 
     old_state = incident.status
@@ -82,8 +128,11 @@ class IncidentService:
     elif data.new_state == IncidentStatus.INVESTIGATING:
       incident.resolved_at = None
 
-    self.repo.flush()
-    self.repo.refresh(incident)
+    # Leaving DETECTED acknowledges the incident; a workflow that sends it back restarts the clock
+    if data.new_state == IncidentStatus.DETECTED:
+      incident.sla_deadline = self.sla.deadline_for(org_id, incident.severity, datetime.now(timezone.utc))
+    else:
+      incident.sla_deadline = None
 
     audit = models.IncidentEvent(
       incident_id=incident.id,
@@ -95,13 +144,15 @@ class IncidentService:
       comment=data.comment or f"State changed from {old_state} to {data.new_state}"
     )
     self.repo.add_event(audit)
-    self._commit()
+    self._commit(org_id)
     return incident
 
-  def update_incident(self, incident_id: UUID, data: schemas.IncidentUpdate, user: models.User, org_id: UUID):
-    incident = self.repo.get_by_id(incident_id, org_id)
+  def update_incident(self, incident_id: UUID, data: schemas.IncidentUpdate, user: models.User, org_id: UUID,
+                      expected_version: Optional[int] = None):
+    incident = self.repo.get_by_id(incident_id, org_id, with_description=True)
     if not incident:
       raise HTTPException(status_code=404, detail="Incident not found")
+    self._check_version(incident, expected_version)
 
     changes = []
 
@@ -109,6 +160,8 @@ class IncidentService:
       old_severity = incident.severity.value if hasattr(incident.severity, "value") else str(incident.severity)
       changes.append(("SEVERITY_CHANGE", old_severity, data.severity.value))
       incident.severity = data.severity
+      if incident.sla_deadline is not None:
+        incident.sla_deadline = self.sla.deadline_for(org_id, data.severity, incident.created_at)
 
     if data.owner_id and data.owner_id != incident.owner_id:
       if user.role not in ["ADMIN", "MANAGER"]:
@@ -116,9 +169,6 @@ class IncidentService:
       changes.append(("OWNER_CHANGE", str(incident.owner_id), str(data.owner_id)))
       incident.owner_id = data.owner_id
 
-    self.repo.flush()
-    self.repo.refresh(incident)
-
     for event_type, old_val, new_val in changes:
       audit = models.IncidentEvent(
         incident_id=incident.id,
@@ -131,7 +181,7 @@ class IncidentService:
       )
       self.repo.add_event(audit)
 
-    self._commit()
+    self._commit(org_id)
     return incident
 
   def delete_incident(self, incident_id: UUID, user: models.User, org_id: UUID):
@@ -143,7 +193,7 @@ class IncidentService:
       raise HTTPException(status_code=403, detail="Not authorized to delete incidents")
 
     self.repo.delete_entity(incident)
-    self._commit()
+    self._commit(org_id)
     return {"message": "Incident deleted successfully"}
 
   def add_comment(self, incident_id: UUID, data: schemas.CommentRequest, user: models.User, org_id: UUID):
@@ -159,12 +209,24 @@ class IncidentService:
       comment=data.comment
     )
     self.repo.add_event(audit)
-    self._commit()
+    self._commit(org_id)
+    from app.core.tasks import index_incident_similarity
+    index_incident_similarity.delay(str(incident.id))
     return {"message": "Comment added"}
 
-  def get_incident_events(self, incident_id: UUID, org_id: UUID) -> List[models.IncidentEvent]:
-    incident = self.repo.get_by_id(incident_id, org_id)
+  def get_incident_events(self, incident_id: UUID, org_id: UUID) -> Tuple[List[dict], bool]:
+    """The audit timeline, newest first, and whether it is complete (False when the archive could not be read)."""
+    with use_replica(self.db):
+      incident = self.repo.get_by_id(incident_id, org_id)
     if not incident:
       raise HTTPException(status_code=404, detail="Incident not found")
 
-    return self.repo.get_events(incident_id, org_id)
+    events = [row._asdict() for row in self.repo.list_event_summaries(incident_id, org_id)]
+    if incident.events_archived_at is not None:
+      try:
+        # Archived rows are older than anything written since, so they go after the hot ones
+        events.extend(read_event_archive(org_id, incident_id))
+      except (ClientError, BotoCoreError):
+        logger.warning("Event archive of incident %s unavailable; serving hot rows only", incident_id, exc_info=True)
+        return events, False
+    return events, True
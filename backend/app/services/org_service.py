@@ -1,30 +1,33 @@
 # backend/app/services/org_service.py
 
 import os
+from concurrent.futures import ThreadPoolExecutor
 from uuid import UUID
+from typing import List, Tuple
 from sqlalchemy.orm import Session
 from fastapi import HTTPException
 from app.db import models
 from app.repositories.user_repo import UserRepository
-from supabase import create_client, Client
+from app.core.cache import bump_org_version
+from app.core.supabase_admin import get_supabase_admin
+
+# Invitations sent to Supabase at once by a bulk invite
+INVITE_CONCURRENCY = int(os.getenv("INVITE_CONCURRENCY", "8"))
 
 class OrganizationService:
   def __init__(self, db: Session):
     self.db = db
     self.repo = UserRepository(db)
-    self.supabase_url = os.getenv("SUPABASE_URL")
-    self.supabase_key = os.getenv("SUPABASE_KEY")
-    self.supabase = None
 
-    if self.supabase_url and self.supabase_key:
-      try:
-        self.supabase: Client = create_client(self.supabase_url, self.supabase_key)
-      except Exception as e:
-        print(f"Warning: Failed to initialize Supabase client: {e}")
-        self.supabase = None
+  def _supabase(self):
+    supabase = get_supabase_admin()
+    if supabase is None:
+      raise HTTPException(status_code=501, detail="Supabase credentials not configured")
+    return supabase
 
-  def _commit(self):
+  def _commit(self, org_id: UUID):
     self.db.commit()
+    bump_org_version(org_id)
 
   def get_org(self, org_id: UUID):
     org = self.repo.get_org(org_id)
@@ -62,7 +65,7 @@ class OrganizationService:
         organization_id=new_org.id
       )
       self.repo.add(new_user)
-      self._commit()
+      self._commit(new_org.id)
       self.db.refresh(new_org)
       self.db.refresh(new_user)
 
@@ -76,11 +79,10 @@ class OrganizationService:
       raise HTTPException(status_code=400, detail=f"Registration failed: {str(e)}")
 
   def invite_user(self, email: str, role: str, org_id: UUID):
-    if not self.supabase:
-      raise HTTPException(status_code=501, detail="Supabase credentials not configured")
+    supabase = self._supabase()
 
     try:
-      response = self.supabase.auth.admin.invite_user_by_email(email)
+      response = supabase.auth.admin.invite_user_by_email(email)
       user_id = response.user.id
     except Exception as e:
       raise HTTPException(status_code=400, detail=f"Supabase User invitation failed: {str(e)}")
@@ -94,8 +96,56 @@ class OrganizationService:
         organization_id=org_id
       )
       self.repo.add(new_user)
-      self._commit()
+      self._commit(org_id)
       return new_user.id
     except Exception as e:
       self.db.rollback()
       raise HTTPException(status_code=400, detail=f"Failed to create local user record: {str(e)}")
+
+  def invite_users(self, invites: List[Tuple[str, str]], org_id: UUID) -> dict:
+    """
+    Invites (email, role) pairs: Supabase invitations go out INVITE_CONCURRENCY at a time,
+    then every accepted invite gets its local User row in a single transaction.
+    Per-email failures are reported instead of failing the batch.
+    """
+    supabase = self._supabase()
+    failed = []
+    pending = {}
+    for email, role in invites:
+      key = email.lower()
+      if key in pending:
+        continue
+      if role not in models.UserRole.__members__ or role == models.UserRole.BOT:
+        failed.append({"email": email, "error": f"Invalid role: {role}"})
+        continue
+      pending[key] = (email, role)
+
+    for email in self.repo.find_existing_emails(list(pending)):
+      failed.append({"email": pending.pop(email)[0], "error": "User already exists"})
+
+    def send(email: str):
+      return supabase.auth.admin.invite_user_by_email(email).user.id
+
+    users = []
+    with ThreadPoolExecutor(max_workers=max(1, min(INVITE_CONCURRENCY, len(pending)))) as pool:
+      futures = [(email, role, pool.submit(send, email)) for email, role in pending.values()]
+      for email, role, future in futures:
+        try:
+          user_id = future.result()
+        except Exception as e:
+          failed.append({"email": email, "error": f"Supabase User invitation failed: {str(e)}"})
+          continue
+        users.append(models.User(id=user_id, email=email, full_name="temp", role=role, organization_id=org_id))
+
+    if users:
+      try:
+        self.repo.add_all(users)
+        self._commit(org_id)
+      except Exception as e:
+        self.db.rollback()
+        raise HTTPException(status_code=400, detail=f"Failed to create local user records: {str(e)}")
+
+    return {
+      "invited": [{"email": user.email, "user_id": user.id} for user in users],
+      "failed": failed,
+    }
@@ -4,13 +4,18 @@ from sqlalchemy.orm import Session
 
 from app.repositories.incident_repo import IncidentRepository
 from app.services.ai_service import AIService, AIServiceConfigError, AIServiceError
+from app.core.cache import bump_org_version
+from app.db.replicas import use_replica
 
 class PostMortemService:
   def __init__(self, db: Session):
+    self.db = db
     self.incident_repo = IncidentRepository(db)
 
   def get_saved(self, incident_id: UUID, org_id: UUID) -> dict:
-    if not self.incident_repo.get_by_id(incident_id, org_id):
+    with use_replica(self.db):
+      incident = self.incident_repo.get_by_id(incident_id, org_id)
+    if not incident:
       raise HTTPException(status_code=404, detail="Incident not found")
 
     org_str = str(org_id)
@@ -22,7 +27,8 @@ class PostMortemService:
     }
 
   def generate(self, incident_id: UUID, org_id: UUID) -> dict:
-    incident = self.incident_repo.get_by_id(incident_id, org_id)
+    with use_replica(self.db):
+      incident = self.incident_repo.get_by_id(incident_id, org_id, with_description=True)
     if not incident:
       raise HTTPException(status_code=404, detail="Incident not found")
 
@@ -42,6 +48,7 @@ class PostMortemService:
     except AIServiceError as ae:
       raise HTTPException(status_code=502, detail=str(ae)) from ae
 
+    bump_org_version(org_id)
     return {
       "incident_id": inc_str,
       "report_markdown": markdown_report,
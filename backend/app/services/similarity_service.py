@@ -0,0 +1,68 @@
+from uuid import UUID
+from typing import List
+from fastapi import HTTPException
+from sqlalchemy.orm import Session
+
+from app.repositories.incident_repo import IncidentRepository
+from app.repositories.similarity_repo import SimilarityRepository
+
+# Incidents signed per transaction by the backfill
+SIGNATURE_BACKFILL_BATCH = 500
+
+class SimilarityService:
+  def __init__(self, db: Session):
+    self.repo = SimilarityRepository(db)
+    self.incident_repo = IncidentRepository(db)
+    self.db = db
+
+  def index_incident(self, incident_id: UUID) -> bool:
+    """(Re)computes and stores an incident's signature. Runs in the background indexer."""
+    return self.index_incidents([incident_id]) == 1
+
+  def index_incidents(self, incident_ids: List[UUID]) -> int:
+    """Batch form of `index_incident` (imports, backfill): one transaction, returns how many were signed."""
+    sources = self.repo.get_source_texts(incident_ids)
+    if not sources:
+      return 0
+
+    from app.core.similarity import compute_signature, to_bytes # NumPy is only loaded where signatures are used
+    self.repo.upsert_signatures([
+      (incident_id, org_id, to_bytes(compute_signature(texts)))
+      for incident_id, (org_id, texts) in sources.items()
+    ])
+    self.db.commit()
+    return len(sources)
+
+  def backfill_signatures(self, batch_size: int = SIGNATURE_BACKFILL_BATCH) -> int:
+    """Signs every incident that has no signature, newest first, one committed batch at a time."""
+    signed = 0
+    while True:
+      incident_ids = self.repo.list_unsigned_incident_ids(batch_size)
+      if not incident_ids:
+        return signed
+      signed += self.index_incidents(incident_ids)
+
+  def find_similar(self, incident_id: UUID, org_id: UUID, k: int = 5) -> List[dict]:
+    if not self.incident_repo.get_by_id(incident_id, org_id):
+      raise HTTPException(status_code=404, detail="Incident not found")
+
+    from app.core.similarity import compute_signature, similarity_index
+
+    # Pull only signatures written since this process last looked at the org
+    since = similarity_index.refresh_since(org_id)
+    similarity_index.upsert(org_id, self.repo.list_signatures_since(org_id, since))
+
+    signature = similarity_index.get(org_id, incident_id)
+    if signature is None:
+      # Indexer has not caught up with this incident yet; sign it on the fly
+      _, texts = self.repo.get_source_text(incident_id)
+      signature = compute_signature(texts)
+
+    matches = similarity_index.top_k(org_id, signature, k, exclude=incident_id)
+    rows = {row.id: row for row in self.repo.list_summaries_by_ids(org_id, [i for i, _ in matches])}
+
+    deleted = [i for i, _ in matches if i not in rows]
+    if deleted:
+      similarity_index.remove(org_id, deleted)
+
+    return [{**rows[i]._asdict(), "score": round(score, 3)} for i, score in matches if i in rows]
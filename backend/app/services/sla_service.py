@@ -0,0 +1,165 @@
+# backend/app/services/sla_service.py
+
+import os
+import logging
+import threading
+import time
+from uuid import UUID
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Tuple
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+
+from app.db import models
+from app.db.models import IncidentSeverity
+from app.repositories.sla_repo import SlaRepository
+from app.core.fsm import IncidentStatus, get_workflow
+from app.core.cache import bump_org_version
+
+logger = logging.getLogger(__name__)
+
+# Response-time targets for severities an org has not configured
+DEFAULT_SLA_THRESHOLDS: Dict[IncidentSeverity, timedelta] = {
+  IncidentSeverity.SEV1: timedelta(minutes=60),
+  IncidentSeverity.SEV2: timedelta(minutes=120),
+  IncidentSeverity.SEV3: timedelta(hours=4),
+  IncidentSeverity.SEV4: timedelta(hours=24),
+}
+# Incidents escalated per transaction by the scheduler
+SLA_BATCH_SIZE = int(os.getenv("SLA_BATCH_SIZE", "200"))
+# Policies are read on every incident create; other workers pick up a changed policy within this window
+SLA_POLICY_CACHE_SECONDS = float(os.getenv("SLA_POLICY_CACHE_SECONDS", "30"))
+
+_policy_cache: Dict[UUID, Tuple[float, Dict[IncidentSeverity, int]]] = {}
+_policy_cache_lock = threading.Lock()
+
+def _as_utc(value: datetime) -> datetime:
+  return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+class SlaService:
+  def __init__(self, db: Session):
+    self.repo = SlaRepository(db)
+    self.db = db
+
+  # --- Policies ---
+
+  def _policy_minutes(self, org_id: UUID) -> Dict[IncidentSeverity, int]:
+    now = time.monotonic()
+    with _policy_cache_lock:
+      entry = _policy_cache.get(org_id)
+    if entry is not None and entry[0] > now:
+      return entry[1]
+    configured = self.repo.get_policy_minutes(org_id)
+    with _policy_cache_lock:
+      _policy_cache[org_id] = (now + SLA_POLICY_CACHE_SECONDS, configured)
+    return configured
+
+  def get_thresholds(self, org_id: UUID) -> Dict[IncidentSeverity, timedelta]:
+    """The org's effective target for every severity (its own policies over the defaults)."""
+    configured = self._policy_minutes(org_id)
+    return {
+      severity: timedelta(minutes=configured[severity]) if severity in configured else default
+      for severity, default in DEFAULT_SLA_THRESHOLDS.items()
+    }
+
+  def list_policies(self, org_id: UUID) -> List[dict]:
+    configured = self.repo.get_policy_minutes(org_id)
+    return [
+      {
+        "severity": severity.value,
+        "response_minutes": configured.get(severity, int(default.total_seconds() // 60)),
+        "is_default": severity not in configured,
+      }
+      for severity, default in DEFAULT_SLA_THRESHOLDS.items()
+    ]
+
+  def set_policy(self, org_id: UUID, severity: IncidentSeverity, response_minutes: Optional[int]) -> List[dict]:
+    """
+    Sets (or, with None, resets to the default) one severity's target and re-times the
+    deadlines of that severity's incidents that are still waiting to be acknowledged.
+    """
+    if response_minutes is None:
+      self.repo.delete_policy(org_id, severity)
+      threshold = DEFAULT_SLA_THRESHOLDS[severity]
+    else:
+      self.repo.upsert_policy(org_id, severity, response_minutes)
+      threshold = timedelta(minutes=response_minutes)
+
+    self.repo.set_deadlines([
+      {"id": row.id, "sla_deadline": _as_utc(row.created_at) + threshold}
+      for row in self.repo.list_pending(org_id, severity)
+    ])
+    self.db.commit()
+    with _policy_cache_lock:
+      _policy_cache.pop(org_id, None)
+    bump_org_version(org_id)
+    return self.list_policies(org_id)
+
+  # --- Deadlines ---
+
+  def deadline_for(self, org_id: UUID, severity: IncidentSeverity, start: datetime) -> datetime:
+    return _as_utc(start) + self.get_thresholds(org_id)[IncidentSeverity(severity)]
+
+  def escalate_due(self, now: Optional[datetime] = None) -> List[dict]:
+    """
+    Escalates every incident whose SLA deadline has passed, SLA_BATCH_SIZE per transaction.
+    Returns one alert per breach: {"incident_id", "title", "severity", "recipients"}.
+    """
+    now = now or datetime.now(timezone.utc)
+    alerts: List[dict] = []
+    while True:
+      due = self.repo.claim_due(now, SLA_BATCH_SIZE)
+      if not due:
+        return alerts
+      breaches = [self._breach(incident, now) for incident in due]
+      try:
+        self.db.commit()
+      except StaleDataError:
+        # A user acknowledged one of them mid-batch; their change wins and the rest is retried next tick
+        self.db.rollback()
+        logger.info("SLA batch lost a race with an incident update; retrying on the next run")
+        return alerts
+      for org_id in {incident.organization_id for incident in due}:
+        bump_org_version(org_id)
+      alerts.extend(self._with_recipients(due, breaches))
+      if len(due) < SLA_BATCH_SIZE:
+        return alerts
+
+  def _breach(self, incident: models.Incident, now: datetime) -> dict:
+    severity = IncidentSeverity(incident.severity)
+    overdue = now - _as_utc(incident.sla_deadline)
+    old_status = incident.status
+    # Orgs whose workflow has no DETECTED -> ESCALATED edge still get the breach recorded
+    escalate = get_workflow(incident.organization_id).can_transition(old_status, IncidentStatus.ESCALATED)
+    if escalate:
+      incident.status = IncidentStatus.ESCALATED
+    incident.sla_deadline = None
+
+    self.db.add(models.IncidentEvent(
+      incident_id=incident.id,
+      actor_id=None, # System action
+      organization_id=incident.organization_id,
+      event_type="SLA_BREACH",
+      old_value=old_status,
+      new_value=IncidentStatus.ESCALATED if escalate else old_status,
+      comment=f"{'Auto-escalated' if escalate else 'SLA breached'}: {severity.value} incident was not acknowledged "
+              f"within its SLA ({int(overdue.total_seconds())}s past the deadline)."
+    ))
+    return {"incident_id": str(incident.id), "title": incident.title, "severity": severity.value}
+
+  def _with_recipients(self, incidents: List[models.Incident], breaches: List[dict]) -> List[dict]:
+    rows = self.repo.find_recipients(
+      {i.owner_id for i in incidents if i.owner_id}, {i.organization_id for i in incidents}
+    )
+    emails = {row.id: row.email for row in rows}
+    admins: Dict[UUID, List[str]] = {}
+    for row in rows:
+      if row.role == models.UserRole.ADMIN:
+        admins.setdefault(row.organization_id, []).append(row.email)
+
+    for incident, breach in zip(incidents, breaches):
+      recipients = set(admins.get(incident.organization_id, []))
+      if incident.owner_id in emails:
+        recipients.add(emails[incident.owner_id])
+      breach["recipients"] = sorted(recipients)
+    return breaches
@@ -3,17 +3,19 @@ from fastapi import HTTPException
 from sqlalchemy.orm import Session
 from app.schemas import user as schemas
 from app.repositories.user_repo import UserRepository
+from app.core.cache import bump_org_version
 
 class UserService:
   def __init__(self, db: Session):
     self.repo = UserRepository(db)
     self.db = db
 
-  def _commit(self):
+  def _commit(self, org_id: UUID):
     self.db.commit()
+    bump_org_version(org_id)
 
   def list_users(self, org_id: UUID):
-    return self.repo.list_all(org_id)
+    return [row._asdict() for row in self.repo.list_summaries(org_id)]
 
   def update_role(self, user_id: UUID, role_update: schemas.RoleUpdate, current_user_id: UUID, org_id: UUID):
     user = self.repo.get_by_id(user_id, org_id)
@@ -26,7 +28,7 @@ class UserService:
     user.role = role_update.role
     self.repo.flush()
     self.repo.refresh(user)
-    self._commit()
+    self._commit(org_id)
     return user
 
   def delete_user(self, user_id: UUID, current_user_id: UUID, org_id: UUID):
@@ -38,4 +40,4 @@ class UserService:
       raise HTTPException(status_code=404, detail="User not found")
 
     self.repo.delete_entity(user)
-    self._commit()
+    self._commit(org_id)
@@ -0,0 +1,340 @@
+# backend/benchmarks/bench_api.py
+#
+# Load test of the hot API endpoints and worker tasks against a seeded synthetic dataset.
+# Concurrent clients drive the app in-process over ASGI; each scenario reports throughput,
+# p50/p95/p99 latency and SQL statements per request. Results can be saved as a JSON baseline
+# and compared against one (CI does this on every push).
+# Run from backend/:
+#   python -m benchmarks.bench_api [--incidents 2000 --requests 200 --concurrency 8]
+#   python -m benchmarks.bench_api --output benchmarks/bench_api_baseline.json   # refresh the baseline
+#   python -m benchmarks.bench_api --compare benchmarks/bench_api_baseline.json  # exit 1 on regression
+#   python -m benchmarks.bench_api --database-url postgresql://...                # seed a throwaway Postgres instead
+
+import argparse
+import asyncio
+import contextvars
+import itertools
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+# Statements issued while serving the current request (or worker task); None outside one
+_statements = contextvars.ContextVar("bench_statements", default=None)
+
+
+def configure(database_url: str) -> None:
+  """Must run before anything under app/ is imported: the engine, JWT secret and broker are read at import."""
+  os.environ["DATABASE_URL"] = database_url
+  os.environ.setdefault("SUPABASE_JWT_SECRET", "bench-secret")
+  # Tasks are published to an in-memory broker nobody consumes; worker cost is measured separately
+  os.environ["CELERY_BROKER_URL"] = "memory://"
+
+  from sqlalchemy import event
+  from app.db.session import engine
+
+  @event.listens_for(engine, "before_cursor_execute")
+  def _count(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None:
+      statements.append(statement)
+
+
+def seed(orgs: int, users: int, incidents: int, events: int, attachments: int, rng: random.Random) -> dict:
+  """Bulk-inserts the dataset; org 0 is the large tenant the load is aimed at, the others only add rows."""
+  from sqlalchemy import insert
+  from app.db.session import Base, SessionLocal, engine
+  from app.db.models import (
+    Organization, User, Incident, IncidentEvent, IncidentAttachment, IncidentSeverity, IncidentStatus, UserRole,
+  )
+
+  Base.metadata.create_all(bind=engine)
+  run = uuid.uuid4().hex[:8] # Unique names, so a shared database can be seeded more than once
+  now = datetime.now(timezone.utc)
+  statuses = list(IncidentStatus)
+  severities = list(IncidentSeverity)
+  tenant = None
+
+  db = SessionLocal()
+  try:
+    for o in range(orgs):
+      org_id = uuid.uuid4()
+      db.execute(insert(Organization), [{"id": org_id, "name": f"Bench Org {run}-{o}", "slug": f"bench-{run}-{o}"}])
+      user_rows = [{
+        "id": uuid.uuid4(),
+        "email": f"user{u}.{o}.{run}@bench.io",
+        "full_name": f"Bench User {u}",
+        "role": UserRole.ADMIN if u == 0 else UserRole.ENGINEER,
+        "organization_id": org_id,
+      } for u in range(users)]
+      db.execute(insert(User), user_rows)
+
+      incident_rows, event_rows, attachment_rows = [], [], []
+      for i in range(incidents if o == 0 else max(1, incidents // 10)):
+        created_at = now - timedelta(minutes=rng.randrange(90 * 24 * 60))
+        status = statuses[i % len(statuses)]
+        owner = rng.choice(user_rows)["id"]
+        incident_id = uuid.uuid4()
+        incident_rows.append({
+          "id": incident_id,
+          "title": f"Incident {i}: elevated 5xx on service-{i % 40}",
+          "description": "Error rate above threshold after deploy. " * 10,
+          "severity": severities[i % len(severities)],
+          "status": status,
+          "owner_id": owner,
+          "created_at": created_at,
+          "updated_at": created_at,
+          "resolved_at": created_at + timedelta(minutes=rng.randrange(5, 600))
+            if status in (IncidentStatus.RESOLVED, IncidentStatus.CLOSED) else None,
+          "sla_deadline": now + timedelta(days=1) if status == IncidentStatus.DETECTED else None,
+          "organization_id": org_id,
+        })
+        for e in range(events):
+          event_rows.append({
+            "id": uuid.uuid4(),
+            "incident_id": incident_id,
+            "actor_id": owner,
+            "event_type": "CREATION" if e == 0 else ("COMMENT" if e % 2 else "STATUS_CHANGE"),
+            "old_value": None,
+            "new_value": status.value,
+            "comment": f"Update {e} from on-call" if e % 2 else None,
+            "created_at": created_at + timedelta(minutes=e),
+            "organization_id": org_id,
+          })
+        for a in range(attachments):
+          attachment_rows.append({
+            "id": uuid.uuid4(),
+            "incident_id": incident_id,
+            "file_name": f"trace-{a}.log",
+            "file_key": f"orgs/{org_id}/incidents/{incident_id}/{uuid.uuid4()}-trace-{a}.log",
+            "uploaded_by": owner,
+            "organization_id": org_id,
+          })
+      db.execute(insert(Incident), incident_rows)
+      if event_rows:
+        db.execute(insert(IncidentEvent), event_rows)
+      if attachment_rows:
+        db.execute(insert(IncidentAttachment), attachment_rows)
+      if o == 0:
+        tenant = {"users": user_rows, "incident_ids": [row["id"] for row in incident_rows]}
+    db.commit()
+  finally:
+    db.close()
+  return tenant
+
+
+def token(user: dict) -> str:
+  from jose import jwt
+  return jwt.encode({"sub": str(user["id"]), "email": user["email"]}, os.environ["SUPABASE_JWT_SECRET"], algorithm="HS256")
+
+
+def counting(asgi_app):
+  """Wraps the ASGI app so every response carries the number of SQL statements it took in `x-bench-queries`."""
+  async def wrapped(scope, receive, send):
+    if scope["type"] != "http":
+      return await asgi_app(scope, receive, send)
+    statements = []
+    reset = _statements.set(statements) # Sync endpoints run in a threadpool that copies this context
+
+    async def send_with_count(message):
+      if message["type"] == "http.response.start":
+        message = {**message, "headers": [*message.get("headers", []), (b"x-bench-queries", str(len(statements)).encode())]}
+      await send(message)
+
+    try:
+      await asgi_app(scope, receive, send_with_count)
+    finally:
+      _statements.reset(reset)
+  return wrapped
+
+
+def percentile(values, p: float) -> float:
+  ordered = sorted(values)
+  return ordered[min(len(ordered) - 1, int(round(p / 100 * (len(ordered) - 1))))]
+
+
+def summarize(latencies, queries, errors: int, elapsed: float) -> dict:
+  return {
+    "requests": len(latencies),
+    "errors": errors,
+    "rps": round(len(latencies) / elapsed, 1),
+    "p50_ms": round(percentile(latencies, 50) * 1000, 2),
+    "p95_ms": round(percentile(latencies, 95) * 1000, 2),
+    "p99_ms": round(percentile(latencies, 99) * 1000, 2),
+    "queries_p50": percentile(queries, 50),
+    "queries_max": max(queries),
+  }
+
+
+async def drive(client, make_request, requests: int, concurrency: int, on_response=None) -> dict:
+  """`concurrency` clients issue `requests` requests in total, each as soon as its previous one returned."""
+  latencies, queries, errors = [], [], 0
+  counter = itertools.count()
+
+  async def user():
+    nonlocal errors
+    while (i := next(counter)) < requests:
+      method, url, body, headers = make_request(i)
+      started = time.perf_counter()
+      response = await client.request(method, url, json=body, headers=headers)
+      latencies.append(time.perf_counter() - started)
+      queries.append(int(response.headers.get("x-bench-queries", 0)))
+      errors += response.status_code >= 400
+      if on_response and response.status_code < 400:
+        on_response(response)
+
+  started = time.perf_counter()
+  await asyncio.gather(*(user() for _ in range(concurrency)))
+  return summarize(latencies, queries, errors, time.perf_counter() - started)
+
+
+def scenarios(tenant: dict, rng: random.Random):
+  """(name, request factory, response hook) in run order; transitions act on the incidents the create scenario made."""
+  admin = {"Authorization": f"Bearer {token(tenant['users'][0])}"}
+  engineers = [{"Authorization": f"Bearer {token(u)}"} for u in tenant["users"][1:]] or [admin]
+  incident_ids = tenant["incident_ids"]
+  created = []
+  severities = ("SEV1", "SEV2", "SEV3", "SEV4")
+
+  return [
+    ("GET /incidents/", lambda i: ("GET", "/api/v1/incidents/", None, engineers[i % len(engineers)]), None),
+    ("GET /incidents/{id}/events", lambda i: (
+      "GET", f"/api/v1/incidents/{rng.choice(incident_ids)}/events", None, engineers[i % len(engineers)]
+    ), None),
+    ("GET /admin/stats", lambda i: ("GET", "/api/v1/admin/stats", None, admin), None),
+    ("GET /admin/charts", lambda i: ("GET", "/api/v1/admin/charts?days=30", None, admin), None),
+    ("POST /incidents/", lambda i: ("POST", "/api/v1/incidents/", {
+      "title": f"Load test incident {i}", "description": "Synthetic", "severity": severities[i % len(severities)],
+    }, engineers[i % len(engineers)]), lambda response: created.append(response.json()["id"])),
+    ("POST /incidents/{id}/transition", lambda i: (
+      "POST", f"/api/v1/incidents/{created[i]}/transition", {"new_state": "INVESTIGATING"}, engineers[i % len(engineers)]
+    ), None),
+  ]
+
+
+async def run_api(tenant: dict, requests: int, concurrency: int, rng: random.Random) -> dict:
+  import httpx
+  from app.main import app
+
+  results = {}
+  transport = httpx.ASGITransport(app=counting(app))
+  async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+    for name, make_request, on_response in scenarios(tenant, rng):
+      if name.startswith("GET"):
+        method, url, _, headers = make_request(0)
+        await client.request(method, url, headers=headers) # Warm lazy imports and caches
+      results[name] = await drive(client, make_request, requests, concurrency, on_response)
+  return results
+
+
+def run_workers(tenant: dict, tasks_per_scenario: int, rng: random.Random) -> dict:
+  """Worker tasks executed in this process, one at a time, as a single worker process would."""
+  from app.core import tasks
+
+  plan = [
+    ("task check_sla_breaches", lambda i: tasks.check_sla_breaches.apply()),
+    ("task index_incident_similarity", lambda i: tasks.index_incident_similarity.apply(
+      args=[str(rng.choice(tenant["incident_ids"]))]
+    )),
+  ]
+  results = {}
+  for name, run in plan:
+    run(0) # Warm-up
+    latencies, queries, errors = [], [], 0
+    started = time.perf_counter()
+    for i in range(tasks_per_scenario):
+      statements = []
+      reset = _statements.set(statements)
+      t0 = time.perf_counter()
+      try:
+        errors += run(i).failed()
+      finally:
+        latencies.append(time.perf_counter() - t0)
+        _statements.reset(reset)
+      queries.append(len(statements))
+    results[name] = summarize(latencies, queries, errors, time.perf_counter() - started)
+  return results
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list:
+  """
+  Regressions against a baseline: any errors, more statements per request than recorded in the median
+  or the worst request (exact, so N+1s fail), or p95 latency above baseline * (1 + tolerance). Tolerance is loose because runners differ in speed.
+  """
+  failures = []
+  for name, base in baseline["scenarios"].items():
+    current = results.get(name)
+    if current is None:
+      failures.append(f"{name}: not measured")
+      continue
+    if current["errors"]:
+      failures.append(f"{name}: {current['errors']} failed requests")
+    # Both the typical and the worst request: an N+1 on some pages only moves the max
+    for stat in ("queries_p50", "queries_max"):
+      if current[stat] > base[stat]:
+        failures.append(f"{name}: {stat} {current[stat]} statements per request (baseline {base[stat]})")
+    if current["p95_ms"] > base["p95_ms"] * (1 + tolerance):
+      failures.append(f"{name}: p95 {current['p95_ms']}ms (baseline {base['p95_ms']}ms, tolerance {tolerance:.0%})")
+  return failures
+
+
+def main():
+  parser = argparse.ArgumentParser(description="API and worker load test")
+  parser.add_argument("--database-url", help="Database to seed and query (default: a temporary SQLite file)")
+  parser.add_argument("--orgs", type=int, default=3)
+  parser.add_argument("--users", type=int, default=20, help="Users per org; the first one is the admin")
+  parser.add_argument("--incidents", type=int, default=2000, help="Incidents in the main tenant (others get a tenth)")
+  parser.add_argument("--events", type=int, default=5, help="Audit events per incident")
+  parser.add_argument("--attachments", type=int, default=1, help="Attachments per incident")
+  parser.add_argument("--requests", type=int, default=200, help="Requests per API scenario")
+  parser.add_argument("--concurrency", type=int, default=8)
+  parser.add_argument("--tasks", type=int, default=50, help="Runs per worker task scenario")
+  parser.add_argument("--seed", type=int, default=7)
+  parser.add_argument("--output", help="Write results as a JSON baseline to this path")
+  parser.add_argument("--compare", help="Baseline JSON to compare against; exits 1 on regression")
+  parser.add_argument("--latency-tolerance", type=float, default=1.0, help="Allowed p95 growth over the baseline (1.0 = 2x)")
+  args = parser.parse_args()
+
+  with tempfile.TemporaryDirectory() as tmp:
+    configure(args.database_url or f"sqlite:///{os.path.join(tmp, 'bench_api.db')}")
+    rng = random.Random(args.seed)
+    started = time.perf_counter()
+    tenant = seed(args.orgs, args.users, args.incidents, args.events, args.attachments, rng)
+    print(f"seeded {args.orgs} orgs, {args.incidents} incidents in the main tenant in {time.perf_counter() - started:.1f}s")
+
+    results = asyncio.run(run_api(tenant, args.requests, args.concurrency, rng))
+    results.update(run_workers(tenant, args.tasks, rng))
+
+    from app.db.session import engine
+    engine.dispose()
+
+  print(f"{'scenario':34} {'req/s':>8} {'p50 ms':>8} {'p95 ms':>8} {'p99 ms':>8} {'queries':>8} {'errors':>7}")
+  for name, r in results.items():
+    print(f"{name:34} {r['rps']:8.1f} {r['p50_ms']:8.2f} {r['p95_ms']:8.2f} {r['p99_ms']:8.2f} {r['queries_p50']:8} {r['errors']:7}")
+
+  config = {k: getattr(args, k) for k in ("orgs", "users", "incidents", "events", "attachments", "requests", "concurrency", "tasks")}
+  if args.output:
+    with open(args.output, "w") as f:
+      json.dump({"config": config, "scenarios": results}, f, indent=2)
+      f.write("\n")
+    print(f"wrote {args.output}")
+
+  if args.compare:
+    with open(args.compare) as f:
+      baseline = json.load(f)
+    if baseline.get("config") != config:
+      print(f"note: baseline was recorded with {baseline.get('config')}")
+    failures = compare(results, baseline, args.latency_tolerance)
+    for failure in failures:
+      print(f"REGRESSION {failure}")
+    if failures:
+      sys.exit(1)
+    print(f"no regressions against {args.compare}")
+
+
+if __name__ == "__main__":
+  main()
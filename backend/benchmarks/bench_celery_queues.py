@@ -0,0 +1,113 @@
+# backend/benchmarks/bench_celery_queues.py
+#
+# Alert latency behind a flood of SLA sweeps, with every task on one queue vs. the routed queues
+# from app/core/celery_app.py, plus raw broker throughput. Uses Celery's in-memory broker and
+# in-process solo workers, so it needs neither Redis nor a running worker.
+# Run from backend/:  python -m benchmarks.bench_celery_queues [--sweeps 400 --alerts 20]
+
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+import statistics
+import time
+from contextlib import ExitStack
+
+from celery import Celery
+from celery.contrib.testing.worker import start_worker
+from kombu import Queue
+
+
+SWEEP_SECONDS = 0.005
+
+
+def make_app(routed: bool) -> Celery:
+  """A throwaway app with the same queue split as app/core/celery_app.py for an alert and a sweep task."""
+  bench = Celery("bench", broker="memory://", backend=None, set_as_current=False)
+  bench.conf.update(
+    task_ignore_result=True,
+    worker_prefetch_multiplier=1,
+    broker_connection_retry_on_startup=True,
+    broker_transport_options={"polling_interval": 0.001}, # The memory transport polls (Redis blocks); 1s default would dominate
+  )
+  if routed:
+    bench.conf.task_queues = [Queue("alerts"), Queue("sla")]
+    bench.conf.task_default_queue = "sla"
+    bench.conf.task_routes = {"bench.alert": {"queue": "alerts"}, "bench.sweep": {"queue": "sla"}}
+  else:
+    bench.conf.task_default_queue = "celery"
+
+  started = {}
+
+  @bench.task(name="bench.alert")
+  def alert(i, queued_at):
+    started[i] = time.perf_counter() - queued_at
+
+  @bench.task(name="bench.sweep")
+  def sweep():
+    time.sleep(SWEEP_SECONDS)
+
+  @bench.task(name="bench.noop")
+  def noop(i):
+    started[i] = time.perf_counter()
+
+  bench.started = started
+  return bench
+
+
+def alert_latency(routed: bool, sweeps: int, alerts: int, workers: int):
+  bench = make_app(routed)
+  with ExitStack() as stack:
+    for n in range(workers):
+      # Same number of workers either way; routed, the first one is dedicated to alerts
+      queues = (["alerts"] if n == 0 else ["sla"]) if routed else ["celery"]
+      stack.enter_context(start_worker(bench, pool="solo", queues=queues, perform_ping_check=False))
+
+    for _ in range(sweeps):
+      bench.tasks["bench.sweep"].delay()
+    for i in range(alerts):
+      bench.tasks["bench.alert"].delay(i, time.perf_counter())
+
+    deadline = time.perf_counter() + 60
+    while len(bench.started) < alerts and time.perf_counter() < deadline:
+      time.sleep(0.005)
+  return sorted(bench.started.values())
+
+
+def throughput(tasks: int) -> float:
+  bench = make_app(routed=False)
+  with start_worker(bench, pool="solo", perform_ping_check=False):
+    t0 = time.perf_counter()
+    for i in range(tasks):
+      bench.tasks["bench.noop"].delay(i)
+    while len(bench.started) < tasks:
+      time.sleep(0.005)
+    return tasks / (time.perf_counter() - t0)
+
+
+def isolated(fn, *args):
+  # Memory-broker state is process-global and stopped test workers are not fully torn down,
+  # so every scenario runs in a fresh interpreter
+  with ProcessPoolExecutor(max_workers=1, mp_context=multiprocessing.get_context("spawn")) as pool:
+    return pool.submit(fn, *args).result()
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Celery queue routing benchmark (in-memory broker)")
+  parser.add_argument("--sweeps", type=int, default=400)
+  parser.add_argument("--alerts", type=int, default=20)
+  parser.add_argument("--workers", type=int, default=2)
+  parser.add_argument("--tasks", type=int, default=2000)
+  args = parser.parse_args()
+
+  print(f"{args.alerts} alerts queued behind {args.sweeps} x {SWEEP_SECONDS * 1000:.0f}ms SLA sweeps, "
+        f"{args.workers} workers")
+  for routed in (False, True):
+    latencies = isolated(alert_latency, routed, args.sweeps, args.alerts, args.workers)
+    label = "routed queues " if routed else "single queue  "
+    print(f"  {label} alert wait p50 {statistics.median(latencies) * 1000:8.1f} ms   max {latencies[-1] * 1000:8.1f} ms")
+
+  print(f"throughput: {isolated(throughput, args.tasks):,.0f} tasks/s ({args.tasks} no-op tasks, memory broker)")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,71 @@
+# backend/benchmarks/bench_import.py
+#
+# Throughput of the bulk incident importer.
+# Run from backend/:  python -m benchmarks.bench_import [--rows 100000]
+
+import argparse
+import io
+import time
+import uuid
+from datetime import datetime, timedelta, timezone
+
+import orjson
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.db.models import Organization, User, UserRole
+from app.services.import_service import ImportService
+
+PATH = ["INVESTIGATING", "MITIGATED", "RESOLVED", "CLOSED"]
+
+
+def build_file(rows: int, users: int) -> bytes:
+  start = datetime(2021, 1, 1, tzinfo=timezone.utc)
+  lines = []
+  for i in range(rows):
+    created = start + timedelta(minutes=17 * i)
+    lines.append(orjson.dumps({
+      "title": f"Imported incident {i}",
+      "description": "Upstream timeout on checkout " * 5,
+      "severity": f"SEV{i % 4 + 1}",
+      "owner_email": f"user{i % users}@bench.io",
+      "created_at": created,
+      "history": [
+        {"at": created + timedelta(minutes=10 * (step + 1)), "status": status, "actor_email": f"user{(i + step) % users}@bench.io"}
+        for step, status in enumerate(PATH)
+      ],
+    }))
+  return b"\n".join(lines)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="Bulk import benchmark")
+  parser.add_argument("--rows", type=int, default=20_000)
+  parser.add_argument("--users", type=int, default=50)
+  args = parser.parse_args()
+
+  engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+  Base.metadata.create_all(bind=engine)
+  db = sessionmaker(bind=engine, expire_on_commit=False)()
+  org = Organization(id=uuid.uuid4(), name="Bench Org", slug="bench-org")
+  db.add(org)
+  db.add_all([
+    User(id=uuid.uuid4(), email=f"user{n}@bench.io", full_name=f"User {n}", role=UserRole.ENGINEER, organization_id=org.id)
+    for n in range(args.users)
+  ])
+  db.commit()
+
+  payload = build_file(args.rows, args.users)
+  start = time.perf_counter()
+  report = ImportService(db).import_stream(io.BytesIO(payload), "jsonl", org.id, source="bench")
+  elapsed = time.perf_counter() - start
+
+  assert report.imported == args.rows and report.failed == 0
+  print(f"incidents={report.imported} events={report.events}")
+  print(f"elapsed: {elapsed:8.2f} s  ({report.imported / elapsed:,.0f} incidents/s)")
+
+
+if __name__ == "__main__":
+  main()
@@ -0,0 +1,92 @@
+# backend/benchmarks/bench_list_serialization.py
+#
+# Serialization cost of GET /incidents/ for a large tenant.
+# Run from backend/:  python -m benchmarks.bench_list_serialization [--rows 10000]
+
+import argparse
+import json
+import time
+import uuid
+from typing import List
+
+import orjson
+from pydantic import TypeAdapter
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker, undefer
+from sqlalchemy.pool import StaticPool
+
+from app.db.session import Base
+from app.db.models import Organization, User, Incident, IncidentSeverity, IncidentStatus, UserRole
+from app.schemas.incident import IncidentRead
+from app.services.incident_service import IncidentService
+
+
+def seed(db, rows: int):
+  org = Organization(id=uuid.uuid4(), name="Bench Org", slug="bench-org")
+  owner = User(id=uuid.uuid4(), email="bench@bench.io", full_name="Bench", role=UserRole.ENGINEER, organization_id=org.id)
+  db.add_all([org, owner])
+  statuses = list(IncidentStatus)
+  severities = list(IncidentSeverity)
+  db.add_all([
+    Incident(
+      title=f"Incident {i}",
+      description="Lorem ipsum dolor sit amet " * 20,
+      severity=severities[i % len(severities)],
+      status=statuses[i % len(statuses)],
+      owner_id=owner.id,
+      organization_id=org.id,
+    )
+    for i in range(rows)
+  ])
+  db.commit()
+  return org.id
+
+
+def before(db, org_id) -> bytes:
+  # ORM entities -> response_model validation -> default JSON encoder
+  adapter = TypeAdapter(List[IncidentRead])
+  entities = db.query(Incident).options(undefer(Incident.description)).filter(
+    Incident.organization_id == org_id
+  ).all()
+  validated = adapter.validate_python(entities, from_attributes=True)
+  return json.dumps(adapter.dump_python(validated, mode="json")).encode("utf-8")
+
+
+def after(db, org_id) -> bytes:
+  # Column projection -> plain dicts -> orjson
+  return orjson.dumps(IncidentService(db).list_incidents(org_id))
+
+
+def best_of(fn, db, org_id, repeat: int) -> float:
+  timings = []
+  for _ in range(repeat):
+    db.expunge_all()
+    start = time.perf_counter()
+    fn(db, org_id)
+    timings.append(time.perf_counter() - start)
+  return min(timings)
+
+
+def main():
+  parser = argparse.ArgumentParser(description="GET /incidents/ serialization benchmark")
+  parser.add_argument("--rows", type=int, default=10_000)
+  parser.add_argument("--repeat", type=int, default=5)
+  args = parser.parse_args()
+
+  engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+  Base.metadata.create_all(bind=engine)
+  db = sessionmaker(bind=engine)()
+  org_id = seed(db, args.rows)
+
+  assert len(json.loads(before(db, org_id))) == len(json.loads(after(db, org_id))) == args.rows
+
+  t_before = best_of(before, db, org_id, args.repeat)
+  t_after = best_of(after, db, org_id, args.repeat)
+  print(f"rows={args.rows}")
+  print(f"before (ORM + response_model + json): {t_before * 1000:8.1f} ms")
+  print(f"after  (projection + orjson):         {t_after * 1000:8.1f} ms")
+  print(f"speedup: {t_before / t_after:.1f}x")
+
+
+if __name__ == "__main__":
+  main()
@@ -2,6 +2,7 @@
 
 import os
 import sys
+from contextlib import contextmanager
 import pytest
 from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
@@ -9,11 +10,16 @@ from sqlalchemy.pool import StaticPool
 from fastapi.testclient import TestClient
 from app.main import app
 from app.core.celery_app import celery
-from app.core.tasks import send_incident_alert_email
+from app.core.tasks import send_incident_alert_email, index_incident_similarity, index_incidents_similarity
 from app.db.session import get_db, Base
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
+# Per-request statement/time budgets (@query_budget) and the end-of-run report
+pytest_plugins = ["query_budget"]
+pytest.register_assert_rewrite("query_budget")
+from query_budget import instrument, listen
+
 # Run Celery tasks locally during tests to avoid broker/backend connections.
 celery.conf.task_always_eager = True
 celery.conf.task_eager_propagates = True
@@ -26,7 +32,8 @@ engine = create_engine(
   connect_args={"check_same_thread": False},
   poolclass=StaticPool,
 )
-TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, expire_on_commit=False, bind=engine)
+listen(engine)
 
 # 2. Database Fixture (Handles Transactions)
 @pytest.fixture(scope="function")
@@ -67,7 +74,7 @@ def client():
   """
   Base.metadata.create_all(bind=engine)  # Create tables
   # Run all the tests in the context of TestClient
-  with TestClient(app) as c:
+  with TestClient(instrument(app)) as c:
     yield c
   Base.metadata.drop_all(bind=engine)    # Cleanup after tests are done
 
@@ -78,4 +85,31 @@ def disable_celery_tasks(monkeypatch):
     return None
 
   monkeypatch.setattr(send_incident_alert_email, "delay", _noop)
-  yield
\ No newline at end of file
+  monkeypatch.setattr(send_incident_alert_email, "apply_async", _noop)
+  monkeypatch.setattr(index_incident_similarity, "delay", _noop)
+  monkeypatch.setattr(index_incidents_similarity, "delay", _noop)
+  yield
+
+# 5. SQL statement counter
+@pytest.fixture
+def count_queries():
+  """
+  Returns a context manager that collects every SQL statement sent to the test engine.
+  Savepoint bookkeeping from the db fixture is ignored so counts match production.
+  Use it for exact counts of one block; @query_budget caps every request a test makes.
+  """
+  @contextmanager
+  def _count():
+    statements = []
+
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+      if "SAVEPOINT" not in statement:
+        statements.append(statement)
+
+    event.listen(engine, "before_cursor_execute", _before_cursor_execute)
+    try:
+      yield statements
+    finally:
+      event.remove(engine, "before_cursor_execute", _before_cursor_execute)
+
+  return _count
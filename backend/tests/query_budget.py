@@ -0,0 +1,149 @@
+# backend/tests/query_budget.py
+#
+# Pytest plugin that measures SQL statements and wall time of every request made through the
+# test client, enforces per-test budgets and lists the most expensive endpoints after the run.
+#
+#   @query_budget(3)                                   every request in the test: at most 3 statements
+#   @query_budget(2, endpoint="GET /api/v1/incidents/")  only requests to that route
+#   @query_budget(4, max_ms=200)                       statements and wall time
+#
+# Registered from conftest.py; `pytest --query-report 0` hides the end-of-run report.
+
+import contextvars
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+import pytest
+from sqlalchemy import event
+
+# Statements issued while the test client serves a request; None outside one
+_statements = contextvars.ContextVar("query_budget_statements", default=None)
+
+
+def query_budget(statements: int, endpoint: Optional[str] = None, max_ms: Optional[float] = None):
+  """Marks a test: each request it makes (to `endpoint`, if given) may issue at most `statements` SQL statements."""
+  return pytest.mark.query_budget(statements, endpoint=endpoint, max_ms=max_ms)
+
+
+@dataclass
+class Budget:
+  statements: int
+  endpoint: Optional[str] = None
+  max_ms: Optional[float] = None
+
+
+@dataclass
+class EndpointStats:
+  requests: int = 0
+  statements: int = 0
+  max_statements: int = 0
+  seconds: float = 0.0
+  max_seconds: float = 0.0
+  worst_test: str = ""
+
+
+class QueryRecorder:
+  """Session-wide per-endpoint numbers, plus the budget of the test currently running."""
+
+  def __init__(self):
+    self.endpoints: Dict[str, EndpointStats] = {}
+    self.test_id = ""
+    self._budget: Optional[Budget] = None
+    self._violations: Optional[List[str]] = None
+
+  def observe(self, endpoint: str, statements: List[str], seconds: float) -> None:
+    stats = self.endpoints.setdefault(endpoint, EndpointStats())
+    stats.requests += 1
+    stats.statements += len(statements)
+    stats.seconds += seconds
+    stats.max_seconds = max(stats.max_seconds, seconds)
+    if len(statements) >= stats.max_statements:
+      stats.max_statements = len(statements)
+      stats.worst_test = self.test_id
+
+    budget = self._budget
+    if budget is None or (budget.endpoint and budget.endpoint != endpoint):
+      return
+    if len(statements) > budget.statements:
+      listing = "\n".join(f"    {' '.join(s.split())[:160]}" for s in statements)
+      self._violations.append(f"{endpoint}: {len(statements)} statements (budget {budget.statements})\n{listing}")
+    if budget.max_ms is not None and seconds * 1000 > budget.max_ms:
+      self._violations.append(f"{endpoint}: {seconds * 1000:.0f}ms (budget {budget.max_ms:.0f}ms)")
+
+  @contextmanager
+  def enforce(self, statements: int, endpoint: Optional[str] = None, max_ms: Optional[float] = None):
+    """Applies a budget to requests made inside the block; yields the list of violations."""
+    previous = self._budget, self._violations
+    self._budget, self._violations = Budget(statements, endpoint, max_ms), []
+    try:
+      yield self._violations
+    finally:
+      self._budget, self._violations = previous
+
+  def worst(self, n: int) -> List[tuple]:
+    return sorted(self.endpoints.items(), key=lambda item: (item[1].max_statements, item[1].max_seconds), reverse=True)[:n]
+
+
+recorder = QueryRecorder()
+
+
+def listen(engine) -> None:
+  """Counts statements sent to `engine` while a request is being served (savepoints from the db fixture excluded)."""
+  @event.listens_for(engine, "before_cursor_execute")
+  def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    statements = _statements.get()
+    if statements is not None and "SAVEPOINT" not in statement:
+      statements.append(statement)
+
+
+def instrument(asgi_app):
+  """Wraps the app the test client talks to; endpoints are keyed by method and route template."""
+  async def wrapped(scope, receive, send):
+    if scope["type"] != "http":
+      return await asgi_app(scope, receive, send)
+    statements = []
+    reset = _statements.set(statements) # Sync endpoints run in a threadpool that copies this context
+    started = time.perf_counter()
+    try:
+      await asgi_app(scope, receive, send)
+    finally:
+      _statements.reset(reset)
+      route = scope.get("route")
+      endpoint = f"{scope['method']} {route.path if route else scope['path']}"
+      recorder.observe(endpoint, statements, time.perf_counter() - started)
+  return wrapped
+
+
+def pytest_addoption(parser):
+  parser.addoption("--query-report", type=int, default=10, help="Endpoints to list in the query budget report (0 hides it)")
+
+
+def pytest_configure(config):
+  config.addinivalue_line("markers", "query_budget(statements, endpoint=None, max_ms=None): per-request SQL/time budget")
+
+
+@pytest.hookimpl(wrapper=True)
+def pytest_runtest_call(item):
+  recorder.test_id = item.nodeid
+  marker = item.get_closest_marker("query_budget")
+  if marker is None:
+    return (yield)
+  with recorder.enforce(*marker.args, **marker.kwargs) as violations:
+    result = yield
+  if violations:
+    pytest.fail("Query budget exceeded:\n" + "\n".join(violations), pytrace=False)
+  return result
+
+
+def pytest_terminal_summary(terminalreporter, config):
+  limit = config.getoption("--query-report")
+  if not limit or not recorder.endpoints:
+    return
+  terminalreporter.section("query budget: most expensive endpoints")
+  terminalreporter.write_line(f"{'max sql':>7} {'avg sql':>7} {'max ms':>7} {'avg ms':>7} {'calls':>6}  endpoint  (worst test)")
+  for endpoint, stats in recorder.worst(limit):
+    terminalreporter.write_line(
+      f"{stats.max_statements:>7} {stats.statements / stats.requests:>7.1f} {stats.max_seconds * 1000:>7.1f} "
+      f"{stats.seconds / stats.requests * 1000:>7.1f} {stats.requests:>6}  {endpoint}  ({stats.worst_test})"
+    )
@@ -1,9 +1,15 @@
 import uuid
+from types import SimpleNamespace
+from datetime import datetime, timedelta
 import pytest
+from sqlalchemy import text
 from app.main import app
 from app.api.deps import get_current_user
-from app.db.models import Organization, User, UserRole, Incident, IncidentStatus, IncidentSeverity
+from app.db.models import Organization, User, UserRole, Incident, IncidentEvent, IncidentStatus, IncidentSeverity
 from app.repositories.analytics_repo import AnalyticsRepository
+from app.services.analytics_service import AnalyticsService
+from app.core.distribution import DurationSketch, RELATIVE_ACCURACY
+from query_budget import query_budget
 
 
 @pytest.fixture
@@ -55,6 +61,7 @@ def test_admin_stats_requires_admin(client, auth_override, engineer_user):
   assert response.status_code == 403
 
 
+@query_budget(4, endpoint="GET /api/v1/admin/stats")
 def test_admin_stats_counts(client, db, auth_override, admin_user, test_organization, monkeypatch): # <-- Added monkeypatch here
   other_user = _create_user(db, test_organization.id, UserRole.MANAGER, "mgr@admin.com")
 
@@ -149,4 +156,171 @@ def test_admin_analytics_response(client, db, auth_override, admin_user, test_or
   assert data["mttr_hours"] == 2.0
   # Verify the newly added metrics exist in the response
   assert data["mtta_minutes"] == 30.0 
-  assert isinstance(data["volume_trend"], list)
\ No newline at end of file
+  assert isinstance(data["volume_trend"], list)
+
+def test_admin_analytics_computed_from_raw_tables(client, db, auth_override, admin_user, test_organization):
+  now = datetime.utcnow()
+  resolved = Incident(
+    id=uuid.uuid4(), title="DB failover", description="Primary lost", severity=IncidentSeverity.SEV1,
+    status=IncidentStatus.RESOLVED, owner_id=admin_user.id, organization_id=test_organization.id,
+    created_at=now - timedelta(hours=5), resolved_at=now - timedelta(hours=1),
+  )
+  breached = Incident(
+    id=uuid.uuid4(), title="Queue backlog", description="Lagging", severity=IncidentSeverity.SEV2,
+    status=IncidentStatus.DETECTED, organization_id=test_organization.id, created_at=now - timedelta(hours=2),
+  )
+  too_old = Incident(
+    id=uuid.uuid4(), title="Last quarter", description="Out of window", severity=IncidentSeverity.SEV3,
+    status=IncidentStatus.RESOLVED, organization_id=test_organization.id,
+    created_at=now - timedelta(days=90), resolved_at=now - timedelta(days=80),
+  )
+  db.add_all([resolved, breached, too_old])
+  db.add_all([
+    IncidentEvent(incident_id=resolved.id, event_type="STATUS_CHANGE", new_value="ACKNOWLEDGED",
+                  organization_id=test_organization.id, created_at=now - timedelta(hours=4, minutes=30)),
+    IncidentEvent(incident_id=resolved.id, event_type="STATUS_CHANGE", new_value="RESOLVED",
+                  organization_id=test_organization.id, created_at=now - timedelta(hours=1)),
+    IncidentEvent(incident_id=breached.id, event_type="SLA_BREACH", organization_id=test_organization.id,
+                  created_at=now - timedelta(hours=1)),
+  ])
+  db.commit()
+
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  response = client.get("/api/v1/admin/charts?days=30")
+
+  assert response.status_code == 200
+  data = response.json()
+  assert data["mttr_hours"] == 4.0
+  assert data["mtta_minutes"] == 30.0
+  assert data["total_breaches"] == 1
+  assert data["sla_breach_rate"] == 50.0
+
+
+def test_metrics_view_rows_are_summed_over_the_window(db, test_organization, monkeypatch):
+  # Stand-in for the Postgres materialized view, same columns
+  db.execute(text("""
+    CREATE TEMP TABLE incident_daily_metrics (
+      organization_id TEXT, day DATE, severity TEXT, incidents INT, resolved INT,
+      resolve_seconds FLOAT, acknowledged INT, ack_seconds FLOAT, breached INT
+    )
+  """))
+  today = datetime.utcnow().date()
+  rows = [
+    (today, "SEV1", 2, 2, 7200.0, 2, 600.0, 1),
+    (today - timedelta(days=3), "SEV2", 2, 1, 10800.0, 1, 1200.0, 0),
+    (today - timedelta(days=60), "SEV1", 5, 5, 99999.0, 5, 99999.0, 5),
+  ]
+  for day, severity, *counts in rows:
+    db.execute(text("INSERT INTO incident_daily_metrics VALUES (:org, :day, :sev, :i, :r, :rs, :a, :as_, :b)"), dict(
+      org=str(test_organization.id), day=day, sev=severity, **dict(zip(["i", "r", "rs", "a", "as_", "b"], counts))
+    ))
+  monkeypatch.setattr(AnalyticsRepository, "_uses_metrics_view", lambda self: True)
+  repo = AnalyticsRepository(db)
+
+  assert repo.calculate_mttr_seconds(test_organization.id, days=7) == 6000.0
+  assert repo.calculate_mtta_seconds(test_organization.id, days=7) == 600.0
+  assert repo.calculate_sla_breach_rate(test_organization.id, days=7) == {"total": 4, "breached": 1, "breach_rate": 25.0}
+
+
+def test_charts_read_the_metrics_view_once(db, test_organization, monkeypatch):
+  monkeypatch.setattr(AnalyticsRepository, "_uses_metrics_view", lambda self: True)
+  reads = []
+
+  def daily_metrics(self, org_id, days):
+    reads.append(days)
+    return SimpleNamespace(incidents=4, resolved=2, resolve_seconds=14400.0, acknowledged=2, ack_seconds=3600.0, breached=1)
+
+  monkeypatch.setattr(AnalyticsRepository, "_daily_metrics", daily_metrics)
+
+  charts = AnalyticsService(db).get_analytics_charts(test_organization.id, days=7)
+
+  assert reads == [7]
+  assert (charts.mttr_hours, charts.mtta_minutes) == (2.0, 30.0)
+  assert (charts.sla_breach_rate, charts.total_breaches) == (25.0, 1)
+
+
+def test_duration_distributions(client, db, auth_override, admin_user, engineer_user, test_organization):
+  now = datetime.utcnow()
+  incidents = []
+  # Nine SEV2s resolved in 10..90 minutes by the engineer, one SEV1 outlier taking two days for the admin
+  for i in range(1, 10):
+    incidents.append(Incident(
+      id=uuid.uuid4(), title=f"Blip {i}", description="Flapping", severity=IncidentSeverity.SEV2,
+      status=IncidentStatus.RESOLVED, owner_id=engineer_user.id, organization_id=test_organization.id,
+      created_at=now - timedelta(days=3), resolved_at=now - timedelta(days=3) + timedelta(minutes=10 * i),
+    ))
+  outlier = Incident(
+    id=uuid.uuid4(), title="Region down", description="Everything", severity=IncidentSeverity.SEV1,
+    status=IncidentStatus.RESOLVED, owner_id=admin_user.id, organization_id=test_organization.id,
+    created_at=now - timedelta(days=5), resolved_at=now - timedelta(days=3),
+  )
+  db.add_all([*incidents, outlier])
+  db.add(IncidentEvent(incident_id=outlier.id, event_type="STATUS_CHANGE", new_value="INVESTIGATING",
+                       organization_id=test_organization.id, created_at=outlier.created_at + timedelta(minutes=20)))
+  db.commit()
+
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  response = client.get("/api/v1/admin/charts/distributions?days=30")
+
+  assert response.status_code == 200
+  data = response.json()
+  labels = [b["label"] for b in data["histogram_bins"]]
+  resolve = data["resolve"]
+  assert resolve["overall"]["count"] == 10
+  assert resolve["overall"]["p50_seconds"] == pytest.approx(50 * 60, rel=0.02)
+  assert resolve["overall"]["p99_seconds"] == pytest.approx(2 * 86400, rel=0.02)
+  assert resolve["overall"]["mean_seconds"] > 4 * resolve["overall"]["p50_seconds"] # Skewed by the outlier
+
+  by_severity = {d["severity"]: d for d in resolve["by_severity"]}
+  assert by_severity["SEV2"]["p50_seconds"] == pytest.approx(50 * 60, rel=0.02)
+  assert by_severity["SEV2"]["p90_seconds"] == pytest.approx(90 * 60, rel=0.02)
+  assert dict(zip(labels, by_severity["SEV1"]["histogram"]))["1-3d"] == 1
+  assert sum(by_severity["SEV2"]["histogram"]) == 9
+
+  assert [(o["owner_name"], o["count"]) for o in resolve["by_owner"]] == [(engineer_user.full_name, 9), (admin_user.full_name, 1)]
+
+  acknowledge = data["acknowledge"]
+  assert acknowledge["overall"]["count"] == 1
+  assert acknowledge["overall"]["p50_seconds"] == pytest.approx(20 * 60, rel=0.02)
+  assert [d["severity"] for d in acknowledge["by_severity"]] == ["SEV1"]
+
+
+def test_duration_distributions_empty_window(client, auth_override, admin_user):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  response = client.get("/api/v1/admin/charts/distributions?days=7")
+
+  assert response.status_code == 200
+  overall = response.json()["resolve"]["overall"]
+  assert overall["count"] == 0 and overall["p99_seconds"] == 0.0
+  assert overall["histogram"] == [0] * len(response.json()["histogram_bins"])
+
+
+def test_sketch_percentiles_match_exact_ones_within_accuracy():
+  import numpy as np
+  rng = np.random.default_rng(7)
+  seconds = rng.lognormal(mean=8, sigma=1.5, size=200_000)
+  severities = rng.choice(["SEV1", "SEV2"], size=seconds.size)
+  sketch = DurationSketch()
+  for start in range(0, seconds.size, 10_000): # Chunked, as rows stream in
+    sketch.add(seconds[start:start + 10_000], severities[start:start + 10_000].tolist())
+
+  summaries = sketch.summaries()
+  for severity in ("SEV1", "SEV2"):
+    exact = np.sort(seconds[severities == severity])
+    for q in (0.5, 0.9, 0.99):
+      nearest_rank = exact[int(np.ceil(q * exact.size)) - 1]
+      assert summaries[severity][f"p{round(q * 100)}"] == pytest.approx(nearest_rank, rel=RELATIVE_ACCURACY)
+    assert summaries[severity]["count"] == exact.size
+    assert summaries[severity]["mean"] == pytest.approx(exact.mean())
+
+
+def test_sketches_merge_like_one():
+  import numpy as np
+  seconds = np.arange(1, 1001, dtype=float) * 60
+  whole, first, second = DurationSketch(), DurationSketch(), DurationSketch()
+  whole.add(seconds)
+  first.add(seconds[:300])
+  second.add(seconds[300:])
+  first.merge(second)
+
+  assert first.summaries() == whole.summaries()
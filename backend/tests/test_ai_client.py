@@ -0,0 +1,119 @@
+import json
+import threading
+import time
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import SimpleNamespace
+import pytest
+from app.core.metrics import metrics
+from app.services import ai_service
+from app.services.ai_service import AIService, AIServiceError
+
+
+class FakeGroqServer(ThreadingHTTPServer):
+  """Minimal OpenAI-compatible chat completions endpoint; `script` is a list of (status, delay) per request."""
+  def __init__(self):
+    super().__init__(("127.0.0.1", 0), FakeGroqHandler)
+    self.script = []
+    self.requests = []
+
+  @property
+  def base_url(self):
+    return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+class FakeGroqHandler(BaseHTTPRequestHandler):
+  def do_POST(self):
+    body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+    self.server.requests.append((self.path, body["model"]))
+    status, delay = self.server.script.pop(0) if self.server.script else (200, 0)
+    time.sleep(delay)
+    if status == 200:
+      payload = {
+        "id": "chatcmpl-1", "object": "chat.completion", "created": 0, "model": body["model"],
+        "choices": [{"index": 0, "finish_reason": "stop", "message": {"role": "assistant", "content": "# Post-Mortem"}}],
+        "usage": {"prompt_tokens": 120, "completion_tokens": 30, "total_tokens": 150},
+      }
+    else:
+      payload = {"error": {"message": "upstream overloaded", "type": "server_error"}}
+    data = json.dumps(payload).encode()
+    try:
+      self.send_response(status)
+      self.send_header("Content-Type", "application/json")
+      self.send_header("Content-Length", str(len(data)))
+      self.send_header("retry-after-ms", "10")
+      self.end_headers()
+      self.wfile.write(data)
+    except (BrokenPipeError, ConnectionResetError):
+      pass # Client already gave up (timeout tests)
+
+  def log_message(self, *args):
+    pass
+
+
+@pytest.fixture
+def fake_groq(monkeypatch):
+  server = FakeGroqServer()
+  thread = threading.Thread(target=server.serve_forever, daemon=True)
+  thread.start()
+  monkeypatch.setenv("GROQ_API_KEY", "test-key")
+  monkeypatch.setenv("GROQ_BASE_URL", server.base_url)
+  monkeypatch.setenv("GROQ_MODEL", "fake-model")
+  monkeypatch.setattr(ai_service, "_clients", {})
+  monkeypatch.setattr(ai_service, "_http_client", None)
+  metrics.reset()
+  yield server
+  server.shutdown()
+  server.server_close()
+
+
+def _incident():
+  now = datetime(2024, 1, 1, 12, 0)
+  return SimpleNamespace(title="API down", severity="SEV1", description="502s", created_at=now, resolved_at=now)
+
+
+def test_client_is_cached_per_key_and_shares_one_pool(fake_groq, monkeypatch):
+  first = AIService._get_client()
+  assert AIService._get_client() is first
+
+  monkeypatch.setenv("GROQ_API_KEY", "other-key")
+  other = AIService._get_client()
+
+  assert other is not first
+  assert other._client is first._client
+
+
+def test_completion_records_latency_and_tokens(fake_groq):
+  report = AIService.build_post_mortem_markdown(_incident(), [])
+
+  assert report == "# Post-Mortem"
+  assert fake_groq.requests == [("/openai/v1/chat/completions", "fake-model")]
+  stats = metrics.snapshot()["groq:fake-model"]
+  assert stats["calls"] == 1 and stats["errors"] == 0
+  assert stats["prompt_tokens"] == 120 and stats["completion_tokens"] == 30
+
+
+def test_server_errors_are_retried_within_budget(fake_groq, monkeypatch):
+  monkeypatch.setattr(ai_service, "GROQ_MAX_RETRIES", 1)
+  fake_groq.script = [(503, 0)]
+
+  assert AIService.build_post_mortem_markdown(_incident(), []) == "# Post-Mortem"
+  assert len(fake_groq.requests) == 2
+
+  fake_groq.script = [(503, 0), (503, 0)]
+  with pytest.raises(AIServiceError):
+    AIService.build_post_mortem_markdown(_incident(), [])
+  assert len(fake_groq.requests) == 4
+
+
+def test_stuck_provider_hits_read_timeout(fake_groq, monkeypatch):
+  monkeypatch.setattr(ai_service, "GROQ_READ_TIMEOUT", 0.2)
+  monkeypatch.setattr(ai_service, "GROQ_MAX_RETRIES", 0)
+  fake_groq.script = [(200, 1.0)]
+
+  started = time.perf_counter()
+  with pytest.raises(AIServiceError):
+    AIService.build_post_mortem_markdown(_incident(), [])
+
+  assert time.perf_counter() - started < 0.9
+  assert metrics.snapshot()["groq:fake-model"]["errors"] == 1
@@ -6,6 +6,7 @@ from app.db.session import get_db
 from app.api.deps import get_current_user
 from app.db.models import User, UserRole, Organization
 from fastapi import Depends
+from query_budget import query_budget
 
 @pytest.fixture
 def test_organization(db):
@@ -67,6 +68,7 @@ def test_create_incident(client, db, auth_override, test_organization):
   assert "id" in data
   assert data["message"] == "Incident created successfully"
   
+@query_budget(1, endpoint="GET /api/v1/incidents/")
 def test_get_incidents(client, db, auth_override, test_organization):
   # Seed data
   payload = {
@@ -83,4 +85,20 @@ def test_get_incidents(client, db, auth_override, test_organization):
   assert response.status_code == 200
   data = response.json()
   assert len(data) > 0
-  assert any(i["title"] == "Production Outage" for i in data)
\ No newline at end of file
+  assert any(i["title"] == "Production Outage" for i in data)
+
+
+def test_get_incidents_payload_shape(client, db, auth_override, test_organization):
+  client.post("/api/v1/incidents", json={"title": "Shape", "description": "Check fields", "severity": "SEV2"})
+
+  response = client.get("/api/v1/incidents")
+
+  assert response.status_code == 200
+  incident = next(i for i in response.json() if i["title"] == "Shape")
+  assert set(incident) == {
+    "id", "title", "description", "severity", "status",
+    "owner_id", "created_at", "updated_at", "version", "sla_deadline", "allowed_transitions",
+  }
+  assert incident["severity"] == "SEV2"
+  assert incident["status"] == "DETECTED"
+  assert incident["allowed_transitions"] == ["INVESTIGATING", "CLOSED", "ESCALATED"]
@@ -5,6 +5,7 @@ from app.api.deps import get_current_user
 from app.db.models import Organization, User, UserRole, Incident, IncidentStatus, IncidentSeverity, IncidentAttachment
 from app.core import storage
 from app.services import attachment_service
+from query_budget import query_budget
 
 
 @pytest.fixture
@@ -93,6 +94,7 @@ def test_sign_upload_returns_key_and_data(client, auth_override, uploader_user,
   assert "error_log.txt" in data["file_key"]
 
 
+@query_budget(4)
 def test_complete_upload_and_list(client, db, auth_override, uploader_user, incident):
   app.dependency_overrides[get_current_user] = lambda: uploader_user
 
@@ -142,3 +144,36 @@ def test_delete_attachment_rbac(client, db, auth_override, uploader_user, other_
   app.dependency_overrides[get_current_user] = lambda: admin_user
   response = client.delete(f"/api/v1/incidents/{incident.id}/attachments/{attachment.id}")
   assert response.status_code == 200
+
+
+def test_list_attachments_single_statement(client, db, auth_override, uploader_user, other_user, incident, count_queries):
+  for user, name in [(uploader_user, "a.log"), (other_user, "b.log"), (uploader_user, "c.log")]:
+    db.add(IncidentAttachment(
+      incident_id=incident.id,
+      organization_id=incident.organization_id,
+      file_name=name,
+      file_key=f"incidents/{incident.id}/{name}",
+      uploaded_by=user.id
+    ))
+  db.commit()
+  db.expunge_all()
+
+  app.dependency_overrides[get_current_user] = lambda: uploader_user
+  with count_queries() as statements:
+    response = client.get(f"/api/v1/incidents/{incident.id}/attachments")
+
+  assert response.status_code == 200
+  assert sorted((a["file_name"], a["uploaded_by"]) for a in response.json()) == [
+    ("a.log", uploader_user.full_name),
+    ("b.log", other_user.full_name),
+    ("c.log", uploader_user.full_name),
+  ]
+  # Existence check, attachments and uploader names all come from one statement
+  assert len(statements) == 1, statements
+
+
+def test_list_attachments_empty_incident(client, auth_override, uploader_user, incident):
+  app.dependency_overrides[get_current_user] = lambda: uploader_user
+  response = client.get(f"/api/v1/incidents/{incident.id}/attachments")
+  assert response.status_code == 200
+  assert response.json() == []
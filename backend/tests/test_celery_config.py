@@ -0,0 +1,48 @@
+import pytest
+from app.core import tasks
+from app.core.celery_app import celery, DEFAULT_PRIORITY
+from app.db.models import IncidentSeverity
+
+
+@pytest.mark.parametrize("task, queue", [
+  (tasks.send_incident_alert_email, "alerts"),
+  (tasks.check_sla_breaches, "sla"),
+  (tasks.index_incident_similarity, "ai"),
+  (tasks.index_incidents_similarity, "ai"),
+  (tasks.backfill_similarity_signatures, "ai"),
+  (tasks.archive_closed_incident_events, "maintenance"),
+  (tasks.ensure_event_partitions, "maintenance"),
+  (tasks.export_dataset, "maintenance"),
+  (tasks.refresh_analytics_views, "maintenance"),
+])
+def test_tasks_are_routed_to_their_queue(task, queue):
+  route = celery.amqp.router.route({}, task.name)
+
+  assert route["queue"].name == queue
+
+
+def test_results_are_not_stored():
+  assert celery.conf.task_ignore_result is True
+  assert all(task.ignore_result for name, task in celery.tasks.items() if name.startswith("app.core.tasks."))
+
+
+def test_long_tasks_ack_late():
+  assert tasks.export_dataset.acks_late
+  # A task that kills its worker process (OOM) is acked, not requeued onto the next worker
+  assert not tasks.export_dataset.reject_on_worker_lost
+  assert not tasks.send_incident_alert_email.acks_late
+
+
+@pytest.mark.parametrize("severity, priority", [
+  (IncidentSeverity.SEV1, 0),
+  ("SEV2", 3),
+  (IncidentSeverity.SEV4, DEFAULT_PRIORITY),
+])
+def test_alert_priority_follows_severity(monkeypatch, severity, priority):
+  queued = []
+  monkeypatch.setattr(tasks.send_incident_alert_email, "apply_async", lambda kwargs, priority: queued.append((kwargs, priority)))
+
+  tasks.queue_alert_email("oncall@example.com", "DB down", "abc", severity)
+
+  assert queued[0][1] == priority
+  assert queued[0][0]["severity"] == getattr(severity, "value", severity)
@@ -0,0 +1,134 @@
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from botocore.exceptions import ClientError
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import storage
+from app.core.event_archive import archive_key
+from app.db.models import Incident, IncidentEvent, IncidentStatus, Organization, User, UserRole
+from app.services.archive_service import ArchiveService
+
+
+class FakeS3:
+  def __init__(self):
+    self.objects = {}
+
+  def put_object(self, Bucket, Key, Body, **kwargs):
+    self.objects[Key] = Body
+
+  def get_object(self, Bucket, Key):
+    return {"Body": io.BytesIO(self.objects[Key])}
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+  s3 = FakeS3()
+  monkeypatch.setattr(storage, "get_s3_client", lambda: s3)
+  return s3
+
+
+@pytest.fixture
+def admin_user(db):
+  org = Organization(id=uuid.uuid4(), name="Archive Org", slug="archive-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="admin@archive.com",
+    full_name="Archive Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _closed_incident(client, db, days_ago):
+  response = client.post("/api/v1/incidents", json={"title": "Queue backlog", "description": "Workers stalled", "severity": "SEV3"})
+  incident_id = uuid.UUID(response.json()["id"])
+  client.post(f"/api/v1/incidents/{incident_id}/comment", json={"comment": "Restarted the workers"})
+
+  db.query(Incident).filter(Incident.id == incident_id).update({
+    Incident.status: IncidentStatus.CLOSED,
+    Incident.updated_at: datetime.now(timezone.utc) - timedelta(days=days_ago),
+  }, synchronize_session=False)
+  db.commit()
+  return incident_id
+
+
+def _hot_event_count(db, incident_id):
+  return db.query(IncidentEvent).filter(IncidentEvent.incident_id == incident_id).count()
+
+
+def test_archive_moves_old_closed_events_to_storage(client, db, admin_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  old_id = _closed_incident(client, db, days_ago=200)
+  recent_id = _closed_incident(client, db, days_ago=10)
+  before = client.get(f"/api/v1/incidents/{old_id}/events").json()
+
+  assert ArchiveService(db).archive_closed_incidents(older_than_days=180) == 1
+
+  assert _hot_event_count(db, old_id) == 0
+  assert _hot_event_count(db, recent_id) == 2
+  assert archive_key(admin_user.organization_id, old_id) in fake_s3.objects
+  db.expire_all()
+  assert db.get(Incident, old_id).events_archived_at is not None
+
+  # The timeline reads through to the archive transparently
+  after = client.get(f"/api/v1/incidents/{old_id}/events").json()
+  assert after == before
+
+  # Already-archived incidents are skipped on the next run
+  assert ArchiveService(db).archive_closed_incidents(older_than_days=180) == 0
+
+
+def test_rehydrate_restores_hot_rows(client, db, admin_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _closed_incident(client, db, days_ago=200)
+  before = client.get(f"/api/v1/incidents/{incident_id}/events").json()
+  ArchiveService(db).archive_closed_incidents(older_than_days=180)
+
+  response = client.post(f"/api/v1/incidents/{incident_id}/events/rehydrate")
+
+  assert response.status_code == 200
+  assert response.json()["restored"] == 2
+  assert _hot_event_count(db, incident_id) == 2
+  assert client.get(f"/api/v1/incidents/{incident_id}/events").json() == before
+
+  # Nothing left to restore
+  assert client.post(f"/api/v1/incidents/{incident_id}/events/rehydrate").status_code == 400
+
+
+def test_events_fall_back_to_hot_rows_when_archive_is_unreadable(client, db, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _closed_incident(client, db, days_ago=200)
+  ArchiveService(db).archive_closed_incidents(older_than_days=180)
+  client.post(f"/api/v1/incidents/{incident_id}/comment", json={"comment": "Reopened the investigation"})
+
+  def missing(Bucket, Key):
+    raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject")
+  monkeypatch.setattr(fake_s3, "get_object", missing)
+  response = client.get(f"/api/v1/incidents/{incident_id}/events")
+
+  assert response.status_code == 200
+  assert response.headers["x-events-archive"] == "unavailable"
+  assert [event["comment"] for event in response.json()] == ["Reopened the investigation"]
+
+
+def test_rehydrated_incident_is_not_archived_again(client, db, admin_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _closed_incident(client, db, days_ago=200)
+  ArchiveService(db).archive_closed_incidents(older_than_days=180)
+
+  assert client.post(f"/api/v1/incidents/{incident_id}/events/rehydrate").status_code == 200
+
+  assert ArchiveService(db).archive_closed_incidents(older_than_days=180) == 0
+  assert _hot_event_count(db, incident_id) == 2
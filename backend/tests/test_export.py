@@ -0,0 +1,177 @@
+import csv
+import gzip
+import io
+import uuid
+from datetime import datetime, timedelta, timezone
+import orjson
+import pytest
+from botocore.exceptions import ClientError
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import storage, tasks
+from app.db.models import Incident, IncidentStatus, Organization, User, UserRole
+from app.services import export_service
+from app.services.archive_service import ArchiveService
+from app.services.export_service import ExportService
+
+
+class FakeS3:
+  def __init__(self):
+    self.objects = {}
+
+  def put_object(self, Bucket, Key, Body, **kwargs):
+    self.objects[Key] = Body
+
+  def get_object(self, Bucket, Key):
+    if Key not in self.objects:
+      raise ClientError({"Error": {"Code": "NoSuchKey", "Message": "Not Found"}}, "GetObject")
+    return {"Body": io.BytesIO(self.objects[Key])}
+
+  def upload_fileobj(self, Fileobj, Bucket, Key, ExtraArgs=None):
+    self.objects[Key] = Fileobj.read()
+
+  def generate_presigned_url(self, ClientMethod, Params, ExpiresIn):
+    return f"http://minio:9000/{Params['Bucket']}/{Params['Key']}?signature=test"
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+  s3 = FakeS3()
+  monkeypatch.setattr(storage, "get_s3_client", lambda: s3)
+  return s3
+
+
+@pytest.fixture
+def admin_user(db):
+  org = Organization(id=uuid.uuid4(), name="Export Org", slug="export-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="admin@export.com",
+    full_name="Export Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _declare(client, title):
+  response = client.post("/api/v1/incidents", json={"title": title, "description": f"{title}, with details", "severity": "SEV2"})
+  return response.json()["id"]
+
+
+def test_csv_export_streams_every_incident(client, db, admin_user, auth_override, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  monkeypatch.setattr(export_service, "EXPORT_BATCH_SIZE", 2)
+  ids = [_declare(client, f"Incident {n}") for n in range(5)]
+
+  chunks = list(ExportService(db).stream_export(
+    admin_user.organization_id, "incidents", "csv", datetime(1970, 1, 1), datetime.now(timezone.utc) + timedelta(minutes=1)
+  ))
+  response = client.get("/api/v1/admin/export", params={"dataset": "incidents", "format": "csv"})
+
+  assert len(chunks) == 3 # Header travels with the first batch of 2, then 2 + 1
+  assert response.status_code == 200
+  assert response.headers["content-type"].startswith("text/csv")
+  rows = list(csv.DictReader(io.StringIO(response.text)))
+  assert sorted(row["id"] for row in rows) == sorted(ids)
+  assert {row["description"] for row in rows} == {f"Incident {n}, with details" for n in range(5)}
+  assert {row["severity"] for row in rows} == {"SEV2"}
+
+
+def test_gzip_jsonl_event_export_includes_archived_events(client, db, admin_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  archived_id = _declare(client, "Old outage")
+  live_id = _declare(client, "New outage")
+  db.query(Incident).filter(Incident.id == uuid.UUID(archived_id)).update({
+    Incident.status: IncidentStatus.CLOSED,
+    Incident.updated_at: datetime.now(timezone.utc) - timedelta(days=365),
+  }, synchronize_session=False)
+  db.commit()
+  assert ArchiveService(db).archive_closed_incidents(older_than_days=180) == 1
+
+  response = client.get("/api/v1/admin/export", params={"dataset": "events", "format": "jsonl", "gzip": True})
+
+  assert response.status_code == 200
+  assert response.headers["content-type"] == "application/gzip"
+  events = [orjson.loads(line) for line in gzip.decompress(response.content).splitlines()]
+  assert sorted(e["incident_id"] for e in events) == sorted([archived_id, live_id])
+  assert {e["event_type"] for e in events} == {"CREATION"}
+
+
+def test_export_requires_admin(client, db, admin_user, auth_override):
+  admin_user.role = UserRole.ENGINEER
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  assert client.get("/api/v1/admin/export").status_code == 403
+
+
+def test_async_export_writes_to_bucket(client, db, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _declare(client, "Bucket export")
+  queued = []
+  monkeypatch.setattr(tasks.export_dataset, "delay", lambda *args: queued.append(args))
+
+  response = client.post("/api/v1/admin/exports", json={"dataset": "incidents", "format": "jsonl"})
+
+  assert response.status_code == 202
+  body = response.json()
+  assert body["status"] == "queued"
+  assert body["key"].endswith(".jsonl.gz")
+  assert body["download_url"] is None
+  status = client.get(f"/api/v1/admin/exports/{body['export_id']}").json()
+  assert status["status"] == "queued" and status["download_url"] is None
+
+  # Run the queued job against the test session
+  monkeypatch.setattr(tasks, "SessionLocal", lambda: db)
+  key = queued[0][6]
+  assert tasks.export_dataset(*queued[0]) == key
+  rows = [orjson.loads(line) for line in gzip.decompress(fake_s3.objects[key]).splitlines()]
+  assert [row["id"] for row in rows] == [incident_id]
+
+  status = client.get(f"/api/v1/admin/exports/{body['export_id']}").json()
+  assert status["status"] == "ready" and status["key"] == key
+  assert key in status["download_url"]
+
+
+def test_failed_export_reports_the_error(client, db, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  queued = []
+  monkeypatch.setattr(tasks.export_dataset, "delay", lambda *args: queued.append(args))
+  export_id = client.post("/api/v1/admin/exports", json={"dataset": "incidents"}).json()["export_id"]
+
+  def broken(*args):
+    raise RuntimeError("disk full")
+  monkeypatch.setattr(tasks, "SessionLocal", lambda: db)
+  monkeypatch.setattr(ExportService, "export_to_storage", broken)
+  with pytest.raises(RuntimeError):
+    tasks.export_dataset(*queued[0])
+
+  status = client.get(f"/api/v1/admin/exports/{export_id}").json()
+  assert status["status"] == "failed"
+  assert status["error"] == "RuntimeError: disk full"
+  assert status["download_url"] is None
+
+
+def test_lost_export_is_reported_failed_once_stale(client, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  monkeypatch.setattr(tasks.export_dataset, "delay", lambda *args: None)
+  export_id = client.post("/api/v1/admin/exports", json={"dataset": "incidents"}).json()["export_id"]
+
+  monkeypatch.setattr(export_service, "EXPORT_STALE_SECONDS", -1)
+
+  assert client.get(f"/api/v1/admin/exports/{export_id}").json()["status"] == "failed"
+
+
+def test_unknown_export_is_404(client, admin_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  assert client.get(f"/api/v1/admin/exports/{uuid.uuid4()}").status_code == 404
@@ -1,5 +1,10 @@
 # backend/tests/test_fsm.py
-from app.core.fsm import can_transition, IncidentStatus
+import json
+import uuid
+import pytest
+from app.core import fsm
+from app.core.fsm import can_transition, IncidentStatus, VALID_TRANSITIONS, DEFAULT_WORKFLOW, Workflow, get_workflow
+from app.db import models
 
 def test_valid_transitions():
     # It should be allowed to go from DETECTED to INVESTIGATING, CLOSED or ESCALATED
@@ -42,4 +47,39 @@ def test_unknown_state():
     
 def test_same_state_transition():
     # Transitioning to the same state should be invalid
-    assert can_transition(IncidentStatus.DETECTED, IncidentStatus.DETECTED) is False
\ No newline at end of file
+    assert can_transition(IncidentStatus.DETECTED, IncidentStatus.DETECTED) is False
+
+
+def test_db_strings_and_enum_share_the_table():
+    assert can_transition("DETECTED", "INVESTIGATING") is True
+    assert models.IncidentStatus is IncidentStatus
+
+
+def test_allowed_transitions_are_cached_tuples():
+    assert VALID_TRANSITIONS[IncidentStatus.DETECTED] == (IncidentStatus.INVESTIGATING, IncidentStatus.CLOSED, IncidentStatus.ESCALATED)
+    assert DEFAULT_WORKFLOW.allowed_transitions("DETECTED") is VALID_TRANSITIONS[IncidentStatus.DETECTED]
+    assert DEFAULT_WORKFLOW.allowed_transitions("ALIEN_STATE") == ()
+
+
+def test_workflow_rejects_invalid_tables():
+    with pytest.raises(ValueError):
+        Workflow({"DETECTED": ["INVESTIGATING"], "TRIAGED": ["CLOSED"]})
+    with pytest.raises(ValueError):
+        Workflow({"DETECTED": ["DETECTED"]})
+
+
+def test_per_org_workflow_is_loaded_once(tmp_path, monkeypatch):
+    org_id = uuid.uuid4()
+    path = tmp_path / "workflows.json"
+    path.write_text(json.dumps({str(org_id): {"DETECTED": ["RESOLVED"], "RESOLVED": ["CLOSED"]}}))
+    monkeypatch.setattr(fsm, "INCIDENT_WORKFLOWS_FILE", str(path))
+    fsm._load_workflows.cache_clear()
+
+    workflow = get_workflow(org_id)
+    assert workflow.can_transition("DETECTED", "RESOLVED") is True
+    assert workflow.can_transition("DETECTED", "INVESTIGATING") is False
+    assert get_workflow(uuid.uuid4()) is DEFAULT_WORKFLOW
+
+    path.unlink()
+    assert get_workflow(org_id) is workflow
+    fsm._load_workflows.cache_clear()
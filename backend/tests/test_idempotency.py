@@ -0,0 +1,136 @@
+import threading
+import uuid
+import orjson
+import pytest
+from fastapi import HTTPException
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import idempotency
+from app.db.models import Incident, IncidentEvent, Organization, User, UserRole
+
+
+@pytest.fixture
+def memory_store():
+  store = idempotency.configure_idempotency("memory://")
+  yield store
+  idempotency.configure_idempotency(None)
+
+
+@pytest.fixture
+def engineer_user(db):
+  org = Organization(id=uuid.uuid4(), name="Retry Org", slug="retry-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="eng@retry.com",
+    full_name="Retry Engineer",
+    role=UserRole.ENGINEER,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+PAYLOAD = {"title": "Checkout 500s", "description": "Spike after deploy", "severity": "SEV2"}
+
+
+def _org_incident_count(db, user):
+  return db.query(Incident).filter(Incident.organization_id == user.organization_id).count()
+
+
+def test_retried_create_replays_the_first_response(client, db, memory_store, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  headers = {"Idempotency-Key": "create-1"}
+
+  first = client.post("/api/v1/incidents", json=PAYLOAD, headers=headers)
+  retry = client.post("/api/v1/incidents", json=PAYLOAD, headers=headers)
+
+  assert first.status_code == retry.status_code == 200
+  assert retry.json() == first.json()
+  assert retry.headers["idempotent-replayed"] == "true"
+  assert _org_incident_count(db, engineer_user) == 1
+
+  # A new key is a new request
+  assert client.post("/api/v1/incidents", json=PAYLOAD, headers={"Idempotency-Key": "create-2"}).json()["id"] != first.json()["id"]
+
+
+def test_retried_comment_writes_one_event(client, db, memory_store, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  incident_id = client.post("/api/v1/incidents", json=PAYLOAD).json()["id"]
+  headers = {"Idempotency-Key": "comment-1"}
+
+  for _ in range(3):
+    assert client.post(f"/api/v1/incidents/{incident_id}/comment", json={"comment": "Rolling back"}, headers=headers).status_code == 200
+
+  assert db.query(IncidentEvent).filter(
+    IncidentEvent.incident_id == uuid.UUID(incident_id), IncidentEvent.event_type == "COMMENT"
+  ).count() == 1
+
+
+def test_key_reused_for_different_request_is_rejected(client, db, memory_store, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  headers = {"Idempotency-Key": "reused"}
+  client.post("/api/v1/incidents", json=PAYLOAD, headers=headers)
+
+  response = client.post("/api/v1/incidents", json={**PAYLOAD, "severity": "SEV1"}, headers=headers)
+
+  assert response.status_code == 422
+  assert _org_incident_count(db, engineer_user) == 1
+
+
+def test_failed_request_releases_the_key(client, db, memory_store, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  incident_id = client.post("/api/v1/incidents", json=PAYLOAD).json()["id"]
+  headers = {"Idempotency-Key": "transition-1"}
+
+  assert client.post(f"/api/v1/incidents/{incident_id}/transition", json={"new_state": "RESOLVED"}, headers=headers).status_code == 400
+  # Same key, same (still invalid) request: re-executed, not replayed
+  retry = client.post(f"/api/v1/incidents/{incident_id}/transition", json={"new_state": "RESOLVED"}, headers=headers)
+  assert retry.status_code == 400
+  assert "idempotent-replayed" not in retry.headers
+
+
+def test_concurrent_duplicate_waits_for_the_original(memory_store, monkeypatch):
+  monkeypatch.setattr(idempotency, "IDEMPOTENCY_WAIT_SECONDS", 2)
+  started, release = threading.Event(), threading.Event()
+  calls = []
+
+  def slow_build():
+    calls.append(1)
+    started.set()
+    release.wait(2)
+    return {"id": "abc"}
+
+  results = []
+  original = threading.Thread(target=lambda: results.append(
+    idempotency.idempotent_response("k", "user", "op", {"a": 1}, slow_build)
+  ))
+  original.start()
+  started.wait(2)
+  threading.Timer(0.1, release.set).start()
+
+  duplicate = idempotency.idempotent_response("k", "user", "op", {"a": 1}, slow_build)
+  original.join()
+
+  assert len(calls) == 1
+  assert orjson.loads(duplicate.body) == orjson.loads(results[0].body) == {"id": "abc"}
+  assert duplicate.headers["idempotent-replayed"] == "true"
+
+
+def test_duplicate_of_stuck_request_gets_409(memory_store, monkeypatch):
+  monkeypatch.setattr(idempotency, "IDEMPOTENCY_WAIT_SECONDS", 0.1)
+  fingerprint = idempotency._fingerprint("op", {"a": 1})
+  memory_store.claim("idempotency:user:k", orjson.dumps({"state": "pending", "fingerprint": fingerprint}), 60)
+
+  with pytest.raises(HTTPException) as exc:
+    idempotency.idempotent_response("k", "user", "op", {"a": 1}, lambda: {"id": "never"})
+
+  assert exc.value.status_code == 409
+  assert exc.value.headers["Retry-After"] == "1"
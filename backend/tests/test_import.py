@@ -0,0 +1,119 @@
+import io
+import uuid
+import orjson
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.db.models import Incident, IncidentEvent, Organization, User, UserRole
+from app.services import import_service
+from app.services.import_service import ImportService
+from app.core import tasks
+
+
+@pytest.fixture
+def admin_user(db):
+  org = Organization(id=uuid.uuid4(), name="Import Org", slug="import-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="admin@import.com",
+    full_name="Import Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _record(title, **fields):
+  return {"title": title, "description": f"{title} details", "severity": "SEV2", "created_at": "2023-03-01T10:00:00Z", **fields}
+
+
+def _jsonl(*records):
+  return b"".join(r if isinstance(r, bytes) else orjson.dumps(r) + b"\n" for r in records)
+
+
+def test_import_endpoint_replays_history_and_reports_failures(client, db, admin_user, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  body = _jsonl(
+    _record("Payment outage", owner_email="ADMIN@import.com", status="CLOSED", history=[
+      {"at": "2023-03-01T10:05:00Z", "status": "INVESTIGATING", "actor_email": "admin@import.com"},
+      {"at": "2023-03-01T10:20:00Z", "comment": "Rolled back deploy"},
+      {"at": "2023-03-01T10:30:00Z", "status": "MITIGATED"},
+      {"at": "2023-03-01T11:00:00Z", "status": "RESOLVED"},
+      {"at": "2023-03-02T09:00:00Z", "status": "CLOSED"},
+    ]),
+    _record("Skipped a step", history=[{"at": "2023-03-01T10:05:00Z", "status": "RESOLVED"}]),
+    b"{not json\n",
+    _record("Closed elsewhere", owner_email="ghost@import.com", status="CLOSED"),
+  )
+
+  response = client.post("/api/v1/admin/import", params={"source": "pagerduty"}, content=body)
+
+  assert response.status_code == 200
+  report = response.json()
+  assert (report["processed"], report["imported"], report["failed"]) == (4, 2, 2)
+  assert [f["line"] for f in report["failures"]] == [2, 3]
+  assert "invalid transition from DETECTED to RESOLVED" in report["failures"][0]["error"]
+  assert report["unknown_users"] == ["ghost@import.com"]
+
+  outage = db.query(Incident).filter(Incident.title == "Payment outage").one()
+  assert outage.status == "CLOSED"
+  assert outage.owner_id == admin_user.id
+  assert outage.resolved_at.replace(tzinfo=None).isoformat() == "2023-03-01T11:00:00"
+  events = db.query(IncidentEvent).filter(IncidentEvent.incident_id == outage.id).order_by(IncidentEvent.created_at).all()
+  assert [e.event_type for e in events] == ["CREATION", "STATUS_CHANGE", "COMMENT", "STATUS_CHANGE", "STATUS_CHANGE", "STATUS_CHANGE"]
+  assert events[0].comment == "Imported from pagerduty"
+
+  # Only a final status was known: one explicit jump, no invented intermediate steps
+  elsewhere = db.query(Incident).filter(Incident.title == "Closed elsewhere").one()
+  assert elsewhere.owner_id is None
+  jump = db.query(IncidentEvent).filter(IncidentEvent.incident_id == elsewhere.id, IncidentEvent.event_type == "STATUS_CHANGE").one()
+  assert (jump.old_value, jump.new_value) == ("DETECTED", "CLOSED")
+
+
+def test_csv_import_in_chunks_resolves_users_once(client, db, admin_user, count_queries, monkeypatch):
+  monkeypatch.setattr(import_service, "IMPORT_CHUNK_SIZE", 2)
+  history = orjson.dumps([{"at": "2023-03-01T10:05:00Z", "status": "INVESTIGATING"}]).decode().replace('"', '""')
+  lines = ["title,description,severity,owner_email,created_at,history"] + [
+    f'Incident {n},,SEV3,admin@import.com,2023-03-01T10:00:00,"{history}"' for n in range(5)
+  ]
+  progress, indexed = [], []
+  monkeypatch.setattr(tasks.index_incidents_similarity, "delay", indexed.append)
+
+  with count_queries() as statements:
+    report = ImportService(db).import_stream(
+      io.BytesIO("\n".join(lines).encode()), "csv", admin_user.organization_id, on_progress=lambda r: progress.append(r.imported)
+    )
+
+  assert (report.imported, report.failed, report.events) == (5, 0, 10)
+  assert progress == [2, 4, 5]
+  assert sum("FROM users" in s for s in statements) == 1
+  imported = db.query(Incident).filter(Incident.organization_id == admin_user.organization_id).all()
+  assert {i.status for i in imported} == {"INVESTIGATING"}
+  # Each committed chunk is queued for similarity indexing
+  assert [len(batch) for batch in indexed] == [2, 2, 1]
+  assert {i for batch in indexed for i in batch} == {str(i.id) for i in imported}
+
+
+def test_dry_run_writes_nothing(client, db, admin_user):
+  report = ImportService(db).import_stream(
+    io.BytesIO(_jsonl(_record("Validate me"))), "jsonl", admin_user.organization_id, dry_run=True
+  )
+
+  assert report.imported == 1 and report.dry_run
+  assert db.query(Incident).filter(Incident.organization_id == admin_user.organization_id).count() == 0
+
+
+def test_import_requires_admin(client, db, admin_user, auth_override):
+  admin_user.role = UserRole.MANAGER
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  assert client.post("/api/v1/admin/import", content=_jsonl(_record("Nope"))).status_code == 403
@@ -0,0 +1,145 @@
+import threading
+import time
+import uuid
+from types import SimpleNamespace
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import supabase_admin
+from app.db.models import Organization, User, UserRole
+from app.services import org_service
+
+
+class FakeSupabaseAdmin:
+  """Stands in for client.auth.admin; records how many invitations were in flight at once."""
+  def __init__(self, fail=()):
+    self.fail = set(fail)
+    self.sent = []
+    self.in_flight = 0
+    self.max_in_flight = 0
+    self._lock = threading.Lock()
+    self.auth = SimpleNamespace(admin=self)
+
+  def invite_user_by_email(self, email):
+    with self._lock:
+      self.in_flight += 1
+      self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    try:
+      time.sleep(0.02)
+      if email in self.fail:
+        raise RuntimeError("rate limited by provider")
+      self.sent.append(email)
+      return SimpleNamespace(user=SimpleNamespace(id=uuid.uuid4()))
+    finally:
+      with self._lock:
+        self.in_flight -= 1
+
+
+@pytest.fixture
+def admin_user(db):
+  org = Organization(id=uuid.uuid4(), name="Invite Org", slug="invite-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="admin@invite.com",
+    full_name="Invite Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override(admin_user):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def fake_supabase(monkeypatch):
+  fake = FakeSupabaseAdmin(fail={"flaky@invite.com"})
+  monkeypatch.setattr(org_service, "get_supabase_admin", lambda: fake)
+  monkeypatch.setattr(org_service, "INVITE_CONCURRENCY", 4)
+  return fake
+
+
+def test_supabase_client_is_not_built_for_requests_that_do_not_invite(client, db, admin_user, auth_override, monkeypatch):
+  monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+  monkeypatch.setenv("SUPABASE_KEY", "service-role")
+  monkeypatch.setattr(supabase_admin, "_client", None)
+
+  response = client.get("/api/v1/orgs/org_profile")
+
+  assert response.status_code == 200
+  assert supabase_admin._client is None
+
+
+def test_supabase_client_is_shared_by_the_process(monkeypatch):
+  built = []
+  import supabase
+  monkeypatch.setenv("SUPABASE_URL", "https://example.supabase.co")
+  monkeypatch.setenv("SUPABASE_KEY", "service-role")
+  monkeypatch.setattr(supabase_admin, "_client", None)
+  monkeypatch.setattr(supabase, "create_client", lambda url, key: built.append(url) or object())
+
+  first = supabase_admin.get_supabase_admin()
+
+  assert supabase_admin.get_supabase_admin() is first
+  assert built == ["https://example.supabase.co"]
+
+
+def test_invite_without_credentials_is_501(client, db, admin_user, auth_override, monkeypatch):
+  monkeypatch.setattr(org_service, "get_supabase_admin", lambda: None)
+
+  response = client.post("/api/v1/orgs/invite", json={"email": "new@invite.com"})
+
+  assert response.status_code == 501
+
+
+def test_bulk_invite_sends_concurrently_and_commits_once(client, db, admin_user, auth_override, fake_supabase, count_queries):
+  emails = [f"eng{i}@invite.com" for i in range(12)]
+  invites = [{"email": email, "role": "ENGINEER"} for email in emails]
+  invites += [
+    {"email": "flaky@invite.com"},
+    {"email": "admin@invite.com"}, # Already a user
+    {"email": "bot@invite.com", "role": "BOT"},
+    {"email": "ENG0@invite.com"}, # Duplicate of eng0
+  ]
+
+  with count_queries() as statements:
+    response = client.post("/api/v1/orgs/invite/bulk", json={"invites": invites})
+
+  assert response.status_code == 200
+  body = response.json()
+  assert sorted(i["email"] for i in body["invited"]) == sorted(emails)
+  assert {f["email"]: f["error"] for f in body["failed"]} == {
+    "bot@invite.com": "Invalid role: BOT",
+    "admin@invite.com": "User already exists",
+    "flaky@invite.com": "Supabase User invitation failed: rate limited by provider",
+  }
+  assert 1 < fake_supabase.max_in_flight <= 4
+
+  created = db.query(User).filter(User.organization_id == admin_user.organization_id, User.email.in_(emails)).all()
+  assert len(created) == 12
+  inserts = [s for s in statements if s.startswith("INSERT INTO users")]
+  assert len(inserts) == 1
+
+
+def test_bulk_invite_requires_admin(client, db, admin_user, fake_supabase):
+  engineer = User(
+    id=uuid.uuid4(), email="eng@invite.com", full_name="Eng", role=UserRole.ENGINEER,
+    organization_id=admin_user.organization_id,
+  )
+  db.add(engineer)
+  db.commit()
+  app.dependency_overrides[get_current_user] = lambda: engineer
+  try:
+    response = client.post("/api/v1/orgs/invite/bulk", json={"invites": [{"email": "x@invite.com"}]})
+  finally:
+    app.dependency_overrides.pop(get_current_user, None)
+
+  assert response.status_code == 403
+  assert fake_supabase.sent == []
@@ -0,0 +1,185 @@
+import io
+import threading
+import time
+import uuid
+import orjson
+import pytest
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import profiling, storage
+from app.db.models import Incident, IncidentSeverity, Organization, User, UserRole
+from app.services.analytics_service import AnalyticsService
+
+
+class FakeS3:
+  def __init__(self):
+    self.objects = {}
+
+  def put_object(self, Bucket, Key, Body, **kwargs):
+    self.objects[Key] = Body
+
+  def get_object(self, Bucket, Key):
+    return {"Body": io.BytesIO(self.objects[Key])}
+
+  def generate_presigned_url(self, operation, Params, ExpiresIn):
+    return f"http://minio:9000/{Params['Bucket']}/{Params['Key']}?signed"
+
+
+@pytest.fixture
+def fake_s3(monkeypatch):
+  s3 = FakeS3()
+  monkeypatch.setattr(storage, "get_s3_client", lambda: s3)
+  return s3
+
+
+@pytest.fixture
+def org(db):
+  org = Organization(id=uuid.uuid4(), name="Profile Org", slug="profile-org")
+  db.add(org)
+  db.commit()
+  return org
+
+
+def _user(db, org, role, email):
+  user = User(id=uuid.uuid4(), email=email, full_name="Profiler", role=role, organization_id=org.id)
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def admin_user(db, org):
+  return _user(db, org, UserRole.ADMIN, "admin@profile.io")
+
+
+@pytest.fixture
+def engineer_user(db, org):
+  return _user(db, org, UserRole.ENGINEER, "eng@profile.io")
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.fixture
+def slow_stats(monkeypatch):
+  # Long enough for a few stack samples, whatever the machine
+  original = AnalyticsService.get_admin_dashboard_stats
+
+  def stats(self, org_id):
+    time.sleep(0.03)
+    return original(self, org_id)
+
+  monkeypatch.setattr(AnalyticsService, "get_admin_dashboard_stats", stats)
+
+
+def _sql_listener_installed():
+  return event.contains(Engine, "before_cursor_execute", profiling._before_cursor_execute)
+
+
+def test_admin_profile_is_stored_with_sql_timings(client, db, org, admin_user, auth_override, fake_s3, slow_stats):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  db.add(Incident(title="API down", description="502s", severity=IncidentSeverity.SEV1, owner_id=admin_user.id, organization_id=org.id))
+  db.commit()
+
+  response = client.get("/api/v1/admin/stats?profile=1")
+
+  assert response.status_code == 200
+  assert response.json()["total_incidents"] == 1
+  key = response.headers["x-profile-key"]
+  assert key.startswith(f"orgs/{org.id}/profiles/") and key.endswith(".folded")
+  assert response.headers["x-profile-url"].endswith(f"/{key}?signed")
+  assert "sql;dur=" in response.headers["server-timing"]
+
+  folded = fake_s3.objects[key].decode().splitlines()
+  assert folded and all(line.rsplit(" ", 1)[1].isdigit() for line in folded)
+  assert all(line.startswith("get_admin_stats (app/api/v1/endpoints/admin.py:") for line in folded)
+  assert any(";slow_stats.<locals>.stats (" in line for line in folded)
+
+  summary = orjson.loads(fake_s3.objects[key.removesuffix(".folded") + ".json"])
+  assert summary["path"] == "/api/v1/admin/stats" and summary["samples"] == sum(int(l.rsplit(" ", 1)[1]) for l in folded)
+  assert any("FROM incidents" in s["statement"] for s in summary["sql"])
+  assert f'desc="{len(summary["sql"])} statements"' in response.headers["server-timing"]
+  assert not _sql_listener_installed()
+
+
+def test_profile_header_works_like_the_query_param(client, admin_user, auth_override, fake_s3, slow_stats):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  response = client.get("/api/v1/admin/stats", headers={"X-Profile": "1"})
+
+  assert response.status_code == 200
+  assert response.headers["x-profile-key"] in fake_s3.objects
+
+
+def test_non_admins_cannot_profile(client, engineer_user, auth_override, fake_s3):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+
+  response = client.get("/api/v1/incidents/", headers={"X-Profile": "1"})
+
+  assert response.status_code == 403
+  assert "x-profile-key" not in response.headers
+  assert fake_s3.objects == {}
+
+
+def test_requests_without_the_switch_are_not_profiled(client, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  started = []
+  monkeypatch.setattr(profiling.RequestProfile, "start", lambda self, *args: started.append(self))
+
+  for response in (client.get("/api/v1/admin/stats"), client.get("/api/v1/admin/stats?profile=0")):
+    assert response.status_code == 200
+    assert "server-timing" not in response.headers
+
+  assert started == []
+  assert fake_s3.objects == {}
+  assert not _sql_listener_installed()
+
+
+def test_concurrent_requests_to_the_same_endpoint_are_not_sampled(client, admin_user, auth_override, fake_s3, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  original = AnalyticsService.get_admin_dashboard_stats
+  entered = threading.Event()
+
+  def someone_elses_request():
+    entered.set()
+    time.sleep(0.2)
+
+  def stats(self, org_id):
+    if profiling.current_profile() is None:
+      someone_elses_request()
+    else:
+      time.sleep(0.03)
+    return original(self, org_id)
+
+  monkeypatch.setattr(AnalyticsService, "get_admin_dashboard_stats", stats)
+  other = threading.Thread(target=client.get, args=("/api/v1/admin/stats",))
+  other.start()
+  entered.wait(1)
+
+  response = client.get("/api/v1/admin/stats?profile=1")
+  other.join()
+
+  folded = fake_s3.objects[response.headers["x-profile-key"]].decode()
+  assert "stats (" in folded
+  assert "someone_elses_request" not in folded
+
+
+def test_profile_storage_failures_are_logged(caplog):
+  profile = profiling.RequestProfile("GET", "/api/v1/admin/stats")
+  profile.key = "orgs/1/profiles/x.folded"
+
+  class BrokenS3:
+    def put_object(self, **kwargs):
+      raise RuntimeError("bucket gone")
+
+  with pytest.MonkeyPatch.context() as patch:
+    patch.setattr(storage, "get_s3_client", lambda: BrokenS3())
+    profiling.write_profile(profile)
+
+  [record] = [r for r in caplog.records if r.name == "app.core.profiling"]
+  assert record.levelname == "WARNING" and record.exc_info
@@ -0,0 +1,69 @@
+import uuid
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.db.models import Incident, IncidentSeverity, Organization, User, UserRole
+from query_budget import query_budget, recorder
+
+
+@pytest.fixture
+def engineer(db):
+  org = Organization(id=uuid.uuid4(), name="Budget Org", slug="budget-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="budget@budget.io",
+    full_name="Budget Engineer",
+    role=UserRole.ENGINEER,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.add(Incident(title="Disk full", description="db-1 at 100%", severity=IncidentSeverity.SEV2, owner_id=user.id, organization_id=org.id))
+  db.commit()
+  app.dependency_overrides[get_current_user] = lambda: user
+  yield user
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_requests_over_budget_are_reported_with_their_sql(client, engineer):
+  with recorder.enforce(0, endpoint="GET /api/v1/incidents/") as violations:
+    assert client.get("/api/v1/incidents/").status_code == 200
+    client.get(f"/api/v1/incidents/{uuid.uuid4()}/events") # Other endpoints are not held to this budget
+
+  assert len(violations) == 1
+  assert violations[0].startswith("GET /api/v1/incidents/: 1 statements (budget 0)")
+  assert "SELECT incidents.id" in violations[0]
+
+
+def test_wall_time_budget(client, engineer):
+  with recorder.enforce(100, max_ms=0) as violations:
+    client.get("/api/v1/incidents/")
+
+  assert len(violations) == 1 and "(budget 0ms)" in violations[0]
+
+
+def test_nested_budget_restores_the_outer_one(client, engineer):
+  with recorder.enforce(0) as outer:
+    with recorder.enforce(100) as inner:
+      client.get("/api/v1/incidents/")
+    client.get("/api/v1/incidents/")
+
+  assert inner == []
+  assert len(outer) == 1
+
+
+def test_endpoints_are_keyed_by_route_template(client, engineer):
+  client.get(f"/api/v1/incidents/{uuid.uuid4()}/events")
+  client.get(f"/api/v1/incidents/{uuid.uuid4()}/events")
+
+  stats = recorder.endpoints["GET /api/v1/incidents/{incident_id}/events"]
+  assert stats.requests >= 2
+  assert stats.max_statements >= 1
+
+
+@query_budget(1, endpoint="GET /api/v1/incidents/")
+def test_list_incidents_is_one_statement(client, engineer):
+  response = client.get("/api/v1/incidents/")
+
+  assert response.status_code == 200
+  assert [i["title"] for i in response.json()] == ["Disk full"]
@@ -0,0 +1,103 @@
+import uuid
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import rate_limit
+from app.core.rate_limit import Budget, InMemoryRateLimiter, RedisRateLimiter
+from app.db.models import Organization, User, UserRole
+
+
+@pytest.fixture
+def memory_limiter(monkeypatch):
+  monkeypatch.setitem(rate_limit.BUDGETS, "default", {"user": Budget(3, 0.5), "org": Budget(5, 0.5)})
+  monkeypatch.setitem(rate_limit.BUDGETS, "expensive", {"user": Budget(1, 0.01), "org": Budget(1, 0.01)})
+  rate_limit.configure_rate_limiter("memory://")
+  yield
+  rate_limit.configure_rate_limiter(None)
+
+
+def _create_user(db, org, role=UserRole.ADMIN):
+  user = User(
+    id=uuid.uuid4(),
+    email=f"{uuid.uuid4().hex[:8]}@{org.slug}.com",
+    full_name="Limited User",
+    role=role,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def org(db):
+  org = Organization(id=uuid.uuid4(), name="Limited Org", slug="limited-org")
+  db.add(org)
+  db.commit()
+  return org
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def test_token_bucket_refills_over_time(monkeypatch):
+  clock = [100.0]
+  monkeypatch.setattr(rate_limit.time, "monotonic", lambda: clock[0])
+  limiter = InMemoryRateLimiter()
+  bucket = [("k", Budget(2, 1.0))]
+
+  assert [limiter.hit(bucket).allowed for _ in range(3)] == [True, True, False]
+  assert limiter.hit(bucket).retry_after == pytest.approx(1.0)
+
+  clock[0] += 1.0
+  assert limiter.hit(bucket).allowed
+
+
+def test_denied_request_does_not_charge_other_buckets():
+  limiter = InMemoryRateLimiter()
+  user, org = ("user", Budget(5, 1.0)), ("org", Budget(1, 1.0))
+  limiter.hit([user, org])
+
+  assert not limiter.hit([user, org]).allowed
+  assert limiter.hit([user]).remaining == 3
+
+
+def test_user_limit_returns_429_with_retry_after(client, db, org, memory_limiter, auth_override):
+  user = _create_user(db, org)
+  app.dependency_overrides[get_current_user] = lambda: user
+
+  statuses = [client.get("/api/v1/incidents").status_code for _ in range(4)]
+
+  assert statuses == [200, 200, 200, 429]
+  response = client.get("/api/v1/users")
+  assert response.status_code == 429
+  assert response.headers["retry-after"] == "2"
+
+
+def test_org_budget_is_shared_by_its_users(client, db, org, memory_limiter, auth_override):
+  first, second = _create_user(db, org), _create_user(db, org)
+
+  app.dependency_overrides[get_current_user] = lambda: first
+  assert all(client.get("/api/v1/incidents").status_code == 200 for _ in range(3))
+  app.dependency_overrides[get_current_user] = lambda: second
+  assert [client.get("/api/v1/incidents").status_code for _ in range(3)] == [200, 200, 429]
+
+
+def test_expensive_routes_have_their_own_budget(client, db, org, memory_limiter, auth_override):
+  user = _create_user(db, org)
+  app.dependency_overrides[get_current_user] = lambda: user
+
+  assert client.get("/api/v1/admin/stats").status_code == 200
+  assert client.get("/api/v1/admin/charts").status_code == 429
+  assert client.get("/api/v1/incidents").status_code == 200
+
+
+def test_redis_outage_falls_back_to_process_buckets():
+  limiter = RedisRateLimiter("redis://127.0.0.1:1/0")
+  bucket = [("k", Budget(1, 0.01))]
+
+  assert limiter.hit(bucket).allowed
+  assert not limiter.hit(bucket).allowed
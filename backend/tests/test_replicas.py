@@ -0,0 +1,179 @@
+import threading
+import uuid
+import orjson
+import pytest
+from starlette.requests import Request
+from sqlalchemy import create_engine
+from sqlalchemy.exc import OperationalError
+from sqlalchemy.orm import Session, sessionmaker
+from app.core import cache
+from app.db import replicas
+from app.db.models import Incident, IncidentSeverity, Organization, User, UserRole
+from app.db.replicas import ReplicaSet, RoutingSession, configure_writer_log
+from app.db.session import Base
+from app.repositories.analytics_repo import AnalyticsRepository
+from app.repositories.incident_repo import IncidentRepository
+
+ORG_ID = uuid.uuid4()
+USER_ID = uuid.uuid4()
+INCIDENT_ID = uuid.uuid4()
+
+
+def _seed(engine, title):
+  Base.metadata.create_all(engine)
+  with Session(engine) as db:
+    db.add(Organization(id=ORG_ID, name="Replica Org", slug="replica-org"))
+    db.add(User(id=USER_ID, email="oncall@replica.io", full_name="On Call", role=UserRole.ENGINEER, organization_id=ORG_ID))
+    db.add(Incident(id=INCIDENT_ID, title=title, description="Lag", severity=IncidentSeverity.SEV2, organization_id=ORG_ID))
+    db.commit()
+
+
+@pytest.fixture
+def primary(tmp_path):
+  engine = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+  _seed(engine, "Primary copy")
+  yield engine
+  engine.dispose()
+
+
+@pytest.fixture
+def replica(tmp_path):
+  # Same rows, different title: tells which database answered
+  engine = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+  _seed(engine, "Replica copy")
+  yield engine
+  engine.dispose()
+
+
+@pytest.fixture
+def writer_log():
+  yield configure_writer_log("memory://")
+  configure_writer_log(None)
+
+
+@pytest.fixture
+def make_session(primary, replica, writer_log):
+  replica_set = ReplicaSet([replica], check_every=0)
+  factory = sessionmaker(bind=primary, class_=RoutingSession, replicas=replica_set, expire_on_commit=False)
+
+  def _make(user_id=None):
+    db = factory()
+    if user_id is not None:
+      db.info["user_id"] = user_id
+    return db
+  return _make
+
+
+def _listed_title(db):
+  return IncidentRepository(db).list_summaries(ORG_ID)[0].title
+
+
+def test_marked_reads_use_the_replica_everything_else_the_primary(make_session):
+  db = make_session()
+
+  assert _listed_title(db) == "Replica copy"
+  assert AnalyticsRepository(db).get_total_incidents(ORG_ID) == 1
+  assert IncidentRepository(db).get_by_id(INCIDENT_ID, ORG_ID).title == "Primary copy"
+
+
+def test_session_reads_its_own_writes(make_session):
+  db = make_session()
+  incident = IncidentRepository(db).get_by_id(INCIDENT_ID, ORG_ID)
+  incident.title = "Renamed on primary"
+  db.commit()
+
+  assert _listed_title(db) == "Renamed on primary"
+
+
+def test_user_reads_stay_on_primary_after_their_write(make_session, primary, monkeypatch):
+  writer = make_session(user_id=USER_ID)
+  IncidentRepository(writer).get_by_id(INCIDENT_ID, ORG_ID).title = "Acknowledged"
+  writer.commit()
+
+  assert _listed_title(make_session(user_id=USER_ID)) == "Acknowledged"
+  assert _listed_title(make_session(user_id=uuid.uuid4())) == "Replica copy"
+  assert _listed_title(make_session()) == "Replica copy"
+
+  # Once the sticky window is over the replica is trusted again
+  monkeypatch.setattr(replicas, "REPLICA_STICKY_SECONDS", 0)
+  writer = make_session(user_id=USER_ID)
+  IncidentRepository(writer).get_by_id(INCIDENT_ID, ORG_ID).title = "Resolved"
+  writer.commit()
+  assert _listed_title(make_session(user_id=USER_ID)) == "Replica copy"
+
+
+def test_reads_without_writes_do_not_make_a_user_sticky(make_session):
+  reader = make_session(user_id=USER_ID)
+  IncidentRepository(reader).get_by_id(INCIDENT_ID, ORG_ID)
+  reader.commit()
+
+  assert _listed_title(make_session(user_id=USER_ID)) == "Replica copy"
+
+
+def test_lagging_or_unreachable_replica_falls_back_to_primary(make_session, monkeypatch):
+  monkeypatch.setattr(replicas, "replica_lag_seconds", lambda conn: 30.0)
+  assert _listed_title(make_session()) == "Primary copy"
+
+  def unreachable(conn):
+    raise OperationalError("SELECT 1", {}, Exception("connection refused"))
+  monkeypatch.setattr(replicas, "replica_lag_seconds", unreachable)
+  assert _listed_title(make_session()) == "Primary copy"
+
+  monkeypatch.setattr(replicas, "replica_lag_seconds", lambda conn: 0.2)
+  assert _listed_title(make_session()) == "Replica copy"
+
+
+def test_lag_is_measured_once_per_interval(replica, monkeypatch):
+  probes = []
+  monkeypatch.setattr(replicas, "replica_lag_seconds", lambda conn: probes.append(conn) or 0.0)
+  replica_set = ReplicaSet([replica], check_every=60)
+
+  assert replica_set.pick() is replica
+  assert replica_set.pick() is replica
+  assert len(probes) == 1
+
+
+def test_slow_probe_does_not_block_other_reads(replica, monkeypatch):
+  probing, release = threading.Event(), threading.Event()
+
+  def hanging_probe(conn):
+    probing.set()
+    release.wait(5)
+    return 0.0
+  monkeypatch.setattr(replicas, "replica_lag_seconds", hanging_probe)
+  replica_set = ReplicaSet([replica], check_every=0)
+
+  first = threading.Thread(target=replica_set.pick)
+  first.start()
+  assert probing.wait(5)
+  try:
+    assert replica_set.pick() is None # Primary, straight away, while the first probe hangs
+  finally:
+    release.set()
+    first.join()
+  assert replica_set.replicas[0].healthy
+
+
+def test_plain_sessions_ignore_replica_markers(primary):
+  with Session(primary) as db:
+    assert _listed_title(db) == "Primary copy"
+
+
+def test_cached_bodies_are_built_on_the_primary(make_session):
+  cache.configure_cache("memory://")
+  try:
+    # Another user's write has reached the primary and bumped the org version, but not the replica yet
+    writer = make_session(user_id=USER_ID)
+    IncidentRepository(writer).get_by_id(INCIDENT_ID, ORG_ID).title = "Mitigated"
+    writer.commit()
+    cache.bump_org_version(ORG_ID)
+
+    reader = make_session(user_id=uuid.uuid4())
+    request = Request({"type": "http", "method": "GET", "path": "/api/v1/incidents/", "headers": []})
+    build = lambda: [row.title for row in IncidentRepository(reader).list_summaries(ORG_ID)]
+
+    assert orjson.loads(cache.cached_response(request, ORG_ID, "incidents", build).body) == ["Mitigated"]
+    assert orjson.loads(cache.cached_response(request, ORG_ID, "incidents", lambda: []).body) == ["Mitigated"]
+    assert _listed_title(reader) == "Replica copy" # Uncached reads still use the replica
+  finally:
+    cache.configure_cache(None)
@@ -0,0 +1,114 @@
+import uuid
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import cache
+from app.db.models import Organization, User, UserRole
+
+
+@pytest.fixture
+def memory_cache():
+  cache.configure_cache("memory://")
+  yield
+  cache.configure_cache(None)
+
+
+def _create_org_admin(db, slug):
+  org = Organization(id=uuid.uuid4(), name=slug.title(), slug=slug)
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email=f"admin@{slug}.com",
+    full_name="Cache Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def admin_user(db):
+  return _create_org_admin(db, "cache-org")
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+@pytest.mark.parametrize("path", ["/api/v1/incidents", "/api/v1/users", "/api/v1/orgs/org_profile"])
+def test_if_none_match_returns_304_without_queries(client, db, memory_cache, auth_override, admin_user, count_queries, path):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  first = client.get(path)
+  assert first.status_code == 200
+  etag = first.headers["etag"]
+
+  with count_queries() as statements:
+    second = client.get(path, headers={"If-None-Match": etag})
+  assert second.status_code == 304
+  assert second.headers["etag"] == etag
+  assert second.content == b""
+  assert statements == []
+
+
+def test_write_invalidates_etag(client, db, memory_cache, auth_override, admin_user):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+
+  etag = client.get("/api/v1/incidents").headers["etag"]
+  client.post("/api/v1/incidents", json={"title": "Cache Bust", "description": "New row", "severity": "SEV3"})
+
+  response = client.get("/api/v1/incidents", headers={"If-None-Match": etag})
+  assert response.status_code == 200
+  assert response.headers["etag"] != etag
+  assert any(i["title"] == "Cache Bust" for i in response.json())
+
+
+def test_cached_body_reused_between_writes(client, db, memory_cache, auth_override, admin_user, count_queries):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  first = client.get("/api/v1/users")
+
+  with count_queries() as statements:
+    second = client.get("/api/v1/users")
+  assert second.json() == first.json()
+  assert statements == []
+
+
+def test_etags_are_per_org(client, db, memory_cache, auth_override, admin_user):
+  other_admin = _create_org_admin(db, "other-cache-org")
+
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  etag = client.get("/api/v1/users").headers["etag"]
+
+  app.dependency_overrides[get_current_user] = lambda: other_admin
+  response = client.get("/api/v1/users", headers={"If-None-Match": etag})
+  assert response.status_code == 200
+  assert response.json()[0]["email"] == other_admin.email
+
+
+def test_cache_disabled_by_default(client, db, auth_override, admin_user):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  response = client.get("/api/v1/incidents")
+  assert response.status_code == 200
+  assert "etag" not in response.headers
+
+
+def test_memory_cache_evicts_expired_and_least_recently_used_bodies(monkeypatch):
+  backend = cache.InMemoryCache(max_bodies=2)
+  now = [100.0]
+  monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+
+  backend.set_body("old", b"1", ttl=10)
+  now[0] += 11
+  backend.set_body("a", b"2", ttl=10)
+  assert "old" not in backend._bodies
+
+  backend.set_body("b", b"3", ttl=10)
+  assert backend.get_body("a") == b"2"
+  backend.set_body("c", b"4", ttl=10)
+
+  assert list(backend._bodies) == ["a", "c"]
+  assert backend.get_body("b") is None
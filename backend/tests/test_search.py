@@ -0,0 +1,111 @@
+import uuid
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.db.models import Organization, User, UserRole
+
+
+def _create_org_user(db, slug):
+  org = Organization(id=uuid.uuid4(), name=slug.title(), slug=slug)
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email=f"eng@{slug}.com",
+    full_name="Search Engineer",
+    role=UserRole.ENGINEER,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def engineer_user(db):
+  return _create_org_user(db, "search-org")
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _declare(client, title, description):
+  response = client.post("/api/v1/incidents", json={"title": title, "description": description, "severity": "SEV2"})
+  assert response.status_code == 200
+  return response.json()["id"]
+
+
+def test_search_ranks_title_matches_first(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  in_description = _declare(client, "Checkout errors", "Payments fail because the redis cluster is down")
+  in_title = _declare(client, "Redis cluster failover", "Primary node lost")
+  _declare(client, "CSS glitch", "Dashboard styles missing")
+
+  response = client.get("/api/v1/incidents/search", params={"q": "redis"})
+
+  assert response.status_code == 200
+  data = response.json()
+  assert [hit["id"] for hit in data["items"]] == [in_title, in_description]
+  assert "<mark>" in data["items"][0]["highlight"]
+  assert data["next_offset"] is None
+
+
+def test_search_matches_comments(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  incident_id = _declare(client, "Login slowness", "Users wait on sign in")
+  client.post(f"/api/v1/incidents/{incident_id}/comment", json={"comment": "Root cause: expired certificate on the edge proxy"})
+
+  response = client.get("/api/v1/incidents/search", params={"q": "certificate"})
+
+  assert [hit["id"] for hit in response.json()["items"]] == [incident_id]
+
+
+def test_search_highlight_escapes_user_text(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  incident_id = _declare(client, "Widget <script>alert(1)</script> broken", "Rendering <img src=x onerror=alert(2)>")
+  client.post(f"/api/v1/incidents/{incident_id}/comment", json={"comment": "Payload & <b>bold</b> widget fix"})
+
+  for q in ("widget", "payload"):
+    highlight = client.get("/api/v1/incidents/search", params={"q": q}).json()["items"][0]["highlight"]
+
+    assert "<mark>" in highlight
+    assert "<script>" not in highlight and "<img" not in highlight and "<b>" not in highlight
+    assert highlight.replace("<mark>", "").replace("</mark>", "").count("<") == 0
+
+
+def test_search_is_org_scoped(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  _declare(client, "Kafka lag", "Consumers behind")
+
+  outsider = _create_org_user(db, "other-search-org")
+  app.dependency_overrides[get_current_user] = lambda: outsider
+  response = client.get("/api/v1/incidents/search", params={"q": "kafka"})
+
+  assert response.status_code == 200
+  assert response.json()["items"] == []
+
+
+def test_search_pagination(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  ids = {_declare(client, f"Disk full on node {n}", "Storage alert") for n in range(3)}
+
+  first = client.get("/api/v1/incidents/search", params={"q": "disk", "limit": 2}).json()
+  assert len(first["items"]) == 2
+  assert first["next_offset"] == 2
+
+  second = client.get("/api/v1/incidents/search", params={"q": "disk", "limit": 2, "offset": 2}).json()
+  assert len(second["items"]) == 1
+  assert second["next_offset"] is None
+  assert {hit["id"] for hit in first["items"] + second["items"]} == ids
+
+
+def test_search_ignores_query_syntax(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  _declare(client, "Timeout on api-gateway", "504s everywhere")
+
+  response = client.get("/api/v1/incidents/search", params={"q": 'api-gateway" (*'})
+
+  assert response.status_code == 200
+  assert len(response.json()["items"]) == 1
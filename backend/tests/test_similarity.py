@@ -0,0 +1,121 @@
+import uuid
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.core.similarity import compute_signature, from_bytes, to_bytes, SimilarityIndex
+from app.db.models import Incident, IncidentEvent, IncidentSeverity, IncidentSignature, Organization, User, UserRole
+from app.services.similarity_service import SimilarityService
+
+
+def _create_org_user(db, slug):
+  org = Organization(id=uuid.uuid4(), name=slug.title(), slug=slug)
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email=f"eng@{slug}.com",
+    full_name="Similarity Engineer",
+    role=UserRole.ENGINEER,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def engineer_user(db):
+  return _create_org_user(db, "similar-org")
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _declare(client, db, title, description, index=True):
+  response = client.post("/api/v1/incidents", json={"title": title, "description": description, "severity": "SEV2"})
+  incident_id = uuid.UUID(response.json()["id"])
+  if index:
+    assert SimilarityService(db).index_incident(incident_id)
+  return str(incident_id)
+
+
+def test_signature_estimates_overlap():
+  base = compute_signature(["Postgres primary out of disk", "WAL volume filled up on the primary database"])
+  near = compute_signature(["Postgres replica out of disk", "WAL volume filled up on the replica database"])
+  far = compute_signature(["Login page CSS broken", "Styles missing after deploy"])
+
+  assert (base == near).mean() > (base == far).mean()
+  assert (from_bytes(to_bytes(base)) == base).all()
+
+
+def test_index_excludes_self_and_removed():
+  index = SimilarityIndex()
+  org_id, a, b = uuid.uuid4(), uuid.uuid4(), uuid.uuid4()
+  signature = compute_signature(["cache stampede on product pages"])
+  index.upsert(org_id, [(a, to_bytes(signature), None), (b, to_bytes(signature), None)])
+
+  assert index.top_k(org_id, signature, 5, exclude=a) == [(b, 1.0)]
+  index.remove(org_id, [b])
+  assert index.top_k(org_id, signature, 5, exclude=a) == []
+
+
+def test_similar_endpoint_ranks_matches(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  target = _declare(client, db, "Postgres primary out of disk", "WAL volume filled up on the primary database")
+  near = _declare(client, db, "Postgres replica out of disk", "WAL volume filled up on the replica database")
+  _declare(client, db, "Login page CSS broken", "Styles missing after deploy")
+
+  response = client.get(f"/api/v1/incidents/{target}/similar", params={"k": 2})
+
+  assert response.status_code == 200
+  data = response.json()
+  assert data[0]["id"] == near
+  assert all(hit["id"] != target for hit in data)
+  assert [hit["score"] for hit in data] == sorted((hit["score"] for hit in data), reverse=True)
+
+
+def test_similar_signs_unindexed_incident_on_the_fly(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  indexed = _declare(client, db, "Kafka consumer lag on billing", "Billing consumers fell behind")
+  fresh = _declare(client, db, "Kafka consumer lag on billing again", "Billing consumers behind", index=False)
+
+  response = client.get(f"/api/v1/incidents/{fresh}/similar")
+
+  assert [hit["id"] for hit in response.json()] == [indexed]
+
+
+def test_similar_is_org_scoped(client, db, auth_override, engineer_user):
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  incident_id = _declare(client, db, "DNS outage", "Resolver timeouts")
+
+  outsider = _create_org_user(db, "other-similar-org")
+  app.dependency_overrides[get_current_user] = lambda: outsider
+  response = client.get(f"/api/v1/incidents/{incident_id}/similar")
+
+  assert response.status_code == 404
+
+
+def test_backfill_signs_historical_incidents_in_batches(client, db, auth_override, engineer_user, count_queries):
+  org_id = engineer_user.organization_id
+  old = [
+    Incident(id=uuid.uuid4(), title=f"Redis eviction storm {n}", description="Cache hit rate collapsed",
+             severity=IncidentSeverity.SEV3, organization_id=org_id)
+    for n in range(5)
+  ]
+  db.add_all(old)
+  db.add(IncidentEvent(incident_id=old[0].id, event_type="COMMENT", comment="maxmemory too low", organization_id=org_id))
+  db.commit()
+
+  with count_queries() as statements:
+    assert SimilarityService(db).backfill_signatures(batch_size=2) == 5
+  # Per batch: unsigned ids, incidents, comments, existing signatures; then one empty lookup
+  assert sum(s.lstrip().startswith("SELECT") for s in statements) == 3 * 4 + 1
+  assert db.query(IncidentSignature).filter(IncidentSignature.incident_id.in_([i.id for i in old])).count() == 5
+  assert SimilarityService(db).backfill_signatures() == 0
+
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+  fresh = _declare(client, db, "Redis eviction storm again", "Cache hit rate collapsed", index=False)
+  response = client.get(f"/api/v1/incidents/{fresh}/similar", params={"k": 5})
+  assert {hit["id"] for hit in response.json()} == {str(i.id) for i in old}
@@ -0,0 +1,171 @@
+import uuid
+from datetime import datetime, timedelta, timezone
+import pytest
+from app.main import app
+from app.api.deps import get_current_user
+from app.core import tasks
+from app.db.models import Incident, IncidentEvent, IncidentStatus, Organization, User, UserRole
+from app.services.sla_service import SlaService
+
+
+@pytest.fixture
+def admin_user(db):
+  org = Organization(id=uuid.uuid4(), name="SLA Org", slug="sla-org")
+  db.add(org)
+  user = User(
+    id=uuid.uuid4(),
+    email="admin@sla.com",
+    full_name="SLA Admin",
+    role=UserRole.ADMIN,
+    organization_id=org.id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def engineer(db, admin_user):
+  user = User(
+    id=uuid.uuid4(),
+    email="oncall@sla.com",
+    full_name="On Call",
+    role=UserRole.ENGINEER,
+    organization_id=admin_user.organization_id,
+  )
+  db.add(user)
+  db.commit()
+  return user
+
+
+@pytest.fixture
+def auth_override():
+  yield
+  app.dependency_overrides.pop(get_current_user, None)
+
+
+def _as_utc(value):
+  return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value
+
+
+def _create(client, severity="SEV1", title="Checkout down"):
+  response = client.post("/api/v1/incidents", json={"title": title, "description": "500s on /pay", "severity": severity})
+  assert response.status_code == 200
+  return uuid.UUID(response.json()["id"])
+
+
+def _deadline(db, incident_id):
+  db.expire_all()
+  deadline = db.get(Incident, incident_id).sla_deadline
+  return _as_utc(deadline) if deadline else None
+
+
+def test_create_sets_deadline_from_default_policy(client, db, admin_user, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  before = datetime.now(timezone.utc)
+  incident_id = _create(client, "SEV1")
+
+  deadline = _deadline(db, incident_id)
+  assert before + timedelta(minutes=60) <= deadline <= datetime.now(timezone.utc) + timedelta(minutes=60)
+
+
+def test_org_policy_applies_to_new_and_pending_incidents(client, db, admin_user, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  pending = _create(client, "SEV2")
+  acknowledged = _create(client, "SEV2")
+  client.post(f"/api/v1/incidents/{acknowledged}/transition", json={"new_state": "INVESTIGATING"})
+
+  response = client.put("/api/v1/admin/sla-policies/SEV2", json={"response_minutes": 5})
+
+  assert response.status_code == 200
+  policies = {p["severity"]: p for p in response.json()}
+  assert policies["SEV2"] == {"severity": "SEV2", "response_minutes": 5, "is_default": False}
+  assert policies["SEV1"]["is_default"] is True
+
+  created_at = _as_utc(db.get(Incident, pending).created_at)
+  assert _deadline(db, pending) == created_at + timedelta(minutes=5)
+  assert _deadline(db, acknowledged) is None
+
+  fresh = _create(client, "SEV2")
+  assert _deadline(db, fresh) <= datetime.now(timezone.utc) + timedelta(minutes=5)
+
+  # Resetting falls back to the built-in target
+  response = client.put("/api/v1/admin/sla-policies/SEV2", json={"response_minutes": None})
+  assert {p["severity"]: p for p in response.json()}["SEV2"]["is_default"] is True
+  assert _deadline(db, pending) == created_at + timedelta(minutes=120)
+
+
+def test_sla_policies_require_admin(client, db, engineer, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: engineer
+
+  assert client.get("/api/v1/admin/sla-policies").status_code == 403
+  assert client.put("/api/v1/admin/sla-policies/SEV1", json={"response_minutes": 1}).status_code == 403
+
+
+def test_severity_change_retimes_pending_deadline(client, db, admin_user, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _create(client, "SEV4")
+
+  client.patch(f"/api/v1/incidents/{incident_id}", json={"severity": "SEV1"})
+
+  created_at = _as_utc(db.get(Incident, incident_id).created_at)
+  assert _deadline(db, incident_id) == created_at + timedelta(minutes=60)
+
+
+def test_escalate_due_escalates_only_overdue_incidents(client, db, admin_user, engineer, auth_override):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  overdue = client.post("/api/v1/incidents", json={
+    "title": "DB failover", "description": "Primary lost", "severity": "SEV1", "owner_id": str(engineer.id)
+  })
+  overdue_id = uuid.UUID(overdue.json()["id"])
+  not_yet = _create(client, "SEV4")
+
+  alerts = SlaService(db).escalate_due(datetime.now(timezone.utc) + timedelta(minutes=61))
+
+  assert [a["incident_id"] for a in alerts] == [str(overdue_id)]
+  assert alerts[0]["recipients"] == ["admin@sla.com", "oncall@sla.com"]
+  db.expire_all()
+  incident = db.get(Incident, overdue_id)
+  assert incident.status == IncidentStatus.ESCALATED
+  assert incident.sla_deadline is None
+  assert incident.version == 2
+  breach = db.query(IncidentEvent).filter_by(incident_id=overdue_id, event_type="SLA_BREACH").one()
+  assert breach.actor_id is None
+  assert (breach.old_value, breach.new_value) == ("DETECTED", "ESCALATED")
+  assert db.get(Incident, not_yet).status == IncidentStatus.DETECTED
+
+  # Breaches are handled once
+  assert SlaService(db).escalate_due(datetime.now(timezone.utc) + timedelta(minutes=61)) == []
+
+
+def test_idle_scheduler_run_is_a_single_query(client, db, admin_user, auth_override, count_queries):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  _create(client, "SEV3")
+
+  with count_queries() as statements:
+    assert SlaService(db).escalate_due() == []
+
+  assert len(statements) == 1
+
+
+def test_check_sla_breaches_task_alerts_recipients(client, db, admin_user, auth_override, monkeypatch):
+  app.dependency_overrides[get_current_user] = lambda: admin_user
+  incident_id = _create(client, "SEV1")
+  db.query(Incident).filter(Incident.id == incident_id).update(
+    {Incident.sla_deadline: datetime.now(timezone.utc) - timedelta(seconds=5)}, synchronize_session=False
+  )
+  db.commit()
+
+  sent = []
+  monkeypatch.setattr(tasks, "SessionLocal", lambda: db)
+  monkeypatch.setattr(tasks.send_incident_alert_email, "apply_async", lambda kwargs, priority: sent.append((kwargs, priority)))
+
+  result = tasks.check_sla_breaches.delay().get()
+
+  assert result == "Escalated 1 incidents due to SLA breaches."
+  assert sent == [({
+    "to_email": "admin@sla.com",
+    "incident_title": "SLA BREACH: Checkout down",
+    "incident_id": str(incident_id),
+    "severity": "SEV1",
+  }, 0)]
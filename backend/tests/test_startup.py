@@ -0,0 +1,44 @@
+import os
+import re
+import subprocess
+import sys
+import pytest
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# Cumulative `import app.main` time allowed, best of a few fresh interpreters (about 1.2s locally)
+API_IMPORT_BUDGET_MS = float(os.getenv("API_IMPORT_BUDGET_MS", "2000"))
+# SDKs only workers or individual endpoints need; importing them is what made API cold starts slow
+LAZY_MODULES = ("groq", "httpx", "boto3", "mailjet_rest", "supabase", "celery", "numpy", "app.core.tasks")
+
+
+def _run(code: str, *flags: str) -> subprocess.CompletedProcess:
+  return subprocess.run(
+    [sys.executable, *flags, "-c", code],
+    cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+  )
+
+
+def test_api_import_does_not_load_worker_sdks():
+  result = _run(f"import sys, app.main; print(','.join(m for m in {LAZY_MODULES!r} if m in sys.modules))")
+
+  assert result.stdout.strip() == ""
+
+
+def test_api_import_time_budget():
+  timings = []
+  for _ in range(3):
+    stderr = _run("import app.main", "-X", "importtime").stderr
+    match = re.search(r"^import time:\s+\d+ \|\s+(\d+) \| app\.main$", stderr, re.MULTILINE)
+    assert match, stderr[-2000:]
+    timings.append(int(match.group(1)) / 1000)
+
+  best = min(timings)
+  if best > API_IMPORT_BUDGET_MS:
+    slowest = sorted(
+      (int(m.group(1)), m.group(2).strip())
+      for m in re.finditer(r"^import time:\s+(\d+) \|\s+\d+ \|(.+)$", stderr, re.MULTILINE)
+    )[-10:]
+    pytest.fail(
+      f"import app.main took {best:.0f}ms (budget {API_IMPORT_BUDGET_MS:.0f}ms). Slowest self times (us):\n"
+      + "\n".join(f"  {us:>8} {name}" for us, name in reversed(slowest))
+    )
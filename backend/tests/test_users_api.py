@@ -3,6 +3,7 @@ import pytest
 from app.main import app
 from app.api.deps import get_current_user
 from app.db.models import User, UserRole, Organization
+from query_budget import query_budget
 
 
 @pytest.fixture
@@ -69,6 +70,7 @@ def test_user_organization(client, db, admin_user, test_organization, other_orga
   assert data["id"] == str(test_organization.id)
   
 
+@query_budget(1, endpoint="GET /api/v1/users/")
 def test_list_users_scoped(client, db, auth_override, admin_user, test_organization, other_organization):
   _create_user(db, test_organization.id, UserRole.MANAGER, "mgr@users.com")
   _create_user(db, other_organization.id, UserRole.ADMIN, "admin@other.com")
@@ -1,10 +1,12 @@
 # backend/tests/test_workflows.py
+import json
 import pytest
 import uuid
 from app.main import app
-from app.db.session import get_db
+from app.core import fsm
 from app.db.models import User, UserRole, IncidentStatus, Incident, Organization
 from app.api.deps import get_current_user
+from app.schemas.incident import IncidentRead
 
 # --- Fixtures ---
 
@@ -216,4 +218,23 @@ def test_postmortem_tenant_isolation(client, db, incident_id):
   post_response = client.post(f"/api/v1/incidents/{incident_id}/postmortem")
   assert post_response.status_code == 404
 
-  del app.dependency_overrides[get_current_user]
\ No newline at end of file
+  del app.dependency_overrides[get_current_user]
+
+
+def test_org_workflow_drives_transitions_and_listing(client, db, engineer_user, test_organization, incident_id, tmp_path, monkeypatch):
+  """An org with a custom workflow gets its own transition checks and allowed_transitions."""
+  path = tmp_path / "workflows.json"
+  path.write_text(json.dumps({str(test_organization.id): {"DETECTED": ["RESOLVED"], "RESOLVED": ["CLOSED"]}}))
+  monkeypatch.setattr(fsm, "INCIDENT_WORKFLOWS_FILE", str(path))
+  fsm._load_workflows.cache_clear()
+  app.dependency_overrides[get_current_user] = lambda: engineer_user
+
+  listed = next(i for i in client.get("/api/v1/incidents").json() if i["id"] == incident_id)
+  assert listed["allowed_transitions"] == ["RESOLVED"]
+  # The schema carries what the service computed; it does not fall back to the default table
+  assert IncidentRead.model_validate(listed).allowed_transitions == ("RESOLVED",)
+  assert client.post(f"/api/v1/incidents/{incident_id}/transition", json={"new_state": "INVESTIGATING"}).status_code == 400
+  assert client.post(f"/api/v1/incidents/{incident_id}/transition", json={"new_state": "RESOLVED"}).status_code == 200
+
+  fsm._load_workflows.cache_clear()
+  del app.dependency_overrides[get_current_user]